@@ -5,115 +5,683 @@
 # Modul 2: Pengkondisian → cek saldo cukup/tidak, keranjang kosong/tidak, diskon/voucher, validasi input, state spin
 # Modul 3: Perulangan → render katalog, isi keranjang, struk, loop animasi spin
 # Modul 4: Function & Method → semua def (utilitas, method class, handler UI)
-# Modul 5: OOP I → class Game, Cart, StoreApp, BalanceMenu
+# Modul 5: OOP I → class Game, Cart, StoreEngine (StoreEngine.py), StoreApp, BalanceMenu
 # Modul 6: OOP II → enkapsulasi data keranjang, komposisi objek
 # Modul 7: Stack & Queue → tidak digunakan langsung
 # Modul 8: GUI Programming → Tkinter penuh (Frame, Canvas, Label, Button, Entry, Toplevel, Scrollbar, bind)
 
+import time
+_IMPORT_T0 = time.perf_counter()   # awal import modul, titik nol laporan --startup-timing
+
 import tkinter as tk
-from PIL import Image, ImageTk
-import os, random
+import tkinter.font as tkfont
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os, math, random, json, hashlib, argparse, queue, threading
+
+from StoreProfile import PROFILE, timed
+from StoreEngine import (Game, Cart, StoreEngine, CheckoutError, EmptyCartError, InsufficientBalanceError,
+                         CatalogFormatError, RewardTableError, format_rupiah, default_games, load_catalog,
+                         load_reward_table, parse_price_text)
+
+_IMPORT_T1 = time.perf_counter()
+
+# PIL diimpor saat gambar pertama di-decode, bukan saat modul dimuat; startup mengimpornya di background
+def _pil():
+    from PIL import Image, ImageTk
+    return Image, ImageTk
+
+# Gaya: font bernama + preset warna (Modul 4, 6)
+# Warna yang dipakai berulang di katalog, keranjang dan struk
+COLORS = {
+    "bg": "#1e1e2f",
+    "card": "#2f2f4f",
+    "card_edge": "#252542",
+    "cart_row": "#4f4f6f",
+    "receipt_row": "#2e2e4a",
+    "gold": "#FFD700",
+    "green": "#32cd32",
+    "red": "#ff6347",
+    "blue": "#1e90ff",
+}
+
+# Preset widget: opsi font (spec dict untuk StyleRegistry.font) + warna, dipakai lewat **STYLES.preset(nama)
+STYLE_PRESETS = {
+    "card_title": {"font": {"size": 14, "weight": "bold"}, "bg": COLORS["card"], "fg": "white"},
+    "card_price_old": {"font": {"size": 12, "weight": "bold", "overstrike": True}, "bg": COLORS["card"], "fg": COLORS["red"]},
+    "card_price_new": {"font": {"size": 13, "weight": "bold"}, "bg": COLORS["card"], "fg": COLORS["gold"]},
+    "card_button": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["blue"], "fg": "white"},
+    "cart_title": {"font": {"size": 13, "weight": "bold"}, "bg": COLORS["cart_row"], "fg": "white"},
+    "cart_qty": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["cart_row"], "fg": COLORS["gold"]},
+    "cart_inc": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["green"], "fg": "white"},
+    "cart_dec": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["red"], "fg": "white"},
+    "receipt_title": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["receipt_row"], "fg": "white"},
+    "receipt_qty": {"font": {"size": 12}, "bg": COLORS["receipt_row"], "fg": COLORS["blue"]},
+    "receipt_subtotal": {"font": {"size": 12, "weight": "bold"}, "bg": COLORS["receipt_row"], "fg": COLORS["gold"]},
+}
+
+class StyleRegistry:
+    # Satu tkinter.font.Font per kombinasi (family, size, weight, slant, overstrike), dibuat sekali.
+    # Widget lalu hanya mereferensikan nama font; Tk tidak mengurai tuple font lagi di tiap Label/Button.
+    # Font terikat ke interpreter Tk, jadi cache dikosongkan kalau root default berganti.
+    def __init__(self, presets=STYLE_PRESETS, family="Motiva Sans"):
+        self.family = family
+        self.presets = presets
+        self.enabled = True   # False → kembali ke tuple (untuk perbandingan di benchmark)
+        self.fonts = {}
+        self.resolved = {}    # nama preset → kwargs widget dengan objek Font
+        self.root = None
+        self.created = 0
+        self.hits = 0
+
+    def _check_root(self):
+        root = tk._default_root
+        if root is not self.root:
+            self.root = root
+            self.fonts.clear()
+            self.resolved.clear()
+        return root
+
+    def font(self, name=None, size=12, weight="normal", slant="roman", overstrike=False):
+        name = name or self.family
+        if not self.enabled or self._check_root() is None:
+            return (name, size, weight, slant) + (("overstrike",) if overstrike else ())
+        key = (name, size, weight, slant, overstrike)
+        f = self.fonts.get(key)
+        if f is None:
+            f = self.fonts[key] = tkfont.Font(family=name, size=size, weight=weight, slant=slant, overstrike=overstrike)
+            self.created += 1
+        else:
+            self.hits += 1
+        return f
 
-# Utilitas (Modul 4)
-def format_rupiah(value: int) -> str:
-    return f"Rp {value:,}".replace(",", " ")
+    def preset(self, name):
+        if self.enabled and self._check_root() is not None:
+            kwargs = self.resolved.get(name)
+            if kwargs is not None:
+                return kwargs
+        spec = self.presets[name]
+        kwargs = dict(spec, font=self.font(**spec["font"]))
+        if self.enabled and self.root is not None:
+            self.resolved[name] = kwargs
+        return kwargs
+
+    def stats(self):
+        return {"fonts": len(self.fonts), "created": self.created, "hits": self.hits}
 
+STYLES = StyleRegistry()
+
+# Utilitas (Modul 4)
 def font(name="Motiva Sans", size=12, weight="normal", slant="roman"):
-    return (name, size, weight, slant)
+    return STYLES.font(name, size, weight, slant)
 
 def ellipsize(text: str, max_chars: int = 90) -> str:
     return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
 
-# Model data (Modul 5, 6)
-class Game:
-    def __init__(self, title, price, cover):
-        self.title = title
-        self.price = price
-        self.cover = cover
-
-class Cart:
-    def __init__(self):
-        self.items = {}
-
-    def add(self, title, price, cover):
-        if title not in self.items:
-            self.items[title] = {"qty": 0, "price": price, "cover": cover}
-        self.items[title]["qty"] += 1
-
-    def remove(self, title):
-        if title in self.items:
-            self.items[title]["qty"] -= 1
-            if self.items[title]["qty"] <= 0:
-                del self.items[title]
+# Cache gambar cover (Modul 4, 6)
+# Semua ukuran cover yang dipakai aplikasi: kartu katalog, popup tambah, keranjang, struk, daily deal
+COVER_SIZES = {
+    "card": (210, 130),
+    "popup": (360, 220),
+    "cart": (240, 160),
+    "receipt": (180, 120),
+    "deal": (420, 260),
+}
+
+# Thumbnail siap pakai di disk supaya startup tidak men-decode PNG ukuran penuh (Modul 4, 2)
+class ThumbnailStore:
+    def __init__(self, cache_dir, sizes=tuple(COVER_SIZES.values())):
+        self.cache_dir = cache_dir
+        self.sizes = tuple(sizes)
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self._manifest = self._load_manifest()
+        self._checked = set()
+        # Dipakai dari worker decode: satu lock untuk manifest, satu lock per file sumber
+        self._lock = threading.RLock()
+        self._path_locks = {}
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self.manifest_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f, indent=1)
+            os.replace(tmp, self.manifest_path)
+
+    def _path_lock(self, key):
+        with self._lock:
+            return self._path_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _file_hash(path):
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def thumb_path(self, digest, size):
+        return os.path.join(self.cache_dir, f"{digest[:20]}_{size[0]}x{size[1]}.png")
+
+    def is_fresh(self, path, save=True):
+        entry = self._manifest.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        st = os.stat(path)
+        if entry["mtime"] != st.st_mtime_ns or entry["bytes"] != st.st_size:
+            # mtime berubah tapi isi sama (mis. file di-copy ulang) → cukup perbarui mtime
+            if entry["bytes"] != st.st_size or entry["sha1"] != self._file_hash(path):
+                return False
+            entry["mtime"] = st.st_mtime_ns
+            if save:
+                self._save_manifest()
+        return all(os.path.exists(self.thumb_path(entry["sha1"], s)) for s in self.sizes)
+
+    @timed("thumb.build")
+    def refresh(self, path, save=True):
+        # save=False: manifest hanya diubah di memori, pemanggil yang menyimpannya (build sekali di akhir)
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        digest = self._file_hash(path)
+        old = self._manifest.get(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        Image, _ = _pil()
+        with Image.open(path) as src:
+            src.load()
+            PROFILE.count("image.decoded")
+            for s in self.sizes:
+                src.resize(s).save(self.thumb_path(digest, s), compress_level=1)
+        if old and old["sha1"] != digest:
+            for s in self.sizes:
+                try:
+                    os.remove(self.thumb_path(old["sha1"], s))
+                except OSError:
+                    pass
+        with self._lock:
+            self._manifest[key] = {"mtime": st.st_mtime_ns, "bytes": st.st_size, "sha1": digest}
+        if save:
+            self._save_manifest()
+
+    def lookup(self, path, size):
+        key = os.path.abspath(path)
+        if key not in self._checked:
+            with self._path_lock(key):
+                if key not in self._checked:
+                    if not self.is_fresh(path):
+                        self.refresh(path)
+                    self._checked.add(key)
+        return self.thumb_path(self._manifest[key]["sha1"], size)
+
+    def build(self, paths):
+        # Manifest ditulis sekali di akhir (juga kalau build terputus), bukan sekali per cover
+        built = 0
+        try:
+            for p in paths:
+                if not self.is_fresh(p, save=False):
+                    self.refresh(p, save=False)
+                    built += 1
+                self._checked.add(os.path.abspath(p))
+        finally:
+            self._save_manifest()
+        return built
+
+class CoverCache:
+    def __init__(self, sizes=tuple(COVER_SIZES.values()), max_bytes=64 * 1024 * 1024, thumbs=None):
+        self.sizes = tuple(sizes)
+        self.max_bytes = max_bytes
+        self.thumbs = thumbs
+        self._photos = OrderedDict()  # (path, size) -> (PhotoImage, bytes)
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Decode di background: worker hanya membuat PIL Image, PhotoImage tetap dibuat di thread Tk
+        self._root = None
+        self._pool = None
+        self._done = queue.SimpleQueue()
+        self._pending = {}  # (path, size) -> [callback, ...]
+        self._poll_id = None
+        self._placeholders = {}
+
+    def start(self, root, workers=None, poll_ms=30):
+        self._root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1), thread_name_prefix="cover")
+        root.bind("<Destroy>", lambda e: self.shutdown() if e.widget is root else None, add="+")
+
+    def shutdown(self):
+        if self._poll_id is not None:
+            try:
+                self._root.after_cancel(self._poll_id)
+            except tk.TclError:
+                pass
+            self._poll_id = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._pending.clear()
+
+    def busy(self):
+        # Masih ada cover yang sedang di-decode worker
+        return bool(self._pending)
+
+    def placeholder(self, size):
+        photo = self._placeholders.get(size)
+        if photo is None:
+            photo = tk.PhotoImage(width=size[0], height=size[1])
+            photo.put("#3a3a5a", to=(0, 0, size[0], size[1]))
+            self._placeholders[size] = photo
+        return photo
+
+    def request(self, path, size, callback):
+        # callback(photo) dipanggil di thread Tk; photo None berarti gambar gagal dimuat
+        key = (path, tuple(size))
+        entry = self._photos.get(key)
+        if entry is not None:
+            self._photos.move_to_end(key)
+            self.hits += 1
+            callback(entry[0])
+            return
+        if self._pool is None:
+            try:
+                photo = self.get(path, size)
+            except Exception:
+                photo = None
+            callback(photo)
+            return
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+        self.misses += 1
+        self._pending[key] = [callback]
+        future = self._pool.submit(self._load, path, key[1])
+        future.add_done_callback(lambda f, k=key: self._done.put((k, f)))
+        if self._poll_id is None:
+            self._poll_id = self._root.after(self.poll_ms, self._poll)
+
+    @timed("cover.load")
+    def _load(self, path, size):
+        # Dijalankan di thread worker; span dan counter sama dengan jalur sinkron _decode
+        Image, _ = _pil()
+        if self.thumbs is not None and size in self.thumbs.sizes:
+            try:
+                with Image.open(self.thumbs.lookup(path, size)) as img:
+                    img.load()
+                    PROFILE.count("image.thumb_loaded")
+                    return img.copy()
+            except OSError:
+                pass
+        with Image.open(path) as src:
+            src.load()
+            PROFILE.count("image.decoded")
+            return src.resize(size)
+
+    def _poll(self):
+        self._poll_id = None
+        _, ImageTk = _pil()
+        while True:
+            try:
+                key, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self._pending.pop(key, [])
+            if future.cancelled():
+                continue
+            try:
+                w, h = key[1]
+                photo = ImageTk.PhotoImage(future.result())
+                self._store(key, photo, w * h * 4)
+            except Exception:
+                photo = None
+            for cb in callbacks:
+                try:
+                    cb(photo)
+                except tk.TclError:
+                    pass  # widget tujuan sudah dihancurkan
+        if self._pending and self._pool is not None:
+            self._poll_id = self._root.after(self.poll_ms, self._poll)
+
+    def get(self, path, size):
+        key = (path, tuple(size))
+        entry = self._photos.get(key)
+        if entry is not None:
+            self._photos.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        self._decode(path, key[1])
+        return self._photos[key][0]
+
+    @timed("cover.decode")
+    def _decode(self, path, size):
+        Image, ImageTk = _pil()
+        if self.thumbs is not None and size in self.thumbs.sizes:
+            try:
+                with Image.open(self.thumbs.lookup(path, size)) as img:
+                    self._store((path, size), ImageTk.PhotoImage(img), size[0] * size[1] * 4)
+                PROFILE.count("image.thumb_loaded")
+                return
+            except OSError:
+                pass  # cache dir tidak bisa ditulis/rusak → decode langsung dari sumber
+        # File sumber dibuka & di-decode sekali, semua varian ukuran dibuat dari hasil decode yang sama.
+        # Ukuran yang diminta dibuat paling akhir supaya tidak ikut tergusur oleh varian lain.
+        sizes = [s for s in self.sizes if s != size and (path, s) not in self._photos] + [size]
+        with Image.open(path) as src:
+            src.load()
+            PROFILE.count("image.decoded")
+            for s in sizes:
+                self._store((path, s), ImageTk.PhotoImage(src.resize(s)), s[0] * s[1] * 4)
+
+    def _store(self, key, photo, nbytes):
+        old = self._photos.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self._photos[key] = (photo, nbytes)
+        self.bytes_used += nbytes
+        # LRU: buang entri paling lama dipakai, entri terbaru selalu dipertahankan
+        while self.bytes_used > self.max_bytes and len(self._photos) > 1:
+            _, (_, old_bytes) = self._photos.popitem(last=False)
+            self.bytes_used -= old_bytes
+            self.evictions += 1
 
     def clear(self):
-        self.items.clear()
-
-    def unique_count(self):
-        return len(self.items)
-
-    def total_count(self):
-        return sum(v["qty"] for v in self.items.values())
-
-    def total(self):
-        subtotal = sum(v["price"] * v["qty"] for v in self.items.values())
-        if self.unique_count() >= 3:
-            subtotal *= 0.8
-        return int(max(0, subtotal))
+        self._photos.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._photos),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+# Penjadwal redraw (Modul 5, 8)
+class RedrawScheduler:
+    # Satu aksi sering memicu beberapa redraw (refresh_cart → update_total, spin → total + harga).
+    # Region hanya ditandai kotor; semuanya digambar sekali per frame lewat after_idle.
+    # keys: sub-bagian region yang berubah (mis. judul di keranjang); None = seluruh region.
+    def __init__(self, root, regions):
+        self.root = root
+        self.regions = regions          # list (nama, fungsi render(keys)), urutan = urutan gambar
+        self.dirty = {}
+        self.pending = None
+        self.marks = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.redraws = {name: 0 for name, _ in regions}
+
+    def mark(self, region, keys=None):
+        self.marks += 1
+        if region in self.dirty:
+            self.coalesced += 1
+            prev = self.dirty[region]
+            if prev is not None:
+                self.dirty[region] = None if keys is None else prev | set(keys)
+        else:
+            self.dirty[region] = None if keys is None else set(keys)
+        if self.pending is None:
+            self.pending = self.root.after_idle(self.flush)
+
+    @timed("redraw.flush")
+    def flush(self):
+        # Boleh dipanggil langsung kalau tampilan harus sudah benar sekarang (mis. sebelum dialog modal)
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        while self.dirty:
+            dirty, self.dirty = self.dirty, {}
+            self.flushes += 1
+            for name, render in self.regions:
+                if name in dirty:
+                    render(dirty[name])
+                    self.redraws[name] += 1
+
+    def stats(self):
+        return {
+            "marks": self.marks,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "redraws": dict(self.redraws),
+        }
+
+# Jam frame animasi spin (Modul 3, 8)
+SPIN_FRAME_MS = 55
+SPIN_PAUSE_MS = 300          # hasil tiap spin tetap terlihat sebentar sebelum spin berikutnya
+SPIN_CYCLES = (22, 28)       # putaran reel per spin (acak), sama dengan animasi lama
+SPIN_BATCH_THRESHOLD = 20    # spin sebanyak ini atau lebih langsung diselesaikan sekaligus
+
+class SpinClock:
+    # Satu timer after untuk seluruh antrean spin. Teks reel tidak diambil dari list urutan frame,
+    # tapi dihitung dari waktu: labels[(elapsed // frame_ms) % len(labels)]. Kalau loop Tk tertinggal,
+    # frame yang sudah lewat dilewati (tidak digambar terlambat) dan spin yang waktunya sudah habis
+    # langsung diselesaikan berurutan. Spin berikutnya dimulai dari akhir spin sebelumnya, bukan jeda tetap.
+    #   on_frame(teks)              : tampilkan teks reel
+    #   on_results([(i, target)])   : spin ke-i selesai (bisa beberapa sekaligus saat tertinggal / fast_forward)
+    #   on_done()                   : seluruh antrean selesai
+    def __init__(self, root, labels, on_frame, on_results, on_done, frame_ms=SPIN_FRAME_MS, pause_ms=SPIN_PAUSE_MS,
+                 clock=time.perf_counter):
+        self.root = root
+        self.labels = labels
+        self.on_frame = on_frame
+        self.on_results = on_results
+        self.on_done = on_done
+        self.frame_ms = frame_ms
+        self.pause_ms = pause_ms
+        self.clock = clock
+        self.spins = []          # (target, jumlah frame)
+        self.index = 0           # spin yang sedang berjalan
+        self.resolved = 0        # spin yang hasilnya sudah dilaporkan
+        self.frame = -1          # frame terakhir yang digambar untuk spin sekarang
+        self.t_spin = 0.0
+        self.pending = None
+        self.running = False
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.ticks = 0
+
+    def start(self, spins):
+        # spins: list (target, putaran reel)
+        self.spins = [(target, cycles * len(self.labels)) for target, cycles in spins]
+        self.index = self.resolved = 0
+        self.frame = -1
+        self.running = True
+        self.t_spin = self.clock()
+        self.tick()
+
+    def _spin_ms(self, frames):
+        return frames * self.frame_ms
+
+    @timed("spin.frame")
+    def tick(self):
+        self.pending = None
+        if not self.running:
+            return
+        self.ticks += 1
+        now = self.clock()
+        done = []
+        wait_ms = self.frame_ms
+        while self.index < len(self.spins):
+            target, frames = self.spins[self.index]
+            elapsed = (now - self.t_spin) * 1000
+            spin_ms = self._spin_ms(frames)
+            if elapsed < spin_ms:
+                frame = int(elapsed // self.frame_ms)
+                if frame != self.frame:
+                    self.frames_skipped += max(0, frame - self.frame - 1)
+                    self.frame = frame
+                    self.on_frame(self.labels[frame % len(self.labels)])
+                    self.frames_drawn += 1
+                wait_ms = self.frame_ms - elapsed % self.frame_ms
+                break
+            if self.resolved == self.index:
+                self.frames_skipped += max(0, frames - self.frame - 1)
+                done.append((self.index, target))
+                self.resolved += 1
+            if elapsed < spin_ms + self.pause_ms:
+                wait_ms = spin_ms + self.pause_ms - elapsed
+                break
+            # Spin berikutnya mulai tepat saat jeda spin ini habis (waktu tidak ikut tertunda kalau loop telat)
+            self.t_spin += (spin_ms + self.pause_ms) / 1000
+            self.index += 1
+            self.frame = -1
+        if done:
+            self.on_results(done)
+        if self.index >= len(self.spins):
+            self._finish()
+            return
+        self.pending = self.root.after(max(1, math.ceil(wait_ms)), self.tick)
+        PROFILE.count("spin.after")
 
-    def summary_lines(self):
-        return [(t, v["qty"], v["price"] * v["qty"], v["cover"]) for t, v in self.items.items()]
+    def fast_forward(self):
+        # Mode batch: semua spin yang belum selesai diselesaikan dalam satu update
+        if not self.running:
+            return
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        done = [(i, target) for i, (target, _) in enumerate(self.spins) if i >= self.resolved]
+        self.frames_skipped += sum(frames for _, frames in self.spins[self.resolved:])
+        if self.resolved == self.index < len(self.spins):
+            self.frames_skipped -= self.frame + 1   # frame spin sekarang yang sudah sempat digambar
+        self.resolved = self.index = len(self.spins)
+        if done:
+            self.on_results(done)
+        self._finish()
+
+    def _finish(self):
+        self.running = False
+        PROFILE.count("spin.frame_skipped", self.frames_skipped)
+        self.on_done()
+
+    def cancel(self):
+        self.running = False
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+
+    def stats(self):
+        return {
+            "spins": len(self.spins),
+            "resolved": self.resolved,
+            "ticks": self.ticks,
+            "frames_drawn": self.frames_drawn,
+            "frames_skipped": self.frames_skipped,
+        }
+
+# Pool dialog (Modul 5, 8)
+class DialogPool:
+    # Tiap jenis dialog dibangun sekali (Toplevel + seluruh widget), lalu disembunyikan dengan withdraw
+    # dan ditampilkan lagi dengan deiconify; menampilkan ulang hanya mengonfigurasi isi widget.
+    def __init__(self, root):
+        self.root = root
+        self.dialogs = {}   # jenis → dict widget (selalu punya "win")
+        self.builds = 0
+        self.shows = 0
+
+    def get(self, kind, build, on_close=None):
+        # build(win) mengisi Toplevel kosong dan mengembalikan dict widget
+        d = self.dialogs.get(kind)
+        if d is None or not d["win"].winfo_exists():
+            win = tk.Toplevel(self.root)
+            win.withdraw()
+            win.protocol("WM_DELETE_WINDOW", on_close or (lambda: self.hide(kind)))
+            d = build(win)
+            d["win"] = win
+            self.dialogs[kind] = d
+            self.builds += 1
+        return d
+
+    @timed("dialog.show")
+    def show(self, kind, grab=True):
+        win = self.dialogs[kind]["win"]
+        win.deiconify()
+        win.lift()
+        if grab:
+            win.grab_set()
+        self.shows += 1
+        return win
+
+    def hide(self, kind):
+        d = self.dialogs.get(kind)
+        if d is not None and d["win"].winfo_exists():
+            d["win"].grab_release()
+            d["win"].withdraw()
+
+    def stats(self):
+        return {"dialogs": len(self.dialogs), "builds": self.builds, "shows": self.shows}
+
+def dialog_pool(root):
+    pool = getattr(root, "_dialog_pool", None)
+    if pool is None:
+        pool = root._dialog_pool = DialogPool(root)
+    return pool
 
 # Dialog custom (Modul 8)
-def show_colored_dialog(root, title, message, bg="#1b1b2e", fg_title="#FFD700", fg_msg="white"):
-    win = tk.Toplevel(root)
-    win.title(title)
+def _build_colored_dialog(win):
     win.geometry("520x260")
-    win.configure(bg=bg)
-    win.grab_set()
-    tk.Label(win, text=title, font=font(size=18, weight="bold"), bg=bg, fg=fg_title).pack(pady=12)
-    tk.Label(win, text=message, font=font(size=12), bg=bg, fg=fg_msg, wraplength=460, justify="center").pack(pady=8)
-    tk.Button(win, text="Tutup", command=win.destroy, bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=12).pack(pady=18)
+    d = {}
+    d["title"] = tk.Label(win, font=font(size=18, weight="bold"))
+    d["title"].pack(pady=12)
+    d["message"] = tk.Label(win, font=font(size=12), wraplength=460, justify="center")
+    d["message"].pack(pady=8)
+    tk.Button(win, text="Tutup", command=lambda: dialog_pool(win.master).hide("colored"),
+              bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=12).pack(pady=18)
+    d["colors"] = None
+    return d
+
+def show_colored_dialog(root, title, message, bg="#1b1b2e", fg_title="#FFD700", fg_msg="white"):
+    pool = dialog_pool(root)
+    d = pool.get("colored", _build_colored_dialog)
+    d["win"].title(title)
+    if d["colors"] != (bg, fg_title, fg_msg):
+        d["win"].configure(bg=bg)
+        d["title"].config(bg=bg, fg=fg_title)
+        d["message"].config(bg=bg, fg=fg_msg)
+        d["colors"] = (bg, fg_title, fg_msg)
+    d["title"].config(text=title)
+    d["message"].config(text=message)
+    pool.show("colored")
 
 # Aplikasi utama (Modul 5, 8)
+CATALOG_COLUMNS = 3
+VIRTUAL_CATALOG_THRESHOLD = 60   # di atas jumlah ini katalog dirender virtual
+CATALOG_OVERSCAN_ROWS = 1
+
 class StoreApp:
-    def __init__(self, root, initial_balance=500000):
+    def __init__(self, root, initial_balance=500000, virtual_catalog=None, engine=None, deal_delay_ms=1200):
         self.root = root
         self.root.title("Online Gamestore")
         self.root.geometry("1200x800")
 
-        # State
-        self.balance = initial_balance
-        self.cart = Cart()
-        self.spin_used = False
-        self.last_spin_count = 0
-
-        # Harga
-        self.base_price = {}
-        self.active_price = {}
-        self.next_discount_percent = 0
-        self.voucher_banner_var = tk.StringVar(value="")
-        self.price_area = {}
-
         # Path
         base_dir = os.path.dirname(__file__) if '__file__' in globals() else os.getcwd()
         self.img_dir = os.path.join(base_dir, "images")
+        self.thumbs = ThumbnailStore(os.path.join(base_dir, ".thumbcache"))
+        self.covers = CoverCache(thumbs=self.thumbs)
+        self.covers.start(root)
+        self.dialogs = dialog_pool(root)
 
-        # Katalog (nama panjang diuji)
-        self.games = [
-            Game("Elden Ring", 599000, os.path.join(self.img_dir, "elden.png")),
-            Game("Minecraft: Java & Bedrock Edition", 395000, os.path.join(self.img_dir, "minecraft.png")),
-            Game("Clair Obscur: Expedition 33", 499000, os.path.join(self.img_dir, "ekspedisi.png")),
-            Game("The Witcher 3: Wild Hunt", 359999, os.path.join(self.img_dir, "witcher.png")),
-            Game("God of War", 729000, os.path.join(self.img_dir, "godwar.png")),
-            Game("Persona 5 Royal", 798000, os.path.join(self.img_dir, "persona.png")),
-            Game("Red Dead Redemption 2", 879000, os.path.join(self.img_dir, "rdr2.png")),
-            Game("Sekiro™: Shadows Die Twice", 891000, os.path.join(self.img_dir, "sekiro.png")),
-            Game("Hollow Knight: Silksong", 165999, os.path.join(self.img_dir, "silksong.png")),
-        ]
-        for g in self.games:
-            self.base_price[g.title] = g.price
-            self.active_price[g.title] = g.price
+        # State toko (harga, saldo, keranjang, spin) ada di engine; StoreApp hanya tampilan
+        self.engine = engine if engine is not None else StoreEngine(default_games(self.img_dir), initial_balance)
+        self.voucher_banner_var = tk.StringVar(value="")
+        self.price_area = {}
+        # Urutan region: keranjang dulu karena total & saldo dibaca setelah baris diperbarui
+        self.redraw = RedrawScheduler(root, [
+            ("cart", self._render_cart),
+            ("totals", self._render_totals),
+            ("balance", self._render_balance),
+            ("prices", self._render_prices),
+        ])
 
         # Header toko
         self.store_frame = tk.Frame(root)
@@ -128,28 +696,55 @@ class StoreApp:
         saldo_frame = tk.Frame(header, bg="#228B22", padx=8, pady=4)
         saldo_frame.pack(side="right", padx=10, pady=8)
         tk.Label(saldo_frame, text="💰", font=font(size=12, weight="bold"), bg="#228B22", fg="white").pack(side="left")
-        self.label_balance_store = tk.Label(saldo_frame, text=format_rupiah(self.balance), font=font(size=12, weight="bold"), bg="#32CD32", fg="black")
+        self.label_balance_store = tk.Label(saldo_frame, text=format_rupiah(self.engine.balance), font=font(size=12, weight="bold"), bg="#32CD32", fg="black")
         self.label_balance_store.pack(side="left", padx=6)
 
         banner = tk.Label(self.store_frame, textvariable=self.voucher_banner_var, font=font(size=12, weight="bold"), bg="#1e1e2f", fg="#32cd32")
         banner.pack(fill="x")
 
+        # Pencarian judul + filter harga (Modul 2, 3, 8); hasil diperbarui setiap ketikan
+        search_bar = tk.Frame(self.store_frame, bg="#1e1e2f")
+        search_bar.pack(fill="x", padx=22, pady=(0, 8))
+        self.search_var = tk.StringVar(value="")
+        self.min_price_var = tk.StringVar(value="")
+        self.max_price_var = tk.StringVar(value="")
+        tk.Label(search_bar, text="🔍 Cari:", font=font(size=12, weight="bold"), bg="#1e1e2f", fg="white").pack(side="left")
+        tk.Entry(search_bar, textvariable=self.search_var, font=font(size=12), width=32).pack(side="left", padx=8)
+        tk.Label(search_bar, text="Harga min:", font=font(size=12), bg="#1e1e2f", fg="#ffd700").pack(side="left", padx=(12, 4))
+        tk.Entry(search_bar, textvariable=self.min_price_var, font=font(size=12), width=10).pack(side="left")
+        tk.Label(search_bar, text="maks:", font=font(size=12), bg="#1e1e2f", fg="#ffd700").pack(side="left", padx=(8, 4))
+        tk.Entry(search_bar, textvariable=self.max_price_var, font=font(size=12), width=10).pack(side="left")
+        self.search_info = tk.Label(search_bar, text="", font=font(size=11), bg="#1e1e2f", fg="#a0a0c0")
+        self.search_info.pack(side="left", padx=12)
+        for var in (self.search_var, self.min_price_var, self.max_price_var):
+            var.trace_add("write", lambda *_: self._apply_search())
+        self.catalog_ids = range(len(self.engine.games))  # id game yang sedang ditampilkan, urut katalog
+
         # Katalog dengan scroll (Canvas+Scrollbar) (Modul 3, 8)
+        # Katalog besar memakai mode virtual: hanya baris yang terlihat (+ overscan) yang punya widget
+        self.virtual_catalog = len(self.engine.games) > VIRTUAL_CATALOG_THRESHOLD if virtual_catalog is None else virtual_catalog
         self.catalog_canvas = tk.Canvas(self.store_frame, bg="#1e1e2f", highlightthickness=0)
-        catalog_scrollbar = tk.Scrollbar(self.store_frame, orient="vertical", command=self.catalog_canvas.yview)
-        self.catalog_inner = tk.Frame(self.catalog_canvas, bg="#1e1e2f")
-        self.catalog_window = self.catalog_canvas.create_window((0, 0), window=self.catalog_inner, anchor="nw")
-        self.catalog_canvas.bind("<Configure>", lambda e: self.catalog_canvas.itemconfig(self.catalog_window, width=e.width))
-        self.catalog_inner.bind("<Configure>", lambda e: self.catalog_canvas.configure(scrollregion=self.catalog_canvas.bbox("all")))
-        self.catalog_canvas.configure(yscrollcommand=catalog_scrollbar.set)
+        self.catalog_scrollbar = tk.Scrollbar(self.store_frame, orient="vertical", command=self.catalog_canvas.yview)
         self.catalog_canvas.pack(side="left", fill="both", expand=True)
-        catalog_scrollbar.pack(side="right", fill="y")
+        self.catalog_scrollbar.pack(side="right", fill="y")
         self.catalog_canvas.bind_all("<MouseWheel>", self._on_catalog_mousewheel)
 
-        for col in range(3):
-            self.catalog_inner.grid_columnconfigure(col, weight=1)
-        for i, g in enumerate(self.games):
-            self.create_game_card(self.catalog_inner, g, i)
+        if self.virtual_catalog:
+            self.catalog_inner = None
+            self._visible_cards = {}  # index game → kartu yang sedang tampil
+            self._free_cards = []
+            self._row_height = self._measure_card_height()
+            self.catalog_canvas.configure(yscrollcommand=self._on_catalog_yview)
+            self.catalog_canvas.bind("<Configure>", lambda e: self._layout_virtual_catalog(relayout=True))
+        else:
+            self.catalog_inner = tk.Frame(self.catalog_canvas, bg="#1e1e2f")
+            self.catalog_window = self.catalog_canvas.create_window((0, 0), window=self.catalog_inner, anchor="nw")
+            self.catalog_canvas.bind("<Configure>", lambda e: self.catalog_canvas.itemconfig(self.catalog_window, width=e.width))
+            self.catalog_inner.bind("<Configure>", lambda e: self.catalog_canvas.configure(scrollregion=self.catalog_canvas.bbox("all")))
+            self.catalog_canvas.configure(yscrollcommand=self.catalog_scrollbar.set)
+            for col in range(CATALOG_COLUMNS):
+                self.catalog_inner.grid_columnconfigure(col, weight=1)
+            self.grid_cards = [self.create_game_card(self.catalog_inner, g, i) for i, g in enumerate(self.engine.games)]
 
         # Keranjang + scroll wheel (Modul 8)
         self.cart_frame = tk.Frame(root, bg="#2f2f4f")
@@ -157,11 +752,16 @@ class StoreApp:
         cart_header = tk.Frame(self.cart_frame, bg="#2f2f4f"); cart_header.pack(fill="x")
         tk.Label(cart_header, text="🛒 Keranjang Belanja", font=font(size=18, weight="bold"), bg="#2f2f4f", fg="white").pack(side="left", padx=22, pady=10)
         tk.Button(cart_header, text="⬅️ Back", command=self.show_store, bg="#1e90ff", fg="white", font=font(size=12, weight="bold")).pack(side="right", padx=10, pady=10)
+        self._export = None          # ekspor yang sedang berjalan (satu per aplikasi)
+        self._export_pool = None
+        history_btn = tk.Button(cart_header, text="📄 Ekspor Riwayat", bg="#8a2be2", fg="white", font=font(size=12, weight="bold"))
+        history_btn.config(command=lambda: self.export_history(history_btn))
+        history_btn.pack(side="right", padx=10, pady=10)
 
         saldo_cart_frame = tk.Frame(cart_header, bg="#006400", padx=8, pady=4)
         saldo_cart_frame.pack(side="right", padx=10, pady=10)
         tk.Label(saldo_cart_frame, text="💰", font=font(size=12, weight="bold"), bg="#006400", fg="white").pack(side="left")
-        self.label_balance_cart = tk.Label(saldo_cart_frame, text=format_rupiah(self.balance), font=font(size=12, weight="bold"), bg="#32CD32", fg="black")
+        self.label_balance_cart = tk.Label(saldo_cart_frame, text=format_rupiah(self.engine.balance), font=font(size=12, weight="bold"), bg="#32CD32", fg="black")
         self.label_balance_cart.pack(side="left", padx=6)
 
         gift_bar = tk.Frame(self.cart_frame, bg="#2f2f4f"); gift_bar.pack(fill="x", padx=16, pady=6)
@@ -183,6 +783,8 @@ class StoreApp:
         self.cart_canvas.bind("<Configure>", lambda e: self.cart_canvas.itemconfig(self.cart_window, width=e.width))
         self.cart_inner.bind("<Configure>", lambda e: self.cart_canvas.configure(scrollregion=self.cart_canvas.bbox("all")))
         self.cart_canvas.configure(yscrollcommand=self.cart_scrollbar.set)
+        self.cart_rows = {}  # judul → widget baris keranjang
+        self.cart_empty = None
         self.cart_canvas.pack(side="left", fill="both", expand=True)
         self.cart_scrollbar.pack(side="right", fill="y")
 
@@ -196,8 +798,9 @@ class StoreApp:
         self.label_total.pack(side="left")
         tk.Button(footer, text="Checkout", command=self.checkout, bg="#32cd32", fg="white", font=font(size=12, weight="bold")).pack(side="right")
 
-        # Daily deal popup
-        self.root.after(1200, self.daily_deal_popup)
+        # Daily deal popup; None = dijadwalkan pemanggil (startup membangun toko sebelum jendelanya tampil)
+        if deal_delay_ms is not None:
+            self.root.after(deal_delay_ms, self.daily_deal_popup)
 
     # Katalog helpers (Modul 4, 2, 3, 8)
     def _on_catalog_mousewheel(self, event):
@@ -214,131 +817,248 @@ class StoreApp:
         self.cart_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
     def effective_price(self, title):
-        price = self.active_price[title]
-        if self.next_discount_percent > 0:
-            price = int(price * (1 - self.next_discount_percent / 100))
-        return max(0, price)
+        return self.engine.effective_price(title)
 
     def update_catalog_prices(self):
-        self.voucher_banner_var.set(
-            f"🎟️ Voucher Diskon {self.next_discount_percent}% aktif hingga checkout berikutnya."
-            if self.next_discount_percent > 0 else ""
-        )
-        for title, area in self.price_area.items():
+        self.redraw.mark("prices")
+
+    @timed("prices.render")
+    def _render_prices(self, _keys):
+        # Tidak ada perubahan harga/voucher → tidak ada yang dikonfigurasi ulang
+        banner = (f"🎟️ Voucher Diskon {self.engine.next_discount_percent}% aktif hingga checkout berikutnya."
+                  if self.engine.next_discount_percent > 0 else "")
+        if self.voucher_banner_var.get() != banner:
+            self.voucher_banner_var.set(banner)
+        changed = self.engine.prices.refresh()
+        if len(changed) < len(self.price_area):
+            areas = ((t, self.price_area[t]) for t in changed if t in self.price_area)
+        else:
+            areas = self.price_area.items()
+        for title, area in list(areas):
             self._render_price_labels(title, area)
 
+    @timed("catalog.card_create")
     def create_game_card(self, parent, game, index):
-        card = tk.Frame(parent, bg="#252542", bd=0, relief="flat")
-        card.grid(row=index//3, column=index%3, padx=12, pady=16, sticky="nsew")
+        card = self._build_card(parent)
+        card["frame"].grid(row=index//CATALOG_COLUMNS, column=index%CATALOG_COLUMNS, padx=12, pady=16, sticky="nsew")
+        card["pos"] = index
+        self._bind_card(card, game)
+        return card
+
+    def _build_card(self, parent):
+        card = {"game": None}
+        card["frame"] = tk.Frame(parent, bg=COLORS["card_edge"], bd=0, relief="flat")
 
-        container = tk.Frame(card, bg="#2f2f4f", bd=2, relief="ridge")
+        container = tk.Frame(card["frame"], bg=COLORS["card"], bd=2, relief="ridge")
         container.pack(fill="both", expand=True)
 
-        try:
-            img = Image.open(game.cover); img = img.resize((210, 130))
-            photo = ImageTk.PhotoImage(img)
-            img_box = tk.Label(container, image=photo, bg="#2f2f4f")
-            img_box.image = photo
-            img_box.pack(pady=10)
-        except:
-            tk.Label(container, text="[Gambar tidak ditemukan]", bg="#2f2f4f", fg="red", font=font(size=12)).pack(pady=10)
-
-        tk.Label(container, text=game.title, font=font(size=14, weight="bold"), bg="#2f2f4f", fg="white", wraplength=280, justify="center").pack(pady=4)
-
-        price_area = {"label_asli": tk.Label(container, bg="#2f2f4f"), "label_diskon": tk.Label(container, bg="#2f2f4f")}
-        price_area["label_asli"].pack()
-        price_area["label_diskon"].pack()
-        self.price_area[game.title] = price_area
-        self._render_price_labels(game.title, price_area)
-
-        tk.Button(
-            container,
-            text="Tambah ke Keranjang",
-            command=lambda t=game.title, c=game.cover: self.add_to_cart(t, c),
-            bg="#1e90ff", fg="white", font=font(size=12, weight="bold"), width=22
-        ).pack(pady=12)
+        card["img"] = tk.Label(container, bg=COLORS["card"])
+        card["img"].pack(pady=10)
+        card["title"] = tk.Label(container, wraplength=280, justify="center", **STYLES.preset("card_title"))
+        card["title"].pack(pady=4)
+        card["label_asli"] = tk.Label(container, **STYLES.preset("card_price_old"))
+        card["label_asli"].pack()
+        card["label_diskon"] = tk.Label(container, **STYLES.preset("card_price_new"))
+        card["label_diskon"].pack()
+        card["button"] = tk.Button(container, text="Tambah ke Keranjang", width=22, **STYLES.preset("card_button"))
+        card["button"].pack(pady=12)
+        return card
+
+    @timed("catalog.card_bind")
+    def _bind_card(self, card, game):
+        # Dipakai juga untuk mendaur ulang kartu di mode virtual
+        old = card["game"]
+        if old is not None and self.price_area.get(old.title) is card:
+            del self.price_area[old.title]
+        card["game"] = game
+
+        # Placeholder dulu, cover asli dipasang begitu worker selesai decode
+        size = COVER_SIZES["card"]
+        card["img"].config(image=self.covers.placeholder(size))
+        card["img"].image = None
+        self.covers.request(game.cover, size, lambda photo, c=card, g=game: self._set_cover(c["img"], photo) if c["game"] is g else None)
+
+        card["title"].config(text=game.title)
+        self.price_area[game.title] = card
+        self._render_price_labels(game.title, card)
+        card["button"].config(command=lambda t=game.title, c=game.cover: self.add_to_cart(t, c))
+
+    # Pencarian (Modul 2, 3)
+    @staticmethod
+    def _parse_price(text):
+        # Format sama dengan harga di file katalog; teks yang tidak valid ("-5", "1.5e6") = tanpa batas
+        return parse_price_text(text)
+
+    @timed("search.apply")
+    def _apply_search(self):
+        ids = self.engine.search(self.search_var.get(), self._parse_price(self.min_price_var.get()), self._parse_price(self.max_price_var.get()))
+        self.catalog_ids = range(len(self.engine.games)) if ids is None else ids
+        self.search_info.config(text="" if ids is None else f"{len(ids)} judul cocok")
+        if self.virtual_catalog:
+            self.catalog_canvas.yview_moveto(0)
+            self._layout_virtual_catalog(relayout=True)
+            return
+        # Mode grid: kartu tetap ada, hanya yang cocok yang di-grid ulang ke posisi barunya
+        shown = set(self.catalog_ids)
+        for pos, game_id in enumerate(self.catalog_ids):
+            card = self.grid_cards[game_id]
+            if card.get("pos") != pos:
+                card["frame"].grid(row=pos//CATALOG_COLUMNS, column=pos%CATALOG_COLUMNS, padx=12, pady=16, sticky="nsew")
+                card["pos"] = pos
+        for game_id, card in enumerate(self.grid_cards):
+            if game_id not in shown and card.get("pos") is not None:
+                card["frame"].grid_remove()
+                card["pos"] = None
+
+    # Katalog virtual (Modul 3, 8)
+    def _measure_card_height(self):
+        probe = self._build_card(self.catalog_canvas)
+        titles = self.engine.catalog.titles
+        if titles:
+            self._bind_card(probe, self.engine.games[max(range(len(titles)), key=lambda i: len(titles[i]))])
+        probe["frame"].update_idletasks()
+        height = probe["frame"].winfo_reqheight() + 32
+        if probe["game"] is not None:
+            del self.price_area[probe["game"].title]
+        probe["frame"].destroy()
+        return height
+
+    def _on_catalog_yview(self, first, last):
+        self.catalog_scrollbar.set(first, last)
+        self._layout_virtual_catalog()
+
+    @timed("catalog.layout")
+    def _layout_virtual_catalog(self, relayout=False):
+        canvas = self.catalog_canvas
+        width = canvas.winfo_width()
+        if width <= 1:
+            return  # canvas belum dipetakan, tunggu <Configure> pertama
+        ids = self.catalog_ids
+        rows = (len(ids) + CATALOG_COLUMNS - 1) // CATALOG_COLUMNS
+        row_h = self._row_height
+        col_w = width / CATALOG_COLUMNS
+        if relayout:
+            canvas.configure(scrollregion=(0, 0, width, rows * row_h))
+
+        top = canvas.canvasy(0)
+        first_row = max(0, int(top // row_h) - CATALOG_OVERSCAN_ROWS)
+        last_row = min(rows - 1, int((top + canvas.winfo_height()) // row_h) + CATALOG_OVERSCAN_ROWS)
+        wanted = range(first_row * CATALOG_COLUMNS, min(len(ids), (last_row + 1) * CATALOG_COLUMNS))
+
+        # Kartu yang keluar dari viewport masuk ke pool untuk dipakai ulang
+        for index in [i for i in self._visible_cards if i not in wanted]:
+            card = self._visible_cards.pop(index)
+            canvas.itemconfigure(card["item"], state="hidden")
+            self._free_cards.append(card)
+
+        for index in wanted:
+            card = self._visible_cards.get(index)
+            if card is None:
+                if self._free_cards:
+                    card = self._free_cards.pop()
+                else:
+                    card = self._build_card(canvas)
+                    card["item"] = canvas.create_window(0, 0, window=card["frame"], anchor="nw")
+                self._bind_card(card, self.engine.games[ids[index]])
+                self._visible_cards[index] = card
+            elif card["game"].game_id != ids[index]:
+                # Hasil pencarian berubah: posisi yang sama sekarang menampilkan game lain
+                self._bind_card(card, self.engine.games[ids[index]])
+            elif not relayout:
+                continue
+            row, col = divmod(index, CATALOG_COLUMNS)
+            canvas.coords(card["item"], col * col_w + 12, row * row_h + 16)
+            canvas.itemconfigure(card["item"], width=col_w - 24, height=row_h - 32, state="normal")
+
+    def _set_cover(self, label, photo):
+        if photo is None:
+            label.config(image="", text="[Gambar tidak ditemukan]", fg="red", font=font(size=12))
+            return
+        label.config(image=photo)
+        label.image = photo
 
     def _render_price_labels(self, title, area):
-        harga_asli = self.base_price[title]
-        harga_aktif = self.active_price[title]
-        harga_efektif = self.effective_price(title)
-
-        if harga_aktif < harga_asli:
-            area["label_asli"].config(text=f"{format_rupiah(harga_asli)}", font=(font()[0], 12, "overstrike", "bold"), fg="#ff6347", bg="#2f2f4f")
-            area["label_diskon"].config(
-                text=f"Harga Diskon: {format_rupiah(harga_efektif)}" + (f" (voucher {self.next_discount_percent}%)" if harga_efektif < harga_aktif else ""),
-                font=font(size=13, weight="bold"), fg="#FFD700", bg="#2f2f4f"
-            )
-        else:
-            area["label_asli"].config(text="", bg="#2f2f4f")
-            if self.next_discount_percent > 0 and harga_efektif < harga_asli:
-                area["label_asli"].config(text=f"{format_rupiah(harga_asli)}", font=(font()[0], 12, "overstrike", "bold"), fg="#ff6347", bg="#2f2f4f")
-                area["label_diskon"].config(
-                    text=f"Harga Diskon: {format_rupiah(harga_efektif)} (voucher {self.next_discount_percent}%)",
-                    font=font(size=13, weight="bold"), fg="#FFD700", bg="#2f2f4f"
-                )
-            else:
-                area["label_diskon"].config(text=f"Harga: {format_rupiah(harga_asli)}", font=font(size=13, weight="bold"), fg="#FFD700", bg="#2f2f4f")
+        # Teks sudah diformat di engine.prices; label hanya disentuh kalau teksnya berbeda
+        _, teks_asli, teks_diskon = self.engine.prices.entry(title)
+        if area.get("teks_asli") != teks_asli:
+            area["label_asli"].config(text=teks_asli)
+            area["teks_asli"] = teks_asli
+            PROFILE.count("label.reconfigure")
+        if area.get("teks_diskon") != teks_diskon:
+            area["label_diskon"].config(text=teks_diskon)
+            area["teks_diskon"] = teks_diskon
+            PROFILE.count("label.reconfigure")
 
     def add_to_cart(self, title, cover):
-        current_price = self.effective_price(title)
-        self.cart.add(title, current_price, cover)
+        current_price = self.engine.add_to_cart(title)
         self.show_added_popup(title, cover, current_price)
         if self.cart_frame.winfo_ismapped():
-            self.refresh_cart()
+            self.refresh_cart([title])
 
     # Popup tambah ke keranjang (Modul 8)
     def show_added_popup(self, title, cover, price):
-        popup = tk.Toplevel(self.root)
+        d = self.dialogs.get("added", self._build_added_popup)
+        d["game"] = (title, cover)
+        self._set_dialog_cover(d["img"], cover, COVER_SIZES["popup"])
+        d["title"].config(text=title)
+        d["price"].config(text=f"Harga: {format_rupiah(price)}")
+        d["qty_var"].set(f"Jumlah di keranjang: {self.engine.cart_qty(title)}")
+        self.dialogs.show("added")
+
+    def _build_added_popup(self, popup):
         popup.title("Game Ditambahkan")
         popup.geometry("560x640")
         popup.configure(bg="#1e1e2f")
-        popup.grab_set()
+        d = {"game": None}
 
         tk.Label(popup, text="✅ Game telah dimasukkan ke keranjang", font=font(size=14, weight="bold"), fg="#32cd32", bg="#1e1e2f").pack(pady=10)
-
-        try:
-            img = Image.open(cover); img = img.resize((360, 220))
-            photo = ImageTk.PhotoImage(img)
-            label_img = tk.Label(popup, image=photo, bg="#1e1e2f"); label_img.image = photo
-            label_img.pack(pady=10)
-        except:
-            tk.Label(popup, text="[Gambar tidak ditemukan]", bg="#1e1e2f", fg="red", font=font(size=12)).pack(pady=10)
-
-        tk.Label(popup, text=title, font=font(size=12, weight="bold"), fg="white", bg="#1e1e2f", wraplength=500, justify="center").pack(pady=5)
-        tk.Label(popup, text=f"Harga: {format_rupiah(price)}", font=font(size=12, weight="bold"), fg="#FFD700", bg="#1e1e2f").pack(pady=5)
-
-        qty = self.cart.items.get(title, {"qty": 0})["qty"]
-        qty_var = tk.StringVar(value=f"Jumlah di keranjang: {qty}")
-        tk.Label(popup, textvariable=qty_var, font=font(size=12, weight="bold"), fg="#1e90ff", bg="#1e1e2f").pack(pady=6)
+        d["img"] = tk.Label(popup, bg="#1e1e2f", fg="red", font=font(size=12))
+        d["img"].pack(pady=10)
+        d["title"] = tk.Label(popup, font=font(size=12, weight="bold"), fg="white", bg="#1e1e2f", wraplength=500, justify="center")
+        d["title"].pack(pady=5)
+        d["price"] = tk.Label(popup, font=font(size=12, weight="bold"), fg="#FFD700", bg="#1e1e2f")
+        d["price"].pack(pady=5)
+        d["qty_var"] = tk.StringVar(value="")
+        tk.Label(popup, textvariable=d["qty_var"], font=font(size=12, weight="bold"), fg="#1e90ff", bg="#1e1e2f").pack(pady=6)
 
         ctrl = tk.Frame(popup, bg="#1e1e2f"); ctrl.pack(pady=10)
-        tk.Button(ctrl, text="Tambah Lagi", command=lambda: self._popup_add(title, cover, qty_var), bg="#32cd32", fg="white", font=font(size=11, weight="bold")).pack(side="left", padx=8)
-        tk.Button(ctrl, text="Hapus", command=lambda: self._popup_remove(title, qty_var), bg="#ff6347", fg="white", font=font(size=11, weight="bold")).pack(side="left", padx=8)
+        tk.Button(ctrl, text="Tambah Lagi", command=lambda: self._popup_add(*d["game"], d["qty_var"]), bg="#32cd32", fg="white", font=font(size=11, weight="bold")).pack(side="left", padx=8)
+        tk.Button(ctrl, text="Hapus", command=lambda: self._popup_remove(d["game"][0], d["qty_var"]), bg="#ff6347", fg="white", font=font(size=11, weight="bold")).pack(side="left", padx=8)
 
         choose = tk.Frame(popup, bg="#1e1e2f"); choose.pack(pady=20)
-        tk.Button(choose, text="Lanjutkan Belanja", command=lambda: self._popup_continue(popup), bg="#1e90ff", fg="white", font=font(size=12, weight="bold")).pack(side="left", padx=12)
-        tk.Button(choose, text="Lihat Keranjang Saya", command=lambda: self._popup_go_cart(popup), bg="#FFD700", fg="black", font=font(size=12, weight="bold")).pack(side="left", padx=12)
+        tk.Button(choose, text="Lanjutkan Belanja", command=self._popup_continue, bg="#1e90ff", fg="white", font=font(size=12, weight="bold")).pack(side="left", padx=12)
+        tk.Button(choose, text="Lihat Keranjang Saya", command=self._popup_go_cart, bg="#FFD700", fg="black", font=font(size=12, weight="bold")).pack(side="left", padx=12)
+        return d
+
+    def _set_dialog_cover(self, label, cover, size):
+        # Cover dari CoverCache (tidak decode ulang); kalau gagal label menampilkan teks pengganti
+        try:
+            photo = self.covers.get(cover, size)
+        except Exception:
+            label.config(image="", text="[Gambar tidak ditemukan]")
+            label.image = None
+            return
+        label.config(image=photo, text="")
+        label.image = photo
 
     def _popup_add(self, title, cover, qty_var):
-        price = self.effective_price(title)
-        self.cart.add(title, price, cover)
-        qty_var.set(f"Jumlah di keranjang: {self.cart.items.get(title, {'qty':0})['qty']}")
+        self.engine.add_to_cart(title)
+        qty_var.set(f"Jumlah di keranjang: {self.engine.cart_qty(title)}")
         if self.cart_frame.winfo_ismapped():
-            self.refresh_cart()
+            self.refresh_cart([title])
 
     def _popup_remove(self, title, qty_var):
-        self.cart.remove(title)
-        qty_var.set(f"Jumlah di keranjang: {self.cart.items.get(title, {'qty':0})['qty']}")
+        self.engine.remove_from_cart(title)
+        qty_var.set(f"Jumlah di keranjang: {self.engine.cart_qty(title)}")
         if self.cart_frame.winfo_ismapped():
-            self.refresh_cart()
+            self.refresh_cart([title])
 
-    def _popup_continue(self, popup):
-        popup.destroy()
+    def _popup_continue(self):
+        self.dialogs.hide("added")
         self.show_store()
 
-    def _popup_go_cart(self, popup):
-        popup.destroy()
+    def _popup_go_cart(self):
+        self.dialogs.hide("added")
         self.show_cart()
 
     # Keranjang (Modul 8)
@@ -352,99 +1072,136 @@ class StoreApp:
         self.store_frame.pack(fill="both", expand=True)
         self.update_catalog_prices()
 
-    def refresh_cart(self):
-        for w in self.cart_inner.winfo_children():
-            w.destroy()
-
-        if not self.cart.items:
-            empty = tk.Frame(self.cart_inner, bg="#3f3f5f")
-            empty.pack(fill="x", padx=20, pady=20)
-            tk.Label(empty, text="Keranjang kosong. Tambahkan game dari katalog.", font=font(size=12, weight="bold"), bg="#3f3f5f", fg="#ffcc00").pack(pady=8)
-            self.update_total()
-            return
-
-        # Render tiap item (ikon besar, grid responsive, penuh kanan)
-        for title, data in self.cart.items.items():
-            qty = data["qty"]; price = data["price"]; cover = data["cover"]
-
-            card = tk.Frame(self.cart_inner, bg="#4f4f6f", bd=2, relief="ridge")
-            card.pack(fill="x", padx=12, pady=10)
-
-            card.grid_columnconfigure(0, minsize=280)
-            card.grid_columnconfigure(1, weight=1)
-            card.grid_columnconfigure(2, minsize=100)
-
-            left = tk.Frame(card, bg="#4f4f6f")
-            left.grid(row=0, column=0, sticky="nw", padx=14, pady=12)
-            try:
-                img = Image.open(cover); img = img.resize((240, 160))
-                photo = ImageTk.PhotoImage(img)
-                lbl = tk.Label(left, image=photo, bg="#4f4f6f"); lbl.image = photo
-                lbl.pack()
-            except:
-                tk.Label(left, text="[Img]", bg="#4f4f6f", fg="red", font=font(size=12, weight="bold")).pack()
-
-            mid = tk.Frame(card, bg="#4f4f6f")
-            mid.grid(row=0, column=1, sticky="nsew", padx=10, pady=12)
-            tk.Label(mid, text=ellipsize(title, 100), font=font(size=13, weight="bold"), bg="#4f4f6f", fg="white", wraplength=760, justify="left").pack(anchor="w", pady=2)
-            tk.Label(mid, text=f"{format_rupiah(price)} x{qty}", font=font(size=12, weight="bold"), bg="#4f4f6f", fg="#FFD700").pack(anchor="w", pady=2)
-
-            right = tk.Frame(card, bg="#4f4f6f")
-            right.grid(row=0, column=2, sticky="ne", padx=12, pady=12)
-            tk.Button(right, text="+", command=lambda t=title: self._inc(t), bg="#32cd32", fg="white", font=font(size=12, weight="bold"), width=4).pack(pady=6)
-            tk.Button(right, text="-", command=lambda t=title: self._dec(t), bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=4).pack(pady=6)
-
-        self.update_total()
+    def refresh_cart(self, titles=None):
+        self.redraw.mark("cart", titles)
+        self.redraw.mark("totals")
+
+    @timed("cart.render")
+    def _render_cart(self, titles):
+        # Diff-based: titles=None → cocokkan semua baris, selain itu hanya baris judul tersebut yang disentuh
+        items = self.engine.cart.items
+        if titles is None:
+            for title in [t for t in self.cart_rows if t not in items]:
+                self.cart_rows.pop(title)["card"].destroy()
+            titles = items.keys()
+        for title in titles:
+            data = items.get(title)
+            row = self.cart_rows.get(title)
+            if data is None:
+                if row is not None:
+                    self.cart_rows.pop(title)["card"].destroy()
+                continue
+            if row is None:
+                row = self._build_cart_row(title, data)
+                self.cart_rows[title] = row
+            text = f"{format_rupiah(data.price)} x{data.qty}"
+            if row["text"] != text:
+                row["qty_label"].config(text=text)
+                PROFILE.count("label.reconfigure")
+                row["text"] = text
+
+        if not items and self.cart_empty is None:
+            self.cart_empty = tk.Frame(self.cart_inner, bg="#3f3f5f")
+            self.cart_empty.pack(fill="x", padx=20, pady=20)
+            tk.Label(self.cart_empty, text="Keranjang kosong. Tambahkan game dari katalog.", font=font(size=12, weight="bold"), bg="#3f3f5f", fg="#ffcc00").pack(pady=8)
+        elif items and self.cart_empty is not None:
+            self.cart_empty.destroy()
+            self.cart_empty = None
+
+    def _build_cart_row(self, title, data):
+        # Render satu item (ikon besar, grid responsive, penuh kanan)
+        card = tk.Frame(self.cart_inner, bg=COLORS["cart_row"], bd=2, relief="ridge")
+        card.pack(fill="x", padx=12, pady=10)
+
+        card.grid_columnconfigure(0, minsize=280)
+        card.grid_columnconfigure(1, weight=1)
+        card.grid_columnconfigure(2, minsize=100)
+
+        left = tk.Frame(card, bg=COLORS["cart_row"])
+        left.grid(row=0, column=0, sticky="nw", padx=14, pady=12)
+        size = COVER_SIZES["cart"]
+        lbl = tk.Label(left, image=self.covers.placeholder(size), bg=COLORS["cart_row"])
+        lbl.pack()
+        self.covers.request(data.cover, size, lambda photo, l=lbl: self._set_cover(l, photo))
+
+        mid = tk.Frame(card, bg=COLORS["cart_row"])
+        mid.grid(row=0, column=1, sticky="nsew", padx=10, pady=12)
+        tk.Label(mid, text=ellipsize(title, 100), wraplength=760, justify="left", **STYLES.preset("cart_title")).pack(anchor="w", pady=2)
+        qty_label = tk.Label(mid, **STYLES.preset("cart_qty"))
+        qty_label.pack(anchor="w", pady=2)
+
+        right = tk.Frame(card, bg=COLORS["cart_row"])
+        right.grid(row=0, column=2, sticky="ne", padx=12, pady=12)
+        tk.Button(right, text="+", command=lambda t=title: self._inc(t), width=4, **STYLES.preset("cart_inc")).pack(pady=6)
+        tk.Button(right, text="-", command=lambda t=title: self._dec(t), width=4, **STYLES.preset("cart_dec")).pack(pady=6)
+        return {"card": card, "qty_label": qty_label, "text": None}
 
     def _inc(self, title):
-        price = self.cart.items[title]["price"]; cover = self.cart.items[title]["cover"]
-        self.cart.add(title, price, cover)
-        self.refresh_cart()
+        self.engine.add_again(title)
+        self.refresh_cart([title])
 
     def _dec(self, title):
-        self.cart.remove(title)
-        self.refresh_cart()
+        self.engine.remove_from_cart(title)
+        self.refresh_cart([title])
 
     def update_total(self):
-        total = self.cart.total()
-        text = f"Total: {format_rupiah(total)}" if self.cart.unique_count() < 3 else f"Total (Diskon 20%): {format_rupiah(total)}"
+        self.redraw.mark("totals")
+        self.redraw.mark("balance")
+
+    def _render_totals(self, _keys):
+        total = self.engine.cart.total()
+        text = f"Total: {format_rupiah(total)}" if self.engine.cart.unique_count() < 3 else f"Total (Diskon 20%): {format_rupiah(total)}"
         self.label_total.config(text=text)
-        self.label_balance_store.config(text=format_rupiah(self.balance))
-        self.label_balance_cart.config(text=format_rupiah(self.balance))
+
+    def _render_balance(self, _keys):
+        saldo = format_rupiah(self.engine.balance)
+        self.label_balance_store.config(text=saldo)
+        self.label_balance_cart.config(text=saldo)
 
     def confirm_checkout_ui(self, total_pay, penerima_text):
-        win = tk.Toplevel(self.root)
+        d = self.dialogs.get("confirm", self._build_confirm_dialog, on_close=lambda: self._confirm_answer(False))
+        d["total"].config(text=f"Total yang akan dibayar: {format_rupiah(total_pay)}")
+        d["recipient"].config(text=f"Penerima: {penerima_text}")
+        d["answer"].set("")
+        self.dialogs.show("confirm")
+        # Dialog tidak dihancurkan, jadi tunggu jawabannya (bukan wait_window)
+        self.root.wait_variable(d["answer"])
+        return d["answer"].get() == "ya"
+
+    def _build_confirm_dialog(self, win):
         win.title("Konfirmasi Pembelian")
         win.geometry("560x480")
         win.configure(bg="#1b1b2e")
-        win.grab_set()
+        d = {"answer": tk.StringVar(value="")}
 
         tk.Label(win, text="Apakah Anda yakin membeli?", font=font(size=20, weight="bold"), bg="#1b1b2e", fg="#FFD700").pack(pady=16)
         box = tk.Frame(win, bg="#2a2a46", bd=2, relief="ridge"); box.pack(fill="x", padx=20, pady=12)
-        tk.Label(box, text=f"Total yang akan dibayar: {format_rupiah(total_pay)}", font=font(size=14, weight="bold"), bg="#2a2a46", fg="#32cd32").pack(pady=8)
-        tk.Label(box, text=f"Penerima: {penerima_text}", font=font(size=12), bg="#2a2a46", fg="white").pack(pady=4)
+        d["total"] = tk.Label(box, font=font(size=14, weight="bold"), bg="#2a2a46", fg="#32cd32")
+        d["total"].pack(pady=8)
+        d["recipient"] = tk.Label(box, font=font(size=12), bg="#2a2a46", fg="white")
+        d["recipient"].pack(pady=4)
         tk.Label(box, text="Pastikan keranjang sesuai sebelum melanjutkan.", font=font(size=11), bg="#2a2a46", fg="#a0a0c0").pack(pady=6)
 
         actions = tk.Frame(win, bg="#1b1b2e"); actions.pack(pady=18)
         tk.Button(actions, text="Ya, Lanjutkan Pembelian ✅", bg="#32cd32", fg="white", font=font(size=12, weight="bold"), width=24,
-                  command=lambda: [setattr(win, "confirmed", True), win.destroy()]).pack(side="left", padx=10)
+                  command=lambda: self._confirm_answer(True)).pack(side="left", padx=10)
         tk.Button(actions, text="Batalkan ❌", bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=16,
-                  command=lambda: [setattr(win, "confirmed", False), win.destroy()]).pack(side="left", padx=10)
+                  command=lambda: self._confirm_answer(False)).pack(side="left", padx=10)
+        return d
 
-        win.confirmed = False
-        self.root.wait_window(win)
-        return win.confirmed
+    def _confirm_answer(self, confirmed):
+        self.dialogs.hide("confirm")
+        self.dialogs.dialogs["confirm"]["answer"].set("ya" if confirmed else "batal")
 
     def checkout(self):
-        if not self.cart.items:
-            show_colored_dialog(self.root, "Keranjang Kosong", "Belum ada game di keranjang. Tambahkan game dari katalog.",
+        try:
+            total_pay = self.engine.validate_checkout()
+        except EmptyCartError as e:
+            show_colored_dialog(self.root, "Keranjang Kosong", str(e),
                                 bg="#2b2b44", fg_title="#ffcc00", fg_msg="white")
             return
-
-        total_pay = self.cart.total()
-        if self.balance < total_pay:
-            show_colored_dialog(self.root, "Saldo Tidak Cukup",
-                                f"Total belanja {format_rupiah(total_pay)} melebihi saldo {format_rupiah(self.balance)}.",
+        except InsufficientBalanceError as e:
+            show_colored_dialog(self.root, "Saldo Tidak Cukup", str(e),
                                 bg="#3b1f24", fg_title="#ff6b6b", fg_msg="#ffd7d7")
             return
 
@@ -452,31 +1209,69 @@ class StoreApp:
         if not self.confirm_checkout_ui(total_pay, penerima_text):
             return
 
-        self.balance -= total_pay
+        try:
+            purchased_summary, spin_count = self.engine.checkout(penerima_text)
+        except CheckoutError as e:
+            show_colored_dialog(self.root, "Checkout Gagal", str(e),
+                                bg="#3b1f24", fg_title="#ff6b6b", fg_msg="#ffd7d7")
+            return
         self.update_total()
-
-        spin_count = self.cart.total_count()
-        self.spin_used = False
-        self.last_spin_count = spin_count
-
-        purchased_summary = self.cart.summary_lines()
-        self.cart.clear()
         self.refresh_cart()
+        self.update_catalog_prices()   # voucher habis dipakai checkout ini
         self.show_receipt(purchased_summary, spin_count)
 
     def show_receipt(self, purchased_summary, spin_count):
-        win = tk.Toplevel(self.root)
+        d = self.dialogs.get("receipt", self._build_receipt)
+        penerima_text = f"Gift untuk {self.recipient_var.get()}" if self.is_gift.get() else "Akun saya"
+        d["recipient"].config(text=f"Penerima: {penerima_text}")
+        total_pay = sum(p for _, _, p, _ in purchased_summary)
+        d["total"].config(text=f"Total Dibayar: {format_rupiah(total_pay)}")
+        d["balance"].config(text=f"Sisa Saldo: {format_rupiah(self.engine.balance)}")
+
+        # Baris struk dipakai ulang; kekurangan dibuat, kelebihan disembunyikan (pack_forget)
+        rows = d["rows"]
+        while len(rows) < len(purchased_summary):
+            rows.append(self._build_receipt_row(d["inner"]))
+        for row, (title, qty, subtotal, cover) in zip(rows, purchased_summary):
+            try:
+                photo = self.covers.get(cover, COVER_SIZES["receipt"])
+                row["img"].config(image=photo, text="")
+            except Exception:
+                photo = None
+                row["img"].config(image="", text="[IMG]")
+            row["img"].image = photo
+            row["title"].config(text=ellipsize(title, 85))
+            row["qty"].config(text=f"Jumlah: {qty}")
+            row["subtotal"].config(text=f"Subtotal: {format_rupiah(subtotal)}")
+            if not row["shown"]:
+                row["frame"].pack(fill="x", padx=8, pady=8)
+                row["shown"] = True
+        for row in rows[len(purchased_summary):]:
+            if row["shown"]:
+                row["frame"].pack_forget()
+                row["shown"] = False
+        d["canvas"].yview_moveto(0)
+
+        # Order persis seperti yang dicatat engine (waktu dibuat sama dengan riwayat / created_at di DB)
+        d["order"] = self.engine.last_order
+
+        d["spins"].config(text=f"🎲 Kamu mendapatkan {spin_count} spin")
+        d["spin_btn"].config(state="normal", text="Mainkan Lucky Spin")
+        self.dialogs.show("receipt", grab=False)
+
+    def _build_receipt(self, win):
         win.title("Struk Pembelian")
         win.geometry("900x800")
         win.configure(bg="#1e1e2f")
+        d = {"rows": []}
 
         tk.Label(win, text="✅ Pembelian Berhasil", font=font(size=22, weight="bold"), fg="#32cd32", bg="#1e1e2f").pack(pady=10)
-        penerima_text = f"Gift untuk {self.recipient_var.get()}" if self.is_gift.get() else "Akun saya"
-        tk.Label(win, text=f"Penerima: {penerima_text}", font=font(size=12, weight="bold"), fg="white", bg="#1e1e2f").pack()
-
-        total_pay = sum(p for _, _, p, _ in purchased_summary)
-        tk.Label(win, text=f"Total Dibayar: {format_rupiah(total_pay)}", font=font(size=14, weight="bold"), fg="#FFD700", bg="#1e1e2f").pack(pady=6)
-        tk.Label(win, text=f"Sisa Saldo: {format_rupiah(self.balance)}", font=font(size=14, weight="bold"), fg="#1e90ff", bg="#1e1e2f").pack(pady=2)
+        d["recipient"] = tk.Label(win, font=font(size=12, weight="bold"), fg="white", bg="#1e1e2f")
+        d["recipient"].pack()
+        d["total"] = tk.Label(win, font=font(size=14, weight="bold"), fg="#FFD700", bg="#1e1e2f")
+        d["total"].pack(pady=6)
+        d["balance"] = tk.Label(win, font=font(size=14, weight="bold"), fg="#1e90ff", bg="#1e1e2f")
+        d["balance"].pack(pady=2)
 
         list_canvas = tk.Canvas(win, bg="#23233a", height=420, highlightthickness=0)
         scrollbar = tk.Scrollbar(win, orient="vertical", command=list_canvas.yview)
@@ -488,45 +1283,110 @@ class StoreApp:
         scrollbar.pack(side="right", fill="y")
         list_canvas.bind("<Enter>", lambda e: win.bind_all("<MouseWheel>", lambda ev: list_canvas.yview_scroll(int(-1*(ev.delta/120)), "units")))
         list_canvas.bind("<Leave>", lambda e: win.unbind_all("<MouseWheel>"))
+        d["canvas"], d["inner"] = list_canvas, inner
 
-        for title, qty, subtotal, cover in purchased_summary:
-            row = tk.Frame(inner, bg="#2e2e4a", bd=2, relief="ridge")
-            row.pack(fill="x", padx=8, pady=8)
-
-            try:
-                img = Image.open(cover); img = img.resize((180, 120))
-                photo = ImageTk.PhotoImage(img)
-                img_lbl = tk.Label(row, image=photo, bg="#2e2e4a"); img_lbl.image = photo
-                img_lbl.pack(side="left", padx=12, pady=10)
-            except:
-                tk.Label(row, text="[IMG]", font=font(size=12, weight="bold"), bg="#2e2e4a", fg="red").pack(side="left", padx=12, pady=10)
-
-            info = tk.Frame(row, bg="#2e2e4a"); info.pack(side="left", padx=10, pady=10)
-            tk.Label(info, text=ellipsize(title, 85), font=font(size=12, weight="bold"), bg="#2e2e4a", fg="white", wraplength=560, justify="left").pack(anchor="w")
-            tk.Label(info, text=f"Jumlah: {qty}", font=font(size=12), bg="#2e2e4a", fg="#1e90ff").pack(anchor="w")
-            tk.Label(info, text=f"Subtotal: {format_rupiah(subtotal)}", font=font(size=12, weight="bold"), bg="#2e2e4a", fg="#FFD700").pack(anchor="w")
-
-        tk.Label(win, text=f"🎲 Kamu mendapatkan {spin_count} spin", font=font(size=14, weight="bold"), fg="#1e90ff", bg="#1e1e2f").pack(pady=12)
+        d["spins"] = tk.Label(win, font=font(size=14, weight="bold"), fg="#1e90ff", bg="#1e1e2f")
+        d["spins"].pack(pady=12)
         spin_btn = tk.Button(win, text="Mainkan Lucky Spin", bg="#8a2be2", fg="white", font=font(size=12, weight="bold"))
         spin_btn.pack()
         spin_btn.config(command=lambda b=spin_btn: self.open_simple_spin(win, b))  # disable setelah mulai
+        d["spin_btn"] = spin_btn
 
         action_bar = tk.Frame(win, bg="#1e1e2f"); action_bar.pack(pady=16)
-        tk.Button(action_bar, text="Tutup", command=win.destroy, bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=14).pack(side="left", padx=8)
-        tk.Button(action_bar, text="Kembali ke Toko", command=lambda: [win.destroy(), self.show_store()],
+        tk.Button(action_bar, text="Tutup", command=lambda: self.dialogs.hide("receipt"), bg="#ff6347", fg="white", font=font(size=12, weight="bold"), width=14).pack(side="left", padx=8)
+        tk.Button(action_bar, text="Kembali ke Toko", command=lambda: [self.dialogs.hide("receipt"), self.show_store()],
                   bg="#32cd32", fg="white", font=font(size=12, weight="bold"), width=16).pack(side="left", padx=8)
+        save_btn = tk.Button(action_bar, text="💾 Simpan Struk", bg="#1e90ff", fg="white", font=font(size=12, weight="bold"), width=16)
+        save_btn.config(command=lambda: self.export_receipt(save_btn))
+        save_btn.pack(side="left", padx=8)
+        return d
+
+    # Ekspor struk & riwayat (Modul 4, 8)
+    # File ditulis streaming oleh StoreExport di thread worker; loop Tk hanya mem-poll progres lewat after.
+    def _ask_export_path(self, parent, initial):
+        from tkinter import filedialog
+        return filedialog.asksaveasfilename(parent=parent, initialfile=initial, defaultextension=".pdf",
+                                            filetypes=[("PDF", "*.pdf"), ("CSV", "*.csv")])
+
+    def export_history(self, button):
+        path = self._ask_export_path(self.root, "riwayat_pesanan.pdf")
+        if path:
+            self._run_export(self.engine.iter_order_history(), path, "Riwayat Pesanan", button)
+
+    def export_receipt(self, button):
+        d = self.dialogs.dialogs["receipt"]
+        order = d["order"]
+        path = self._ask_export_path(d["win"], f"struk_{order[0]}.pdf")
+        if path:
+            self._run_export([order], path, f"Struk Order #{order[0]}", button)
+
+    def _run_export(self, orders, path, title, button, poll_ms=100):
+        from StoreExport import ExportCancelled, export_orders
+        if self._export is not None:
+            show_colored_dialog(self.root, "Ekspor Berjalan", "Tunggu ekspor sebelumnya selesai dulu.",
+                                bg="#2b2b44", fg_title="#ffcc00", fg_msg="white")
+            return
+        if self._export_pool is None:
+            self._export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+            self.root.bind("<Destroy>", lambda e: self._cancel_export() if e.widget is self.root else None, add="+")
+        progress = [0]
+        cancel = threading.Event()
+        future = self._export_pool.submit(export_orders, orders, path, None, title,
+                                          lambda n: progress.__setitem__(0, n), cancel)
+        self._export = (future, cancel)
+        label = button.cget("text")
+        button.config(state="disabled")
+
+        def poll():
+            if not future.done():
+                button.config(text=f"Mengekspor… {progress[0]:,} order".replace(",", " "))
+                self.root.after(poll_ms, poll)
+                return
+            self._export = None
+            button.config(state="normal", text=label)
+            try:
+                count = future.result()
+            except ExportCancelled:
+                return
+            except (OSError, ValueError) as e:
+                show_colored_dialog(self.root, "Ekspor Gagal", str(e), bg="#3b1f24", fg_title="#ff6b6b", fg_msg="#ffd7d7")
+                return
+            show_colored_dialog(self.root, "Ekspor Selesai", f"{count:,}".replace(",", " ") + f" order ditulis ke\n{path}",
+                                bg="#1b1b2e", fg_title="#32cd32", fg_msg="white")
+
+        self.root.after(poll_ms, poll)
+
+    def _cancel_export(self):
+        if self._export is not None:
+            self._export[1].set()
+        if self._export_pool is not None:
+            self._export_pool.shutdown(wait=False)
+
+    def _build_receipt_row(self, inner):
+        row = {"shown": False}
+        row["frame"] = tk.Frame(inner, bg=COLORS["receipt_row"], bd=2, relief="ridge")
+        row["img"] = tk.Label(row["frame"], font=font(size=12, weight="bold"), bg=COLORS["receipt_row"], fg="red")
+        row["img"].pack(side="left", padx=12, pady=10)
+        info = tk.Frame(row["frame"], bg=COLORS["receipt_row"]); info.pack(side="left", padx=10, pady=10)
+        row["title"] = tk.Label(info, wraplength=560, justify="left", **STYLES.preset("receipt_title"))
+        row["title"].pack(anchor="w")
+        row["qty"] = tk.Label(info, **STYLES.preset("receipt_qty"))
+        row["qty"].pack(anchor="w")
+        row["subtotal"] = tk.Label(info, **STYLES.preset("receipt_subtotal"))
+        row["subtotal"].pack(anchor="w")
+        return row
 
     def open_simple_spin(self, parent, spin_btn):
-        if self.spin_used:
+        if self.engine.spin_used:
             show_colored_dialog(self.root, "Spin Selesai", "Spin sudah digunakan untuk transaksi ini.",
                                 bg="#2b2b44", fg_title="#ffcc00", fg_msg="white")
             return
-        if self.last_spin_count <= 0:
+        if self.engine.last_spin_count <= 0:
             show_colored_dialog(self.root, "Spin Tidak Tersedia", "Tidak ada spin yang tersedia untuk transaksi ini.",
                                 bg="#2b2b44", fg_title="#ffcc00", fg_msg="white")
             return
 
-        self.spin_used = True
+        self.engine.begin_spins()
         spin_btn.config(state="disabled", text="Spin sudah dimainkan")
 
         spin_win = tk.Toplevel(parent)
@@ -536,7 +1396,7 @@ class StoreApp:
         spin_win.grab_set()
 
         tk.Label(spin_win, text="Lucky Spin", font=font(size=20, weight="bold"), fg="#FFD700", bg="#14142a").pack(pady=12)
-        tk.Label(spin_win, text=f"Jumlah spin: {self.last_spin_count}", font=font(size=12, weight="bold"), fg="#32cd32", bg="#14142a").pack(pady=4)
+        tk.Label(spin_win, text=f"Jumlah spin: {self.engine.last_spin_count}", font=font(size=12, weight="bold"), fg="#32cd32", bg="#14142a").pack(pady=4)
 
 
         reel = tk.Label(spin_win, text="Siapkan...", font=font(size=22, weight="bold"), fg="white", bg="#1e1e3b", width=24)
@@ -546,122 +1406,108 @@ class StoreApp:
         result_box.pack(pady=10)
         result_box.insert("end", "Hasil spin akan muncul di sini...\n")
 
-        rewards = [
-            "Saldo Rp 100 000",
-            "Voucher Diskon 10%",
-            "Bonus Sticker 🎮",
-            "Zonk 😅",
-        ]
-
         ctrl = tk.Frame(spin_win, bg="#14142a"); ctrl.pack(pady=10)
         start_btn = tk.Button(ctrl, text="Mulai Spin", bg="#8a2be2", fg="white", font=font(size=12, weight="bold"))
-        close_btn = tk.Button(ctrl, text="Tutup", command=spin_win.destroy, bg="#ff6347", fg="white", font=font(size=12, weight="bold"))
+        close_btn = tk.Button(ctrl, text="Tutup", bg="#ff6347", fg="white", font=font(size=12, weight="bold"))
         start_btn.pack(side="left", padx=10)
         close_btn.pack(side="left", padx=10)
 
-        spinning = {"running": False, "played": False}
-
-        def apply_reward(reward):
-            if reward.startswith("Saldo"):
-                self.balance += 100000
+        skip_btn = tk.Button(ctrl, text="Lewati Animasi", state="disabled", bg="#2b2b44", fg="white", font=font(size=12, weight="bold"))
+        skip_btn.pack(side="left", padx=10)
+
+        def reward_line(reward, kind):
+            value = self.engine.rewards.get(reward).value
+            if kind == "saldo":
+                return f"- Saldo bertambah {format_rupiah(value)} dan langsung masuk."
+            if kind == "voucher":
+                return f"- Voucher diskon {value}% aktif untuk katalog hingga checkout berikutnya."
+            if kind == "sticker":
+                return f"- Kamu mendapat {reward}."
+            return "- Tidak ada hadiah kali ini."
+
+        def apply_results(results):
+            # Satu atau banyak spin sekaligus: satu insert ke Text, region saldo/harga ditandai sekali
+            lines, kinds = [], set()
+            for i, reward in results:
+                kind = self.engine.apply_reward(reward)
+                kinds.add(kind)
+                lines.append(f"Spin #{i + 1}: {reward}\n{reward_line(reward, kind)}")
+            reel.config(text=results[-1][1])
+            result_box.insert("end", "\n".join(lines) + "\n")
+            result_box.see("end")
+            if "saldo" in kinds:
                 self.update_total()
-                result_box.insert("end", "- Saldo bertambah Rp 100 000 dan langsung masuk.\n")
-            elif "Voucher Diskon" in reward:
-                self.next_discount_percent = 10
+            if "voucher" in kinds:
                 self.update_catalog_prices()
-                result_box.insert("end", "- Voucher diskon 10% aktif untuk katalog hingga checkout berikutnya.\n")
-            elif "Bonus Sticker" in reward:
-                result_box.insert("end", "- Kamu mendapat Bonus Sticker 🎮.\n")
-            else:
-                result_box.insert("end", "- Tidak ada hadiah kali ini.\n")
-
-        def animate_once(target_reward, cycles=20, interval_ms=60):
-            seq = []
-            for _ in range(cycles):
-                seq += rewards
-            idx = 0
-
-            def step():
-                nonlocal idx
-                if idx < len(seq):
-                    reel.config(text=seq[idx])
-                    idx += 1
-                    spin_win.after(interval_ms, step)
-                else:
-                    reel.config(text=target_reward)
-                    apply_reward(target_reward)
-                    result_box.insert("end", f"Hasil akhir: {target_reward}\n")
-                    result_box.see("end")
-                    spinning["running"] = False
-                    spinning["played"] = True
-                    start_btn.config(state="disabled", text="Spin selesai")
 
-            step()
+        def spins_done():
+            start_btn.config(state="disabled", text="Spin selesai")
+            skip_btn.config(state="disabled")
+
+        clock = SpinClock(spin_win, self.engine.rewards.labels, lambda text: reel.config(text=text),
+                          apply_results, spins_done)
 
         def start_spins():
-            if spinning["running"] or spinning["played"]:
+            if clock.running or clock.spins:
                 return
-            spinning["running"] = True
+            count = self.engine.last_spin_count
+            spins = [(self.engine.roll_reward(), random.randint(*SPIN_CYCLES)) for _ in range(count)]
             start_btn.config(state="disabled", text="Berjalan...")
-            count = self.last_spin_count
-
-            def run_next(i=0):
-                if i >= count:
-                    start_btn.config(state="disabled", text="Spin selesai")
-                    spinning["running"] = False
-                    spinning["played"] = True
-                    return
-                target = random.choice(rewards)
-                result_box.insert("end", f"Spin #{i+1}...\n")
-                result_box.see("end")
-                animate_once(target, cycles=18 + random.randint(4, 10), interval_ms=55)
-                total_duration = (18 + 10) * 55 + 300
-                spin_win.after(total_duration, lambda: run_next(i+1))
-
-            run_next()
+            skip_btn.config(state="normal", command=clock.fast_forward)
+            clock.start(spins)
+            if count >= SPIN_BATCH_THRESHOLD:
+                # Pembelian besar: semua hasil langsung, animasi panjang tidak ditunggu
+                clock.fast_forward()
+
+        def close_spin():
+            # Spin sudah dibayar: yang belum selesai diselesaikan dulu supaya hadiahnya tidak hilang
+            clock.fast_forward()
+            spin_win.destroy()
 
         start_btn.config(command=start_spins)
+        close_btn.config(command=close_spin)
+        spin_win.protocol("WM_DELETE_WINDOW", close_spin)
 
     def daily_deal_popup(self):
-        rekom = random.choice(self.games)
-
-        deal_win = tk.Toplevel(self.root)
+        rekom, harga_asli, potongan, harga_baru, persen = self.engine.roll_daily_deal()
+        d = self.dialogs.get("deal", self._build_daily_deal)
+        d["deal"] = (rekom.title, harga_baru)
+        self._set_dialog_cover(d["img"], rekom.cover, COVER_SIZES["deal"])
+        d["title"].config(text=rekom.title)
+        d["asli"].config(text=f"Harga asli: {format_rupiah(harga_asli)}")
+        d["baru"].config(text=f"Menjadi: {format_rupiah(harga_baru)}")
+        d["potongan"].config(text=f"Diskon: {format_rupiah(potongan)} ({persen}%)")
+        self.dialogs.show("deal")
+
+    def _build_daily_deal(self, deal_win):
         deal_win.title("🔥 Daily Deal!")
         deal_win.geometry("640x720")
         deal_win.configure(bg="#1e1e2f")
-        deal_win.grab_set()
+        d = {"deal": None}
 
         tk.Label(deal_win, text="🔥 Game of the Day 🔥", font=font(size=24, weight="bold"), fg="#FFD700", bg="#1e1e2f").pack(pady=20)
-
-        try:
-            img = Image.open(rekom.cover); img = img.resize((420, 260))
-            photo = ImageTk.PhotoImage(img)
-            label_img = tk.Label(deal_win, image=photo, bg="#1e1e2f"); label_img.image = photo
-            label_img.pack(pady=12)
-        except:
-            tk.Label(deal_win, text="[Gambar tidak ditemukan]", bg="#1e1e2f", fg="red", font=font(size=12)).pack(pady=12)
-
-        tk.Label(deal_win, text=rekom.title, font=font(size=18, weight="bold"), fg="white", bg="#1e1e2f", wraplength=560, justify="center").pack(pady=5)
-
-        harga_asli = self.base_price[rekom.title]
-        potongan = random.choice([50000, 100000, 150000])
-        harga_baru = max(0, harga_asli - potongan)
-        persen = int(round((potongan / harga_asli) * 100)) if harga_asli > 0 else 0
-
-        tk.Label(deal_win, text=f"Harga asli: {format_rupiah(harga_asli)}", font=font(size=14), fg="#ff6347", bg="#1e1e2f").pack()
-        tk.Label(deal_win, text=f"Menjadi: {format_rupiah(harga_baru)}", font=font(size=16, weight="bold"), fg="#32cd32", bg="#1e1e2f").pack(pady=4)
-        tk.Label(deal_win, text=f"Diskon: {format_rupiah(potongan)} ({persen}%)", font=font(size=13, weight="bold"), fg="#FFD700", bg="#1e1e2f").pack(pady=6)
+        d["img"] = tk.Label(deal_win, bg="#1e1e2f", fg="red", font=font(size=12))
+        d["img"].pack(pady=12)
+        d["title"] = tk.Label(deal_win, font=font(size=18, weight="bold"), fg="white", bg="#1e1e2f", wraplength=560, justify="center")
+        d["title"].pack(pady=5)
+        d["asli"] = tk.Label(deal_win, font=font(size=14), fg="#ff6347", bg="#1e1e2f")
+        d["asli"].pack()
+        d["baru"] = tk.Label(deal_win, font=font(size=16, weight="bold"), fg="#32cd32", bg="#1e1e2f")
+        d["baru"].pack(pady=4)
+        d["potongan"] = tk.Label(deal_win, font=font(size=13, weight="bold"), fg="#FFD700", bg="#1e1e2f")
+        d["potongan"].pack(pady=6)
         tk.Label(deal_win, text="Tekan 'Terapkan Diskon' untuk mengaktifkan harga di katalog.", font=font(size=11), fg="white", bg="#1e1e2f").pack(pady=10)
 
         btns = tk.Frame(deal_win, bg="#1e1e2f"); btns.pack(pady=20)
 
         def apply_discount():
-            self.active_price[rekom.title] = harga_baru
+            self.engine.apply_daily_deal(*d["deal"])
             self.update_catalog_prices()
-            deal_win.destroy()
+            self.dialogs.hide("deal")
 
         tk.Button(btns, text="Terapkan Diskon", command=apply_discount, bg="#1e90ff", fg="white", font=font(size=12, weight="bold")).pack(side="left", padx=10)
-        tk.Button(btns, text="Tutup", command=deal_win.destroy, bg="#ff6347", fg="white", font=font(size=12, weight="bold")).pack(side="left", padx=10)
+        tk.Button(btns, text="Tutup", command=lambda: self.dialogs.hide("deal"), bg="#ff6347", fg="white", font=font(size=12, weight="bold")).pack(side="left", padx=10)
+        return d
 
 class BalanceMenu:
     def __init__(self, root, default_balance=500000, on_start=None):
@@ -718,13 +1564,207 @@ class BalanceMenu:
             self.on_start(self.default_balance)
         self.win.destroy()
 
+# Startup (Modul 4, 8)
+# Sambil BalanceMenu menunggu input: PIL diimpor dan engine + katalog dibangun di thread background (tanpa Tk),
+# lalu StoreApp dibangun di balik menu (root masih withdraw) sehingga cover kartu sudah di-decode worker.
+# Setelah saldo dikonfirmasi tinggal memasang saldo awal dan menampilkan root.
+STARTUP_STAGES = (
+    ("imported", "import modul"),
+    ("menu", "jendela pertama (BalanceMenu)"),
+    ("engine", "engine + katalog siap"),
+    ("index", "indeks pencarian siap (background)"),
+    ("app", "toko dibangun"),
+    ("confirm", "saldo dikonfirmasi"),
+    ("shown", "toko tampil"),
+    ("interactive", "katalog interaktif (cover termuat)"),
+)
+
+class StartupPipeline:
+    # build_engine(): tanpa Tk, boleh jalan di thread lain; mengembalikan StoreEngine dengan saldo awal default.
+    # prebuild=False = urutan lama (semua dibangun setelah konfirmasi), untuk perbandingan timing.
+    def __init__(self, root, build_engine, prebuild=True, poll_ms=10):
+        self.root = root
+        self.build_engine = build_engine
+        self.prebuild = prebuild
+        self.poll_ms = poll_ms
+        self.marks = {"start": _IMPORT_T0, "imported": _IMPORT_T1}
+        self.engine = None
+        self.app = None
+        self.balance = None
+        self.error = None
+        self.on_interactive = None
+        self._future = None
+        if prebuild:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup")
+            self._future = executor.submit(self._prepare)
+            executor.shutdown(wait=False)
+            root.after(poll_ms, self._poll_engine)
+
+    def mark(self, stage):
+        self.marks.setdefault(stage, time.perf_counter())
+
+    def watch_menu(self, menu):
+        menu.win.bind("<Map>", lambda e: self.mark("menu"), add="+")
+
+    def _prepare(self):
+        _pil()
+        engine = self.build_engine()
+        self.mark("engine")
+        self._index_in_background(engine)
+        return engine
+
+    def _index_in_background(self, engine):
+        # Indeks judul (~1 detik untuk 100k judul) dibangun di luar thread Tk supaya ketikan pertama
+        # di kolom cari tidak menunggu; toko sudah bisa tampil sebelum indeks selesai.
+        def build():
+            engine.pricing.title_index()
+            self.mark("index")
+        threading.Thread(target=build, name="search-index", daemon=True).start()
+
+    def _poll_engine(self):
+        if not self._future.done():
+            self.root.after(self.poll_ms, self._poll_engine)
+            return
+        try:
+            self.engine = self._future.result()
+        except Exception as e:
+            self.fail(e)
+            return
+        self._build_app()
+        if self.balance is not None:
+            self._show()
+
+    def _build_app(self):
+        self.app = StoreApp(self.root, engine=self.engine, deal_delay_ms=None)
+        self.mark("app")
+
+    def start(self, balance):
+        # on_start BalanceMenu; kalau engine belum siap, toko ditampilkan oleh _poll_engine begitu selesai
+        self.balance = balance
+        self.mark("confirm")
+        if not self.prebuild:
+            try:
+                self.engine = self.build_engine()
+            except Exception as e:
+                self.fail(e)
+                return
+            self.mark("engine")
+            self._index_in_background(self.engine)
+            self._build_app()
+        if self.app is not None:
+            self._show()
+
+    def _show(self):
+        self.engine.set_start_balance(self.balance)
+        self.app.update_total()
+        self.root.deiconify()
+        self.root.after(1200, self.app.daily_deal_popup)
+        self.mark("shown")
+        self._poll_interactive()
+
+    def _poll_interactive(self):
+        if self.app.covers.busy():
+            self.root.after(self.poll_ms, self._poll_interactive)
+            return
+        self.root.after_idle(self._interactive)
+
+    def _interactive(self):
+        self.mark("interactive")
+        if self.on_interactive is not None:
+            self.on_interactive(self)
+
+    def fail(self, error):
+        self.error = error
+        self.root.destroy()
+
+    def report(self):
+        t0 = self.marks["start"]
+        lines = [f"Startup Online Gamestore ({'prebuild' if self.prebuild else 'tanpa prebuild'}, ms sejak import StoreApp)"]
+        for stage, label in STARTUP_STAGES:
+            if stage in self.marks:
+                lines.append(f"  {label:<38}{(self.marks[stage] - t0) * 1000:>10.1f}")
+        if "confirm" in self.marks and "interactive" in self.marks:
+            lines.append(f"  {'konfirmasi → katalog interaktif':<38}{(self.marks['interactive'] - self.marks['confirm']) * 1000:>10.1f}")
+        return "\n".join(lines)
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    root.withdraw() 
+    parser = argparse.ArgumentParser(description="Online Gamestore")
+    parser.add_argument("--build-thumbs", action="store_true", help="buat/perbarui thumbnail cover di .thumbcache lalu keluar")
+    parser.add_argument("--catalog", help="file katalog .jsonl/.csv (kolom: title, price, cover, publisher)")
+    parser.add_argument("--no-snapshot", action="store_true", help="selalu parse ulang file katalog, jangan pakai/tulis snapshot .snap")
+    parser.add_argument("--db", help="file SQLite untuk menyimpan katalog, saldo dan riwayat order (saldo akun lama dipakai ulang)")
+    parser.add_argument("--journal", help="folder journal transaksi; state keranjang, harga, saldo dan riwayat order (tanpa --db) dipulihkan saat start")
+    parser.add_argument("--fsync", choices=("always", "batch", "never"), default="batch", help="kebijakan fsync journal (default: batch)")
+    parser.add_argument("--rewards", help="file JSON tabel hadiah Lucky Spin (label, kind, weight, value)")
+    parser.add_argument("--no-prebuild", action="store_true", help="bangun toko setelah saldo dikonfirmasi, bukan di balik BalanceMenu")
+    parser.add_argument("--startup-timing", action="store_true", help="ukur startup: menu dikonfirmasi otomatis, laporan dicetak lalu keluar")
+    parser.add_argument("--menu-wait", type=int, default=0, metavar="MS", help="dengan --startup-timing: lama 'pengguna' di BalanceMenu (default 0)")
+    parser.add_argument("--profile", metavar="MODE", help="instrumentasi: spans,trace,cprofile,tracemalloc (sama dengan env STORE_PROFILE)")
+    parser.add_argument("--profile-out", metavar="DIR", help="folder laporan profil (default: ./profile)")
+    args = parser.parse_args()
+    if args.profile:
+        try:
+            PROFILE.configure(args.profile, args.profile_out)
+        except ValueError as e:
+            parser.error(str(e))
+    PROFILE.instrument_tk(tk)
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    img_dir = os.path.join(base_dir, "images")
+    rewards = None
+    if args.rewards:
+        try:
+            rewards = load_reward_table(args.rewards)
+        except (OSError, RewardTableError) as e:
+            parser.error(f"tabel hadiah tidak bisa dimuat: {e}")
 
-    def start_app(initial_balance):
-        root.deiconify()
-        StoreApp(root, initial_balance=initial_balance)
+    if args.build_thumbs:
+        catalog = None
+        if args.catalog:
+            try:
+                catalog = load_catalog(args.catalog, img_dir, snapshot=not args.no_snapshot)
+            except (OSError, CatalogFormatError) as e:
+                parser.error(f"katalog tidak bisa dimuat: {e}")
+        store = ThumbnailStore(os.path.join(base_dir, ".thumbcache"))
+        if catalog is not None:
+            covers = [c for c in catalog.covers if c and os.path.exists(c)]
+        else:
+            covers = sorted(os.path.join(img_dir, f) for f in os.listdir(img_dir) if f.lower().endswith(".png"))
+        built = store.build(covers)
+        print(f"{built} dari {len(covers)} cover diperbarui di {store.cache_dir}")
+        raise SystemExit(0)
 
-    BalanceMenu(root, default_balance=500000, on_start=start_app)
+    root = tk.Tk()
+    root.withdraw()
+
+    default_balance = 500000
+    journal = None
+    if args.journal:
+        from StoreJournal import Journal
+        journal = Journal(args.journal, fsync=args.fsync)
+        root.bind("<Destroy>", lambda e: journal.close() if e.widget is root else None, add="+")
+
+    def build_engine():
+        # Dijalankan di thread startup: katalog, StoreDB dan recovery journal tanpa menyentuh Tk
+        games = (load_catalog(args.catalog, img_dir, snapshot=not args.no_snapshot) if args.catalog
+                 else default_games(img_dir))
+        db = None
+        if args.db:
+            from StoreDB import StoreDB
+            db = StoreDB(args.db)
+        return StoreEngine(games, default_balance, db=db, journal=journal, rewards=rewards)
+
+    pipeline = StartupPipeline(root, build_engine, prebuild=not args.no_prebuild)
+    menu = BalanceMenu(root, default_balance=default_balance, on_start=pipeline.start)
+    pipeline.watch_menu(menu)
+    if args.startup_timing:
+        def finish(p):
+            print(p.report())
+            root.destroy()
+        pipeline.on_interactive = finish
+        root.after(max(1, args.menu_wait), menu._use_default)
     root.mainloop()
+    if pipeline.error is not None:
+        if isinstance(pipeline.error, (OSError, CatalogFormatError)):
+            parser.error(f"katalog tidak bisa dimuat: {pipeline.error}")
+        raise pipeline.error
@@ -0,0 +1,216 @@
+# =========================================
+# Online Gamestore — Penyimpanan SQLite
+# =========================================
+# Katalog, saldo akun, order dan baris order disimpan di SQLite lokal (mode WAL).
+# Checkout = satu transaksi: debit saldo + insert order + insert semua baris order.
+
+import sqlite3, threading, time
+from itertools import groupby
+from operator import itemgetter
+
+from StoreEngine import Game, InsufficientBalanceError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id        INTEGER PRIMARY KEY,
+    title     TEXT    NOT NULL UNIQUE,
+    price     INTEGER NOT NULL CHECK (price >= 0),
+    cover     TEXT    NOT NULL,
+    publisher TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_games_price ON games(price);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT    NOT NULL UNIQUE,
+    balance INTEGER NOT NULL CHECK (balance >= 0)
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id         INTEGER PRIMARY KEY,
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    created_at REAL    NOT NULL,
+    total      INTEGER NOT NULL,
+    recipient  TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_account_created ON orders(account_id, created_at);
+
+CREATE TABLE IF NOT EXISTS order_lines (
+    order_id INTEGER NOT NULL REFERENCES orders(id),
+    title    TEXT    NOT NULL,
+    qty      INTEGER NOT NULL,
+    subtotal INTEGER NOT NULL,
+    cover    TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_order_lines_order ON order_lines(order_id);
+CREATE INDEX IF NOT EXISTS idx_order_lines_title ON order_lines(title);
+"""
+
+PRICE_ORDER = {"asc": "price ASC, title ASC", "desc": "price DESC, title ASC"}
+
+class StoreDB:
+    def __init__(self, path, batch_size=5000):
+        self.path = path
+        self.batch_size = batch_size
+        # isolation_level=None: transaksi diatur manual lewat BEGIN/COMMIT di _transaction
+        # Koneksi boleh dipakai beberapa thread (sesi yang berbagi Ledger); self.lock menserialkan aksesnya
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        return _Transaction(self.conn, self.lock)
+
+    # Katalog
+    def import_catalog(self, games):
+        # Upsert per batch dalam satu transaksi; games boleh list Game atau Catalog
+        sql = ("INSERT INTO games (title, price, cover, publisher) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT(title) DO UPDATE SET price = excluded.price, cover = excluded.cover, publisher = excluded.publisher")
+        batch = []
+        with self._transaction():
+            for g in games:
+                batch.append((g.title, g.price, g.cover, g.publisher))
+                if len(batch) >= self.batch_size:
+                    self.conn.executemany(sql, batch)
+                    batch.clear()
+            if batch:
+                self.conn.executemany(sql, batch)
+
+    def game_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def _games(self, sql, params):
+        with self.lock:
+            return [Game(title, price, cover, game_id, publisher)
+                    for game_id, title, price, cover, publisher in self.conn.execute(sql, params)]
+
+    def games_in_price_range(self, min_price=0, max_price=None, order="asc", limit=None, offset=0):
+        sql = "SELECT id, title, price, cover, publisher FROM games WHERE price >= ?"
+        params = [min_price]
+        if max_price is not None:
+            sql += " AND price <= ?"
+            params.append(max_price)
+        sql += f" ORDER BY {PRICE_ORDER[order]} LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return self._games(sql, params)
+
+    def games_sorted_by_price(self, order="asc", limit=None, offset=0):
+        return self.games_in_price_range(0, None, order, limit, offset)
+
+    def game_by_title(self, title):
+        rows = self._games("SELECT id, title, price, cover, publisher FROM games WHERE title = ?", (title,))
+        return rows[0] if rows else None
+
+    # Akun & saldo
+    def ensure_account(self, name, initial_balance):
+        # Akun baru dibuat dengan saldo awal; akun lama tetap memakai saldo yang tersimpan.
+        # Mengembalikan (id, saldo, dibuat_baru)
+        with self._transaction():
+            created = self.conn.execute("INSERT OR IGNORE INTO accounts (name, balance) VALUES (?, ?)",
+                                        (name, initial_balance)).rowcount == 1
+            account_id, balance = self.conn.execute("SELECT id, balance FROM accounts WHERE name = ?", (name,)).fetchone()
+            return account_id, balance, created
+
+    def set_balance(self, account_id, balance):
+        with self._transaction():
+            self.conn.execute("UPDATE accounts SET balance = ? WHERE id = ?", (balance, account_id))
+
+    def balance(self, account_id):
+        with self.lock:
+            return self.conn.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+
+    def credit(self, account_id, amount):
+        with self._transaction():
+            self.conn.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, account_id))
+            return self.conn.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+
+    # Order
+    def record_checkout(self, account_id, total, summary_lines, recipient="Akun saya", created_at=None):
+        # Debit bersyarat (balance >= total) + order + baris order, semuanya atau tidak sama sekali
+        with self._transaction():
+            cur = self.conn.execute("UPDATE accounts SET balance = balance - ? WHERE id = ? AND balance >= ?",
+                                    (total, account_id, total))
+            if cur.rowcount == 0:
+                raise InsufficientBalanceError(total, self.balance(account_id))
+            order_id = self.conn.execute(
+                "INSERT INTO orders (account_id, created_at, total, recipient) VALUES (?, ?, ?, ?)",
+                (account_id, time.time() if created_at is None else created_at, total, recipient)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO order_lines (order_id, title, qty, subtotal, cover) VALUES (?, ?, ?, ?, ?)",
+                [(order_id, title, qty, subtotal, cover) for title, qty, subtotal, cover in summary_lines])
+            balance = self.conn.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+        return order_id, balance
+
+    def iter_orders(self, account_id=None, since=None):
+        # Streaming lewat cursor: (order_id, created_at, total, recipient), terurut waktu.
+        # Tidak memegang lock selama iterasi; untuk ekspor paralel pakai StoreDB terpisah per thread.
+        sql = "SELECT id, created_at, total, recipient FROM orders WHERE 1 = 1"
+        params = []
+        if account_id is not None:
+            sql += " AND account_id = ?"
+            params.append(account_id)
+        if since is not None:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        yield from self.conn.execute(sql + " ORDER BY created_at, id", params)
+
+    def iter_order_details(self, account_id=None, since=None):
+        # Order lengkap dari satu query JOIN, streaming: (order_id, created_at, total, recipient, baris),
+        # baris berbentuk sama dengan Cart.summary_lines(). Seperti iter_orders, tidak memegang lock.
+        sql = ("SELECT o.id, o.created_at, o.total, o.recipient, l.title, l.qty, l.subtotal, l.cover "
+               "FROM orders o LEFT JOIN order_lines l ON l.order_id = o.id WHERE 1 = 1")
+        params = []
+        if account_id is not None:
+            sql += " AND o.account_id = ?"
+            params.append(account_id)
+        if since is not None:
+            sql += " AND o.created_at >= ?"
+            params.append(since)
+        rows = self.conn.execute(sql + " ORDER BY o.created_at, o.id, l.rowid", params)
+        for head, group in groupby(rows, key=itemgetter(0, 1, 2, 3)):
+            yield (*head, [r[4:] for r in group if r[4] is not None])
+
+    def reader(self):
+        # Koneksi baru ke file yang sama, untuk membaca dari thread lain (mis. ekspor di background)
+        return StoreDB(self.path, self.batch_size)
+
+    def order_lines(self, order_id):
+        # Bentuk sama dengan Cart.summary_lines(): (judul, qty, subtotal, cover)
+        with self.lock:
+            return self.conn.execute("SELECT title, qty, subtotal, cover FROM order_lines WHERE order_id = ? ORDER BY rowid",
+                                     (order_id,)).fetchall()
+
+class _Transaction:
+    # BEGIN IMMEDIATE supaya lock tulis diambil di awal; rollback otomatis kalau ada exception
+    # Lock Python dipegang sepanjang transaksi supaya thread lain tidak menyisipkan statement
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+        self.nested = False
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.nested = self.conn.in_transaction
+        if not self.nested:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                self.lock.release()
+                raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if not self.nested:
+                self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.lock.release()
+        return False
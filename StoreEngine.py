@@ -0,0 +1,1177 @@
+# =========================================
+# Online Gamestore — Engine toko tanpa UI
+# =========================================
+# Semua aturan harga, saldo, keranjang, checkout, daily deal dan hadiah spin.
+# Tidak mengimpor tkinter/PIL sehingga bisa dipakai untuk benchmark, server, dan simulasi headless.
+
+import os, re, sys, csv, json, time, bisect, marshal, random, threading, unicodedata
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, islice
+from collections.abc import Sequence
+
+# Utilitas (Modul 4)
+def format_rupiah(value: int) -> str:
+    return f"Rp {value:,}".replace(",", " ")
+
+# Model data (Modul 5, 6)
+# __slots__: tanpa __dict__ per objek, penting untuk katalog ratusan ribu judul
+class Game:
+    __slots__ = ("title", "price", "cover", "game_id", "publisher")
+
+    def __init__(self, title, price, cover, game_id=None, publisher=""):
+        self.title = title
+        self.price = price
+        self.cover = cover
+        self.game_id = game_id
+        self.publisher = publisher
+
+class CartLine:
+    __slots__ = ("game_id", "qty", "price", "cover")
+
+    def __init__(self, game_id, price, cover):
+        self.game_id = game_id
+        self.qty = 0
+        self.price = price
+        self.cover = cover
+
+# Katalog kolumnar: judul, harga dan id cover disimpan di array paralel, id game = indeks baris
+class Catalog(Sequence):
+    def __init__(self):
+        self.titles = []
+        self.prices = array("q")
+        self.cover_ids = array("l")
+        self.covers = []          # tabel path cover unik, dirujuk lewat cover_ids
+        self._cover_index = {}
+        self.publisher_ids = array("l")
+        self.publishers = []      # tabel nama publisher unik
+        self._publisher_index = {}
+        self.index = {}           # judul → id game
+
+    @classmethod
+    def from_games(cls, games):
+        catalog = cls()
+        for g in games:
+            catalog.add(g.title, g.price, g.cover, getattr(g, "publisher", ""))
+        return catalog
+
+    @staticmethod
+    def _intern(value, table, index):
+        value_id = index.get(value)
+        if value_id is None:
+            value_id = len(table)
+            table.append(sys.intern(value))
+            index[value] = value_id
+        return value_id
+
+    def add(self, title, price, cover, publisher=""):
+        game_id = len(self.titles)
+        self.titles.append(title)
+        self.prices.append(price)
+        self.cover_ids.append(self._intern(cover, self.covers, self._cover_index))
+        self.publisher_ids.append(self._intern(publisher, self.publishers, self._publisher_index))
+        self.index[title] = game_id
+        return game_id
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, game_id):
+        # Game dibuat sebagai view sesaat; data aslinya tetap di array kolom
+        if isinstance(game_id, slice):
+            return [self[i] for i in range(*game_id.indices(len(self)))]
+        if game_id < 0:
+            game_id += len(self)
+        return Game(self.titles[game_id], self.prices[game_id], self.covers[self.cover_ids[game_id]], game_id,
+                    self.publishers[self.publisher_ids[game_id]])
+
+    def __contains__(self, item):
+        return getattr(item, "title", item) in self.index
+
+    def id_of(self, title):
+        return self.index[title]
+
+    def cover(self, game_id):
+        return self.covers[self.cover_ids[game_id]]
+
+    def publisher_id(self, publisher):
+        return self._publisher_index.get(publisher, -1)
+
+# Loader katalog eksternal (JSON Lines / CSV), dibaca baris per baris lewat generator
+class CatalogFormatError(ValueError):
+    def __init__(self, path, line, message):
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+# Harga teks: angka polos atau dikelompokkan per 3 digit dengan titik, koma atau spasi ("599.000", "1 250 000");
+# tanda minus, desimal dan notasi ilmiah ditolak
+_PRICE_TEXT = re.compile(r"\d+|\d{1,3}(?:([.,]|\s)\d{3})(?:\1\d{3})*")
+
+def parse_price_text(text):
+    # Harga dari teks (file katalog, kolom filter harga di UI) → int, atau None kalau formatnya tidak valid
+    text = text.strip()
+    return int(re.sub(r"\D", "", text)) if _PRICE_TEXT.fullmatch(text) else None
+
+def _validate_row(path, line, row, img_dir):
+    title = row.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise CatalogFormatError(path, line, "kolom 'title' wajib diisi")
+    price = row.get("price")
+    if isinstance(price, str):
+        price = parse_price_text(price)
+    if not isinstance(price, int) or isinstance(price, bool) or price < 0:
+        raise CatalogFormatError(path, line, f"harga tidak valid untuk {title!r}: {row.get('price')!r}")
+    cover = row.get("cover") or ""
+    if not isinstance(cover, str):
+        raise CatalogFormatError(path, line, f"kolom 'cover' harus teks untuk {title!r}")
+    if cover and img_dir and not os.path.isabs(cover):
+        cover = os.path.join(img_dir, cover)
+    publisher = row.get("publisher") or ""
+    return title.strip(), price, cover, str(publisher)
+
+def iter_catalog_rows(path, img_dir=None, skip_invalid=False):
+    # Menghasilkan (judul, harga, cover, publisher); file tidak pernah di-parse sebagai satu dokumen utuh
+    for _, row in _iter_numbered_rows(path, img_dir, skip_invalid):
+        yield row
+
+def _iter_numbered_rows(path, img_dir, skip_invalid):
+    is_csv = path.lower().endswith(".csv")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if is_csv:
+            rows = ((i + 2, row) for i, row in enumerate(csv.DictReader(f)))
+        else:
+            rows = ((i + 1, line) for i, line in enumerate(f) if line.strip())
+        for line, row in rows:
+            try:
+                if not is_csv:
+                    try:
+                        row = json.loads(row)
+                    except ValueError as e:
+                        raise CatalogFormatError(path, line, f"JSON tidak valid: {e}") from None
+                    if not isinstance(row, dict):
+                        raise CatalogFormatError(path, line, "setiap baris harus berupa objek JSON")
+                yield line, _validate_row(path, line, row, img_dir)
+            except CatalogFormatError:
+                if not skip_invalid:
+                    raise
+
+# Snapshot biner katalog: startup berikutnya cukup memuat array, tanpa parsing ulang
+SNAPSHOT_VERSION = 1
+
+def _snapshot_key(path, img_dir):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, img_dir or "")
+
+def save_catalog_snapshot(catalog, snapshot_path, source_key):
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "source": source_key,
+        "titles": catalog.titles,
+        "prices": (catalog.prices.typecode, catalog.prices.tobytes()),
+        "cover_ids": (catalog.cover_ids.typecode, catalog.cover_ids.tobytes()),
+        "covers": catalog.covers,
+        "publisher_ids": (catalog.publisher_ids.typecode, catalog.publisher_ids.tobytes()),
+        "publishers": catalog.publishers,
+    }
+    tmp = snapshot_path + ".tmp"
+    with open(tmp, "wb") as f:
+        marshal.dump(data, f)
+    os.replace(tmp, snapshot_path)
+
+def load_catalog_snapshot(snapshot_path, source_key=None):
+    # None kalau snapshot tidak ada, rusak, atau sumbernya sudah berubah
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    if source_key is not None and tuple(data["source"]) != tuple(source_key):
+        return None
+    catalog = Catalog()
+    catalog.titles = data["titles"]
+    for name in ("prices", "cover_ids", "publisher_ids"):
+        typecode, raw = data[name]
+        arr = array(typecode)
+        arr.frombytes(raw)
+        setattr(catalog, name, arr)
+    catalog.covers = [sys.intern(c) for c in data["covers"]]
+    catalog._cover_index = {c: i for i, c in enumerate(catalog.covers)}
+    catalog.publishers = [sys.intern(p) for p in data["publishers"]]
+    catalog._publisher_index = {p: i for i, p in enumerate(catalog.publishers)}
+    catalog.index = {t: i for i, t in enumerate(catalog.titles)}
+    return catalog
+
+def load_catalog(path, img_dir=None, snapshot=True, skip_invalid=False):
+    snapshot_path = path + ".snap"
+    source_key = _snapshot_key(path, img_dir)
+    if snapshot:
+        catalog = load_catalog_snapshot(snapshot_path, source_key)
+        if catalog is not None:
+            return catalog
+    catalog = Catalog()
+    for line, (title, price, cover, publisher) in _iter_numbered_rows(path, img_dir, skip_invalid):
+        if title in catalog.index:
+            if skip_invalid:
+                continue
+            raise CatalogFormatError(path, line, f"judul duplikat: {title!r}")
+        catalog.add(title, price, cover, publisher)
+    if snapshot:
+        try:
+            save_catalog_snapshot(catalog, snapshot_path, source_key)
+        except OSError:
+            pass  # folder read-only: tetap jalan tanpa snapshot
+    return catalog
+
+# Pencarian judul (Modul 3, 4): index prefix kata atas judul yang dinormalisasi
+_ASCII_FOLD = {c: " " for c in range(128) if not chr(c).isalnum()}
+
+def normalize_title(text):
+    # "Sekiro™: Shadows Die Twice" → "sekiro shadows die twice"; diakritik dan simbol dilipat
+    if text.isascii():
+        return " ".join(text.translate(_ASCII_FOLD).lower().split())
+    out = []
+    for ch in text:
+        if not ch.isalnum():
+            out.append(" ")  # simbol (™, ®, :, &) dan tanda baca jadi pemisah kata
+            continue
+        for part in unicodedata.normalize("NFKD", ch):
+            if not unicodedata.combining(part):
+                out.append(part.casefold())
+    return " ".join("".join(out).split())
+
+def _id_array(np, mask):
+    # Id yang True di mask sebagai array("q"): satu salinan byte, tanpa membuat objek int Python per id
+    ids = array("q")
+    ids.frombytes(np.flatnonzero(mask).astype(np.int64, copy=False).tobytes())
+    return ids
+
+class TitleIndex:
+    # words: daftar kata unik terurut. Id game per kata disimpan bersambung di satu array datar: kata ke-i menempati
+    # postings[offsets[i]:offsets[i+1]] (id urut), jadi semua kata dengan prefix yang sama adalah satu potongan yang
+    # ditemukan lewat dua bisect. Dengan NumPy potongan tiap token ditandai ke mask boolean lalu mask di-AND (hasil
+    # langsung urut katalog, tanpa set/sort); tanpa NumPy jatuh ke irisan set. Hasil per query di-cache (LRU)
+    # sehingga backspace tidak menghitung ulang.
+    def __init__(self, titles, cache_size=256):
+        buckets = {}
+        for game_id, title in enumerate(titles):
+            for word in set(normalize_title(title).split()):
+                buckets.setdefault(word, []).append(game_id)
+        self.size = len(titles)
+        self.words = sorted(buckets)
+        self.postings = array("q")
+        self.offsets = array("q", [0])
+        for word in self.words:
+            self.postings.extend(buckets[word])
+            self.offsets.append(len(self.postings))
+        self.cache_size = cache_size
+        self._results = OrderedDict()     # query ternormalisasi → array id
+        self._np = _numpy_optional()
+        self._flat = None if self._np is None else self._np.frombuffer(self.postings, dtype=self.postings.typecode)
+
+    def _spans(self, norm):
+        # (awal, akhir, jumlah kata) potongan postings per token, yang terkecil dulu
+        spans = []
+        for token in set(norm.split()):
+            lo = bisect.bisect_left(self.words, token)
+            hi = bisect.bisect_left(self.words, token + "\U0010ffff", lo)
+            spans.append((self.offsets[lo], self.offsets[hi], hi - lo))
+        spans.sort(key=lambda span: span[1] - span[0])
+        return spans
+
+    def _mask(self, spans):
+        np = self._np
+        mask = token_mask = None
+        for start, end, _ in spans:
+            if token_mask is None:
+                token_mask = np.zeros(self.size, dtype=bool)
+            else:
+                token_mask[:] = False
+            token_mask[self._flat[start:end]] = True
+            if mask is None:
+                mask, token_mask = token_mask, None
+            else:
+                mask &= token_mask
+        return mask
+
+    def _search(self, norm):
+        spans = self._spans(norm)
+        start, end, n_words = spans[0]
+        if start == end:
+            return array("q")
+        if len(spans) == 1 and n_words == 1:
+            return self.postings[start:end]  # satu kata persis: posting sudah urut
+        if self._np is None:
+            result = set(self.postings[start:end])
+            for start, end, _ in spans[1:]:
+                result.intersection_update(self.postings[start:end])
+            return array("q", sorted(result))
+        return _id_array(self._np, self._mask(spans))
+
+    def search(self, query):
+        # Mengembalikan array id game (urut katalog), atau None kalau query kosong (= semua judul)
+        norm = normalize_title(query)
+        if not norm:
+            return None
+        value = self._results.get(norm)
+        if value is None:
+            value = self._results[norm] = self._search(norm)
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(norm)
+        return value
+
+    def mask(self, query):
+        # Mask boolean NumPy per id game untuk query (None kalau query kosong); dipakai StoreEngine.search
+        # untuk digabung dengan filter harga tanpa membentuk daftar id di tengah jalan
+        norm = normalize_title(query)
+        return self._mask(self._spans(norm)) if norm else None
+
+SEARCH_SCAN_LIMIT = 2048   # hasil judul sebanyak ini atau kurang disaring harga per id, tanpa mask seluruh katalog
+
+# Aturan harga massal (sitewide sale), diterapkan dalam satu pass NumPy lewat StoreEngine.apply_price_rules
+PRICE_RULE_KINDS = ("percent", "fixed", "floor")
+
+class PriceRule:
+    # kind: "percent" → potong value %, "fixed" → potong value rupiah, "floor" → harga minimal value
+    # Filter opsional: hanya harga < max_price, hanya harga >= min_price, hanya publisher tertentu
+    __slots__ = ("kind", "value", "max_price", "min_price", "publisher")
+
+    def __init__(self, kind, value, max_price=None, min_price=None, publisher=None):
+        if kind not in PRICE_RULE_KINDS:
+            raise ValueError(f"Jenis aturan harga tidak dikenal: {kind!r} (pilih {', '.join(PRICE_RULE_KINDS)})")
+        self.kind = kind
+        self.value = value
+        self.max_price = max_price
+        self.min_price = min_price
+        self.publisher = publisher
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Batch pricing membutuhkan numpy (pip install numpy).") from e
+    return numpy
+
+def _numpy_optional():
+    # Pencarian memakai NumPy kalau terpasang; tanpa NumPy hasilnya sama lewat loop Python (lebih lambat)
+    try:
+        return _numpy()
+    except ImportError:
+        return None
+
+class Cart:
+    # Subtotal dan jumlah copy dijaga berjalan oleh add/remove/clear, jadi total() tidak perlu scan item
+    def __init__(self):
+        self.items = {}
+        self._subtotal = 0
+        self._count = 0
+
+    def add(self, title, price, cover, game_id=None):
+        line = self.items.get(title)
+        if line is None:
+            line = self.items[title] = CartLine(game_id, price, cover)
+        line.qty += 1
+        self._subtotal += line.price
+        self._count += 1
+
+    def remove(self, title):
+        if title in self.items:
+            line = self.items[title]
+            line.qty -= 1
+            self._subtotal -= line.price
+            self._count -= 1
+            if line.qty <= 0:
+                del self.items[title]
+
+    def clear(self):
+        self.items.clear()
+        self._subtotal = 0
+        self._count = 0
+
+    def unique_count(self):
+        return len(self.items)
+
+    def total_count(self):
+        return self._count
+
+    def subtotal(self):
+        return self._subtotal
+
+    def total(self):
+        subtotal = self._subtotal
+        if len(self.items) >= 3:
+            subtotal *= 0.8
+        return int(max(0, subtotal))
+
+    def summary_lines(self):
+        return [(t, v.qty, v.price * v.qty, v.cover) for t, v in self.items.items()]
+
+# Katalog bawaan (nama panjang diuji)
+DEFAULT_CATALOG = [
+    ("Elden Ring", 599000, "elden.png"),
+    ("Minecraft: Java & Bedrock Edition", 395000, "minecraft.png"),
+    ("Clair Obscur: Expedition 33", 499000, "ekspedisi.png"),
+    ("The Witcher 3: Wild Hunt", 359999, "witcher.png"),
+    ("God of War", 729000, "godwar.png"),
+    ("Persona 5 Royal", 798000, "persona.png"),
+    ("Red Dead Redemption 2", 879000, "rdr2.png"),
+    ("Sekiro™: Shadows Die Twice", 891000, "sekiro.png"),
+    ("Hollow Knight: Silksong", 165999, "silksong.png"),
+]
+
+def default_games(img_dir):
+    return [Game(title, price, os.path.join(img_dir, cover)) for title, price, cover in DEFAULT_CATALOG]
+
+# Hadiah Lucky Spin: tabel berbobot, bisa diganti lewat file JSON (load_reward_table)
+# kind "saldo" → value rupiah masuk saldo, "voucher" → diskon value % sampai checkout berikutnya,
+# "sticker" / "zonk" → tanpa nilai uang
+REWARD_KINDS = ("saldo", "voucher", "sticker", "zonk")
+SPIN_BALANCE_REWARD = 100000
+SPIN_VOUCHER_PERCENT = 10
+
+class Reward:
+    __slots__ = ("label", "kind", "weight", "value")
+
+    def __init__(self, label, kind, weight=1, value=0):
+        self.label = label
+        self.kind = kind
+        self.weight = weight
+        self.value = value
+
+class RewardTableError(ValueError):
+    pass
+
+class RewardTable:
+    # Peluang tiap hadiah = weight / total weight; roll() memakai bobot kumulatif yang dihitung sekali
+    def __init__(self, rewards):
+        rewards = list(rewards)
+        if not rewards:
+            raise RewardTableError("tabel hadiah kosong")
+        labels = set()
+        for r in rewards:
+            if not isinstance(r.label, str) or not r.label:
+                raise RewardTableError(f"label hadiah wajib diisi: {r.label!r}")
+            if r.label in labels:
+                raise RewardTableError(f"label hadiah duplikat: {r.label!r}")
+            labels.add(r.label)
+            if r.kind not in REWARD_KINDS:
+                raise RewardTableError(f"jenis hadiah tidak dikenal untuk {r.label!r}: {r.kind!r} (pilih {', '.join(REWARD_KINDS)})")
+            if not isinstance(r.weight, (int, float)) or isinstance(r.weight, bool) or r.weight < 0:
+                raise RewardTableError(f"bobot tidak valid untuk {r.label!r}: {r.weight!r}")
+            if not isinstance(r.value, int) or isinstance(r.value, bool) or r.value < 0:
+                raise RewardTableError(f"nilai tidak valid untuk {r.label!r}: {r.value!r}")
+            if r.kind == "voucher" and r.value > 100:
+                raise RewardTableError(f"voucher {r.label!r} lebih dari 100%")
+        self.rewards = rewards
+        self.labels = [r.label for r in rewards]
+        self.weights = [r.weight for r in rewards]
+        self.total_weight = sum(self.weights)
+        if self.total_weight <= 0:
+            raise RewardTableError("total bobot hadiah harus lebih dari 0")
+        self._cum_weights = list(accumulate(self.weights))
+        self._by_label = {r.label: r for r in rewards}
+
+    def __len__(self):
+        return len(self.rewards)
+
+    def __iter__(self):
+        return iter(self.rewards)
+
+    def get(self, label):
+        try:
+            return self._by_label[label]
+        except KeyError:
+            raise KeyError(f"Hadiah tidak dikenal: {label!r}") from None
+
+    def probabilities(self):
+        return [w / self.total_weight for w in self.weights]
+
+    def roll(self, rng=random):
+        return rng.choices(self.labels, cum_weights=self._cum_weights)[0]
+
+    def to_rows(self):
+        return [{"label": r.label, "kind": r.kind, "weight": r.weight, "value": r.value} for r in self.rewards]
+
+    @classmethod
+    def from_rows(cls, rows):
+        rewards = []
+        for row in rows:
+            if not isinstance(row, dict):
+                raise RewardTableError("setiap hadiah harus berupa objek JSON")
+            rewards.append(Reward(row.get("label"), row.get("kind"), row.get("weight", 1), row.get("value", 0)))
+        return cls(rewards)
+
+def load_reward_table(path):
+    # File JSON: daftar objek {"label", "kind", "weight", "value"}, atau {"rewards": [...]}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise RewardTableError(f"{path}: JSON tidak valid: {e}") from None
+    if isinstance(data, dict):
+        data = data.get("rewards")
+    if not isinstance(data, list):
+        raise RewardTableError(f"{path}: isi file harus daftar hadiah")
+    try:
+        return RewardTable.from_rows(data)
+    except RewardTableError as e:
+        raise RewardTableError(f"{path}: {e}") from None
+
+# Tabel bawaan: empat hadiah dengan peluang sama
+DEFAULT_REWARDS = RewardTable([
+    Reward("Saldo Rp 100 000", "saldo", 1, SPIN_BALANCE_REWARD),
+    Reward("Voucher Diskon 10%", "voucher", 1, SPIN_VOUCHER_PERCENT),
+    Reward("Bonus Sticker 🎮", "sticker", 1),
+    Reward("Zonk 😅", "zonk", 1),
+])
+REWARDS = DEFAULT_REWARDS.labels
+
+# Tabel harga efektif + teks label yang sudah diformat (Modul 4, 2)
+# Dihitung ulang hanya untuk judul yang harganya berubah; perubahan voucher membatalkan semuanya.
+# Harga tingkat katalog: harga dasar, harga aktif (daily deal / aturan harga) dan indeks judul.
+# Dibuat sekali per katalog dan boleh dipakai bersama banyak StoreEngine (mis. sesi server), jadi sesi baru
+# tidak menyalin dict/array harga seluruh katalog; yang per sesi hanya keranjang, voucher dan spin.
+# version naik setiap harga aktif berubah, supaya PriceTable sesi lain tahu cache-nya basi.
+class CatalogPricing:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.base_price = dict(zip(catalog.titles, catalog.prices))
+        self.active_price = dict(self.base_price)
+        self.active_array = array("q", catalog.prices)  # cermin active_price per id game, untuk batch pricing
+        self.version = 0
+        self._title_index = None   # TitleIndex dibangun sekali: di background (StartupPipeline) atau saat pencarian pertama
+        self._index_lock = threading.Lock()
+
+    def title_index(self):
+        # Aman dipanggil dari thread background dan thread UI sekaligus: indeks hanya dibangun sekali
+        if self._title_index is None:
+            with self._index_lock:
+                if self._title_index is None:
+                    self._title_index = TitleIndex(self.catalog.titles)
+        return self._title_index
+
+class PriceTable:
+    def __init__(self, engine):
+        self.engine = engine
+        self.entries = {}      # judul → (harga_efektif, teks_harga_asli, teks_harga_diskon)
+        self._dirty = set()
+        self._all_dirty = True
+        self._changed = set()  # judul berubah yang belum dilaporkan lewat refresh()
+        self.version = engine.pricing.version
+        self.rebuilds = 0
+        self.recomputed = 0
+
+    def invalidate(self, title):
+        # Harga aktif `title` baru saja diubah lewat engine ini
+        pricing = self.engine.pricing
+        if self.version != pricing.version:
+            self.invalidate_all()
+        pricing.version += 1
+        self.version = pricing.version
+        if not self._all_dirty:
+            self._dirty.add(title)
+
+    def invalidate_all(self, prices_changed=False):
+        # prices_changed=False: hanya voucher sesi ini yang berubah, harga aktif bersama tetap
+        if prices_changed:
+            self.engine.pricing.version += 1
+            self.version = self.engine.pricing.version
+        self._all_dirty = True
+        self._dirty.clear()
+
+    def _sync(self):
+        # Sesi lain yang berbagi CatalogPricing mengubah harga aktif → semua entri dihitung ulang
+        if self.version != self.engine.pricing.version:
+            self.version = self.engine.pricing.version
+            self.invalidate_all()
+
+    def entry(self, title):
+        self._sync()
+        if self._all_dirty or self._dirty:
+            self._recompute()
+        return self.entries[title]
+
+    def refresh(self):
+        # Mengembalikan judul yang teksnya benar-benar berubah sejak refresh sebelumnya
+        self._sync()
+        self._recompute()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def _recompute(self):
+        if self._all_dirty:
+            titles = self.engine.base_price.keys()
+            self.rebuilds += 1
+        elif self._dirty:
+            titles = self._dirty
+        else:
+            return
+        e = self.engine
+        base, active, pct = e.base_price, e.active_price, e.next_discount_percent
+        factor = 1 - pct / 100
+        entries = self.entries
+        changed = self._changed
+        for title in titles:
+            harga_asli = base[title]
+            harga_aktif = active[title]
+            harga_efektif = max(0, int(harga_aktif * factor)) if pct > 0 else max(0, harga_aktif)
+            if harga_aktif < harga_asli:
+                entry = (harga_efektif, format_rupiah(harga_asli),
+                         f"Harga Diskon: {format_rupiah(harga_efektif)}" + (f" (voucher {pct}%)" if harga_efektif < harga_aktif else ""))
+            elif pct > 0 and harga_efektif < harga_asli:
+                entry = (harga_efektif, format_rupiah(harga_asli), f"Harga Diskon: {format_rupiah(harga_efektif)} (voucher {pct}%)")
+            else:
+                entry = (harga_efektif, "", f"Harga: {format_rupiah(harga_asli)}")
+            if entries.get(title) != entry:
+                entries[title] = entry
+                changed.add(title)
+        self.recomputed += len(titles)
+        self._all_dirty = False
+        self._dirty = set()
+
+# Error checkout (Modul 2)
+class CheckoutError(Exception):
+    pass
+
+class EmptyCartError(CheckoutError):
+    pass
+
+class InsufficientBalanceError(CheckoutError):
+    def __init__(self, total, balance):
+        super().__init__(f"Total belanja {format_rupiah(total)} melebihi saldo {format_rupiah(balance)}.")
+        self.total = total
+        self.balance = balance
+
+# Ledger saldo (Modul 6): dipakai bersama oleh banyak sesi/thread
+# Tiap akun punya lock sendiri; cek saldo + debit terjadi di dalam lock yang sama sehingga tidak ada
+# double-spend, dan kredit tidak pernah hilang karena read-modify-write yang balapan.
+# Idempotency key: operasi dengan key yang sama hanya dijalankan sekali, panggilan ulang
+# mengembalikan hasil yang tersimpan (klik ganda / retry tidak mendebit dua kali).
+# Key hanya hidup selama proses, kecuali StoreEngine memakai journal: hasilnya ikut dicatat dan dipulihkan.
+class _Account:
+    __slots__ = ("lock", "balance", "results")
+
+    def __init__(self, balance):
+        self.lock = threading.Lock()
+        self.balance = balance
+        self.results = OrderedDict()  # (operasi, idempotency key) → (saldo, data)
+
+class Ledger:
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys      # jumlah key yang diingat per akun (yang tertua dibuang)
+        self._accounts = {}
+        self._lock = threading.Lock() # hanya untuk membuat akun baru
+        self.replays = 0
+
+    def open(self, account, initial_balance=0):
+        # Akun yang sudah ada tetap memakai saldonya
+        with self._lock:
+            acct = self._accounts.get(account)
+            if acct is None:
+                acct = self._accounts[account] = _Account(initial_balance)
+            return acct.balance
+
+    def _get(self, account):
+        try:
+            return self._accounts[account]
+        except KeyError:
+            raise KeyError(f"Akun tidak dikenal: {account!r}") from None
+
+    def balance(self, account):
+        return self._get(account).balance
+
+    def accounts(self):
+        return {name: acct.balance for name, acct in list(self._accounts.items())}
+
+    def drop(self, account):
+        # Sesi yang ditutup (server API): akun dan idempotency key-nya dilepas
+        with self._lock:
+            self._accounts.pop(account, None)
+
+    def restore(self, account, balance):
+        # Dipakai recovery journal: saldo ditetapkan langsung, bukan lewat debit/kredit
+        self.open(account, balance)
+        acct = self._get(account)
+        with acct.lock:
+            acct.balance = balance
+
+    # Key idempotency dicatat per operasi ("debit"/"credit"): key yang sama untuk debit dan kredit
+    # adalah dua operasi berbeda, bukan replay satu sama lain.
+    def result(self, account, key, op="debit"):
+        # Hasil operasi op yang sudah tercatat untuk key ini, atau None
+        return self._get(account).results.get((op, key)) if key is not None else None
+
+    def remember(self, account, key, outcome, op="debit"):
+        # Dipakai recovery journal: hasil operasi dengan key ini dicatat tanpa menjalankannya lagi
+        acct = self._get(account)
+        with acct.lock:
+            self._remember(acct, op, key, outcome)
+
+    def keys(self, account):
+        # Salinan (operasi, key, (saldo, data)) yang diingat untuk akun ini, dari yang tertua
+        acct = self._get(account)
+        with acct.lock:
+            return [(op, key, outcome) for (op, key), outcome in acct.results.items()]
+
+    def _remember(self, acct, op, key, outcome):
+        if key is not None:
+            acct.results[op, key] = outcome
+            if len(acct.results) > self.max_keys:
+                acct.results.popitem(last=False)
+        return outcome
+
+    def debit(self, account, amount, key=None, commit=None):
+        # commit(saldo) dipanggil di dalam lock setelah saldo terbukti cukup dan mengembalikan
+        # (saldo_baru, data), mis. untuk menulis order ke StoreDB; kalau commit melempar, saldo tidak berubah.
+        # Mengembalikan (saldo, data, replay); replay=True berarti key sudah pernah dipakai dan tidak ada yang berubah,
+        # jadi pemanggil harus melewati efek sampingnya sendiri (kosongkan keranjang, tulis journal, dst.).
+        acct = self._get(account)
+        with acct.lock:
+            if key is not None and ("debit", key) in acct.results:
+                self.replays += 1
+                return acct.results["debit", key] + (True,)
+            if acct.balance < amount:
+                raise InsufficientBalanceError(amount, acct.balance)
+            if commit is None:
+                acct.balance -= amount
+                data = None
+            else:
+                acct.balance, data = commit(acct.balance)
+            return self._remember(acct, "debit", key, (acct.balance, data)) + (False,)
+
+    def credit(self, account, amount, key=None, commit=None):
+        acct = self._get(account)
+        with acct.lock:
+            if key is not None and ("credit", key) in acct.results:
+                self.replays += 1
+                return acct.results["credit", key] + (True,)
+            if commit is None:
+                acct.balance += amount
+                data = None
+            else:
+                acct.balance, data = commit(acct.balance)
+            return self._remember(acct, "credit", key, (acct.balance, data)) + (False,)
+
+# Engine toko (Modul 5, 6)
+# Satu StoreEngine = satu sesi (keranjang, voucher, spin); saldo ada di Ledger dan harga katalog di CatalogPricing,
+# keduanya boleh dibagi antar sesi.
+class StoreEngine:
+    def __init__(self, games, initial_balance=500000, db=None, account="Akun saya", ledger=None, journal=None, rewards=None,
+                 pricing=None):
+        # State
+        self.cart = Cart()
+        self.spin_used = False
+        self.last_spin_count = 0
+        self.rewards = rewards if rewards is not None else DEFAULT_REWARDS
+
+        # Harga; games adalah katalog kolumnar (Sequence of Game), bukan list objek.
+        # pricing bersama (CatalogPricing dari katalog yang sama) → tidak ada salinan harga per sesi
+        if pricing is None:
+            pricing = CatalogPricing(games if isinstance(games, Catalog) else Catalog.from_games(games))
+        self.pricing = pricing
+        self.catalog = pricing.catalog
+        self.games = self.catalog
+        self.base_price = pricing.base_price
+        self.active_price = pricing.active_price
+        self.active_array = pricing.active_array
+        self.next_discount_percent = 0
+        self.prices = PriceTable(self)
+        self._effective_cache = None   # ((voucher, versi harga), array harga efektif) untuk filter harga
+
+        # Persistensi opsional (StoreDB): saldo & order disimpan di SQLite
+        self.db = db
+        self.account_id = None
+        self.last_order_id = None
+        self.last_order = None      # (order_id, waktu, total, penerima, baris) checkout terakhir sesi ini, juga dengan StoreDB
+        self.last_paid = 0
+        self.order_history = []     # tanpa StoreDB: (order_id, waktu, total, penerima, baris); dipulihkan dari journal
+        self._order_seq = 0         # id order terakhir tanpa StoreDB
+        self.fresh_account = True   # False kalau saldo berasal dari akun StoreDB lama / journal yang dipulihkan
+        if db is not None:
+            db.import_catalog(self.catalog)
+            self.account_id, initial_balance, self.fresh_account = db.ensure_account(account, initial_balance)
+
+        # Saldo di Ledger; tanpa ledger bersama tiap engine punya ledger sendiri
+        self.ledger = ledger if ledger is not None else Ledger()
+        self.account = account
+        self.ledger.open(account, initial_balance)
+
+        # Journal opsional (StoreJournal): state dipulihkan dulu, baru mutasi berikutnya dicatat
+        self.journal = None
+        if journal is not None:
+            self.attach_journal(journal)
+
+    @property
+    def balance(self):
+        return self.ledger.balance(self.account)
+
+    # Journal (Modul 4, 6)
+    def _log(self, op, **fields):
+        if self.journal is not None:
+            self.journal.append(op, **fields)
+
+    def attach_journal(self, journal):
+        journal.recover(self.restore_state, self._replay)
+        self.journal = journal
+        journal.snapshot_source = self.snapshot_state
+        if self.db is None:
+            if journal.seq == 0:
+                # Journal baru: saldo awal dicatat supaya run berikutnya tidak bergantung pada saldo yang diketik ulang
+                self._log("balance", account=self.account, balance=self.balance)
+            else:
+                self.fresh_account = False
+
+    def set_start_balance(self, balance):
+        # Saldo awal yang baru diketahui setelah engine dibangun (startup membangun engine sambil BalanceMenu
+        # menunggu). Akun yang saldonya sudah tersimpan tetap memakai saldo itu; mengembalikan True kalau dipakai.
+        if not self.fresh_account:
+            return False
+        if self.db is not None:
+            self.db.set_balance(self.account_id, balance)
+        self.ledger.restore(self.account, balance)
+        self._log("balance", account=self.account, balance=balance)
+        self.fresh_account = False
+        return True
+
+    def snapshot_state(self):
+        return {
+            "balances": self.ledger.accounts(),
+            "cart": [[title, line.qty, line.price] for title, line in self.cart.items.items()],
+            "prices": {t: p for t, p in self.active_price.items() if p != self.base_price[t]},
+            "discount": self.next_discount_percent,
+            "spin": [self.spin_used, self.last_spin_count],
+            "orders": [[order_id, at, total, recipient, [[t, q, s] for t, q, s, _ in lines]]
+                       for order_id, at, total, recipient, lines in self.order_history],
+            "keys": {account: [[op, key, self._outcome_to_json(outcome)] for op, key, outcome in self.ledger.keys(account)]
+                     for account in self.ledger.accounts()},
+        }
+
+    def restore_state(self, state):
+        # Dengan StoreDB saldo tetap diambil dari database (sumber kebenaran saldo)
+        if self.db is None:
+            for account, balance in state["balances"].items():
+                self.ledger.restore(account, balance)
+        self.cart.clear()
+        for title, qty, price in state["cart"]:
+            if title in self.catalog.index:
+                game_id = self.catalog.index[title]
+                for _ in range(qty):
+                    self.cart.add(title, price, self.catalog.cover(game_id), game_id)
+        for title, price in self.active_price.items():
+            if price != self.base_price[title]:
+                self.set_active_price(title, self.base_price[title])
+        for title, price in state["prices"].items():
+            if title in self.active_price:
+                self.set_active_price(title, price)
+        self.set_discount_percent(state["discount"])
+        self.spin_used, self.last_spin_count = state["spin"]
+        self.order_history = [(order_id, at, total, recipient, self._summary_from_lines(lines))
+                              for order_id, at, total, recipient, lines in state.get("orders", [])]
+        self._order_seq = max((order[0] for order in self.order_history), default=0)
+        for account, keys in state.get("keys", {}).items():
+            self.ledger.open(account)
+            for op, key, outcome in keys:
+                self.ledger.remember(account, key, self._outcome_from_json(outcome), op)
+
+    # Hasil idempotency key di journal/snapshot: baris order tanpa path cover (dibangun ulang dari katalog)
+    @staticmethod
+    def _outcome_to_json(outcome):
+        balance, data = outcome
+        if data is None:
+            return [balance, None]
+        summary, spin_count, order_id, total_pay = data
+        return [balance, [[[t, q, s] for t, q, s, _ in summary], spin_count, order_id, total_pay]]
+
+    def _outcome_from_json(self, outcome):
+        balance, data = outcome
+        if data is None:
+            return balance, None
+        lines, spin_count, order_id, total_pay = data
+        return balance, (self._summary_from_lines(lines), spin_count, order_id, total_pay)
+
+    def _summary_from_lines(self, lines):
+        index, catalog = self.catalog.index, self.catalog
+        return [(t, q, s, catalog.cover(index[t]) if t in index else "") for t, q, s in lines]
+
+    def _replay(self, e):
+        # Entri membawa hasil akhir (harga, saldo), bukan delta, jadi replay tidak bergantung urutan sesi lain
+        op = e["op"]
+        if op == "cart_add":
+            if e["title"] in self.catalog.index:
+                game_id = self.catalog.index[e["title"]]
+                self.cart.add(e["title"], e["price"], self.catalog.cover(game_id), game_id)
+        elif op == "cart_remove":
+            self.cart.remove(e["title"])
+        elif op == "price":
+            if e["title"] in self.active_price:
+                self.set_active_price(e["title"], e["price"])
+        elif op == "prices":
+            titles = self.catalog.titles
+            for game_id, price in e["changes"]:
+                self.set_active_price(titles[game_id], price)
+        elif op == "discount":
+            self.set_discount_percent(e["percent"])
+        elif op == "spin":
+            self.spin_used = True
+        elif op == "checkout":
+            if self.db is None:
+                self.ledger.restore(e["account"], e["balance"])
+            self.cart.clear()
+            self.spin_used = False
+            self.last_spin_count = e["spins"]
+            if "lines" not in e:
+                return   # entri dari versi lama journal: tanpa order dan idempotency key
+            summary = self._summary_from_lines(e["lines"])
+            if self.db is None and e["account"] == self.account:
+                self.order_history.append((e["order_id"], e["at"], e["total"], e["recipient"], summary))
+                self._order_seq = max(self._order_seq, e["order_id"])
+            if e.get("key") is not None:
+                self.ledger.open(e["account"])
+                self.ledger.remember(e["account"], e["key"], (e["balance"], (summary, e["spins"], e["order_id"], e["total"])))
+        elif op in ("credit", "balance"):
+            if self.db is None:
+                self.ledger.restore(e["account"], e["balance"])
+            if e.get("key") is not None:
+                self.ledger.open(e["account"])
+                self.ledger.remember(e["account"], e["key"], (e["balance"], None), "credit")
+
+    # Harga (Modul 2, 4)
+    def effective_price(self, title):
+        price = self.active_price[title]
+        if self.next_discount_percent > 0:
+            price = int(price * (1 - self.next_discount_percent / 100))
+        return max(0, price)
+
+    def set_active_price(self, title, price):
+        price = max(0, int(price))
+        if self.active_price[title] != price:
+            self.active_price[title] = price
+            self.active_array[self.catalog.index[title]] = price
+            self.prices.invalidate(title)
+            self._log("price", title=title, price=price)
+
+    def apply_price_rules(self, rules, start="base"):
+        # Semua aturan dijalankan berurutan atas array harga seluruh katalog, lalu hasilnya
+        # ditulis balik ke active_price; hanya judul yang harganya berubah yang di-invalidate.
+        np = _numpy()
+        catalog = self.catalog
+        titles = catalog.titles
+        current = np.frombuffer(self.active_array, dtype=self.active_array.typecode)
+        prices = (np.frombuffer(catalog.prices, dtype=catalog.prices.typecode) if start == "base" else current).copy()
+        publisher_ids = np.frombuffer(catalog.publisher_ids, dtype=catalog.publisher_ids.typecode)
+
+        for rule in rules:
+            mask = np.ones(len(prices), dtype=bool)
+            if rule.max_price is not None:
+                mask &= prices < rule.max_price
+            if rule.min_price is not None:
+                mask &= prices >= rule.min_price
+            if rule.publisher is not None:
+                mask &= publisher_ids == catalog.publisher_id(rule.publisher)
+            if rule.kind == "percent":
+                # Pembulatan ke bawah sama dengan effective_price: int(harga * (1 - persen/100))
+                prices = np.where(mask, (prices * (1 - rule.value / 100)).astype(np.int64), prices)
+            elif rule.kind == "fixed":
+                prices = np.where(mask, prices - int(rule.value), prices)
+            else:
+                prices = np.where(mask, np.maximum(prices, int(rule.value)), prices)
+            np.maximum(prices, 0, out=prices)
+
+        changed = np.flatnonzero(prices != current)
+        current[:] = prices
+        active = self.active_price
+        changes = list(zip(changed.tolist(), prices[changed].tolist()))
+        for i, price in changes:
+            active[titles[i]] = price
+        if changes:
+            self._log("prices", changes=changes)
+        if len(changed) * 2 > len(titles):
+            self.prices.invalidate_all(prices_changed=True)
+        else:
+            for i in changed.tolist():
+                self.prices.invalidate(titles[i])
+        return len(changed)
+
+    def games_in_price_range(self, min_price=0, max_price=None, order="asc"):
+        # Dengan StoreDB query jalan di SQL (index harga); tanpa DB jatuh ke filter Python
+        if self.db is not None:
+            return self.db.games_in_price_range(min_price, max_price, order)
+        games = [g for g in self.catalog if g.price >= min_price and (max_price is None or g.price <= max_price)]
+        games.sort(key=lambda g: (-g.price if order == "desc" else g.price, g.title))
+        return games
+
+    def search(self, query="", min_price=None, max_price=None):
+        # array id game (urut katalog) yang cocok dengan query judul dan rentang harga efektif; None = tanpa filter.
+        # Filter harga: mask NumPy atas active_array (di-AND dengan mask judul), bukan loop per judul;
+        # hasil judul yang sedikit cukup disaring langsung.
+        index = self.pricing.title_index() if query.strip() else None
+        ids = index.search(query) if index is not None else None
+        if min_price is None and max_price is None:
+            return ids
+        pct = self.next_discount_percent
+        factor = 1 - pct / 100
+        lo = 0 if min_price is None else min_price
+        hi = float("inf") if max_price is None else max_price
+        prices = self.active_array
+        np = _numpy_optional()
+        if np is None or (ids is not None and len(ids) <= SEARCH_SCAN_LIMIT):
+            candidates = range(len(prices)) if ids is None else ids
+            return array("q", [i for i in candidates if lo <= (int(prices[i] * factor) if pct > 0 else prices[i]) <= hi])
+        effective = self._effective_array(np, pct)
+        mask = effective >= lo
+        if max_price is not None:
+            mask &= effective <= hi
+        if ids is not None:
+            mask &= index.mask(query)
+        return _id_array(np, mask)
+
+    def _effective_array(self, np, pct):
+        # Harga efektif seluruh katalog sebagai array NumPy; dengan voucher hasil perkalian disimpan sampai
+        # voucher atau harga aktif berubah, jadi ketikan berikutnya di kolom harga hanya membandingkan
+        prices = np.frombuffer(self.active_array, dtype=self.active_array.typecode)
+        if pct <= 0:
+            return prices
+        key = (pct, self.pricing.version)
+        if self._effective_cache is None or self._effective_cache[0] != key:
+            self._effective_cache = (key, (prices * (1 - pct / 100)).astype(np.int64))
+        return self._effective_cache[1]
+
+    def set_discount_percent(self, percent):
+        if self.next_discount_percent != percent:
+            self.next_discount_percent = percent
+            self.prices.invalidate_all()
+            self._log("discount", percent=percent)
+
+    # Keranjang
+    def add_to_cart(self, title):
+        price = self.effective_price(title)
+        game_id = self.catalog.index[title]
+        self.cart.add(title, price, self.catalog.cover(game_id), game_id)
+        self._log("cart_add", title=title, price=price)
+        return price
+
+    def add_again(self, title):
+        # Tombol "+" di keranjang memakai harga yang tercatat di baris keranjang
+        line = self.cart.items[title]
+        self.cart.add(title, line.price, line.cover, line.game_id)
+        self._log("cart_add", title=title, price=line.price)
+
+    def remove_from_cart(self, title):
+        if title in self.cart.items:
+            self.cart.remove(title)
+            self._log("cart_remove", title=title)
+
+    def cart_qty(self, title):
+        line = self.cart.items.get(title)
+        return line.qty if line is not None else 0
+
+    # Checkout (Modul 2)
+    def validate_checkout(self):
+        if not self.cart.items:
+            raise EmptyCartError("Belum ada game di keranjang. Tambahkan game dari katalog.")
+        total_pay = self.cart.total()
+        if self.balance < total_pay:
+            raise InsufficientBalanceError(total_pay, self.balance)
+        return total_pay
+
+    def checkout(self, recipient="Akun saya", idempotency_key=None):
+        # Key yang sudah pernah dipakai → hasil checkout lama, tanpa debit kedua
+        done = self.ledger.result(self.account, idempotency_key)
+        if done is not None:
+            self.last_paid = done[1][3]
+            return done[1][:2]
+
+        total_pay = self.validate_checkout()
+        purchased_summary = self.cart.summary_lines()
+        spin_count = self.cart.total_count()
+        created_at = None
+
+        def commit(balance):
+            # Waktu order diambil sekali di dalam lock akun; dipakai sama persis oleh DB, riwayat, journal dan struk
+            nonlocal created_at
+            created_at = time.time()
+            if self.db is None:
+                self._order_seq += 1
+                return balance - total_pay, (purchased_summary, spin_count, self._order_seq, total_pay)
+            # Debit saldo + order + baris order dalam satu transaksi
+            order_id, new_balance = self.db.record_checkout(self.account_id, total_pay, purchased_summary, recipient,
+                                                            created_at)
+            return new_balance, (purchased_summary, spin_count, order_id, total_pay)
+
+        balance, data, replayed = self.ledger.debit(self.account, total_pay, idempotency_key, commit)
+        purchased_summary, spin_count, order_id, total_pay = data
+        if replayed:
+            # Checkout lain dengan key yang sama menang di dalam lock akun: keranjang, riwayat dan journal milik dia
+            self.last_paid = total_pay
+            return purchased_summary, spin_count
+        self.last_order = (order_id, created_at, total_pay, recipient, purchased_summary)
+        if self.db is None:
+            self.order_history.append(self.last_order)
+        self.last_order_id = order_id
+        self.last_paid = total_pay
+        self.spin_used = False
+        self.last_spin_count = spin_count
+        self.cart.clear()
+        # Voucher spin hanya berlaku "hingga checkout berikutnya" (banner UI); spin checkout ini bisa memberi yang baru
+        self.set_discount_percent(0)
+        if self.journal is not None:
+            # Checkout = titik durabilitas: grup entri yang tertunda ditulis sekarang
+            self._log("checkout", account=self.account, total=total_pay, balance=balance, spins=spin_count,
+                      key=idempotency_key, lines=[[t, q, s] for t, q, s, _ in purchased_summary], order_id=order_id,
+                      at=created_at, recipient=recipient)
+            self.journal.commit()
+        return purchased_summary, spin_count
+
+    def iter_order_history(self):
+        # Semua order akun ini, terurut waktu, dalam bentuk (order_id, waktu, total, penerima, baris summary_lines).
+        # Dengan StoreDB dibaca streaming lewat koneksi sendiri, jadi aman dipakai dari thread ekspor.
+        # Tanpa StoreDB: order di memori (dipulihkan dari journal kalau ada); list hanya ditambah di ujung,
+        # jadi cukup dibatasi panjangnya saat ekspor mulai, tanpa menyalin.
+        if self.db is None:
+            yield from islice(self.order_history, len(self.order_history))
+            return
+        reader = self.db.reader()
+        try:
+            yield from reader.iter_order_details(self.account_id)
+        finally:
+            reader.close()
+
+    # Daily deal
+    def roll_daily_deal(self, rng=random):
+        rekom = rng.choice(self.games)
+        harga_asli = self.base_price[rekom.title]
+        potongan = rng.choice([50000, 100000, 150000])
+        harga_baru = max(0, harga_asli - potongan)
+        persen = int(round((potongan / harga_asli) * 100)) if harga_asli > 0 else 0
+        return rekom, harga_asli, potongan, harga_baru, persen
+
+    def apply_daily_deal(self, title, harga_baru):
+        self.set_active_price(title, harga_baru)
+
+    # Lucky spin
+    def begin_spins(self):
+        self.spin_used = True
+        self._log("spin")
+        return self.last_spin_count
+
+    def roll_reward(self, rng=random):
+        return self.rewards.roll(rng)
+
+    def apply_reward(self, reward, idempotency_key=None):
+        # reward: label dari tabel hadiah; mengembalikan jenis hadiah supaya UI bisa menampilkan pesan yang sesuai
+        reward = self.rewards.get(reward)
+        if reward.kind == "saldo":
+            amount = reward.value
+            commit = None
+            if self.db is not None:
+                commit = lambda balance: (self.db.credit(self.account_id, amount), None)
+            balance, _, replayed = self.ledger.credit(self.account, amount, idempotency_key, commit)
+            if not replayed:
+                self._log("credit", account=self.account, amount=amount, balance=balance, key=idempotency_key)
+        elif reward.kind == "voucher":
+            self.set_discount_percent(reward.value)
+        return reward.kind
@@ -0,0 +1,211 @@
+# =========================================
+# Online Gamestore — Ekspor struk & riwayat order
+# =========================================
+# Order ditulis ke CSV atau PDF secara streaming: satu order dibaca, ditulis, lalu dilepas, jadi riwayat
+# puluhan ribu order tidak pernah dimuat utuh. Bentuk order: (order_id, waktu, total, penerima, baris) dengan
+# baris seperti Cart.summary_lines() → (judul, qty, subtotal, cover); sumbernya StoreEngine.iter_order_history().
+# Tanpa tkinter, jadi bisa dipanggil dari thread worker GUI maupun dari skrip.
+
+import os, csv, time, zlib
+from array import array
+
+from StoreEngine import format_rupiah
+
+EXPORT_FORMATS = ("csv", "pdf")
+PROGRESS_EVERY = 256   # progress(jumlah_order) dipanggil tiap sekian order
+
+class ExportCancelled(Exception):
+    pass
+
+def _when(created_at):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created_at))
+
+def _clip(text, max_chars):
+    return text if len(text) <= max_chars else text[:max_chars - 3].rstrip() + "..."
+
+# CSV: satu baris per baris order (Modul 3)
+CSV_HEADER = ("order_id", "waktu", "penerima", "judul", "jumlah", "subtotal", "subtotal_rupiah", "total_order", "total_order_rupiah")
+
+class CsvOrderWriter:
+    def __init__(self, f, title=None):
+        self.writer = csv.writer(f)
+        self.writer.writerow(CSV_HEADER)
+
+    def write_order(self, order):
+        order_id, created_at, total, recipient, lines = order
+        when, total_text = _when(created_at), format_rupiah(total)
+        self.writer.writerows((order_id, when, recipient, title, qty, subtotal, format_rupiah(subtotal), total, total_text)
+                              for title, qty, subtotal, _cover in lines)
+
+    def close(self):
+        pass
+
+# PDF minimal yang ditulis bertahap (Modul 4, 6)
+# Tiap halaman (content stream, dikompres zlib) langsung ditulis ke file begitu penuh; yang disimpan di memori
+# hanya offset objek untuk tabel xref dan nomor objek halaman. Font bawaan PDF (Helvetica, WinAnsiEncoding),
+# jadi karakter di luar cp1252 (mis. emoji) menjadi "?".
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842   # A4 dalam point
+MARGIN = 48
+LINE_HEIGHT = 14
+
+def _pdf_text(text):
+    data = text.encode("cp1252", "replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b" ").replace(b"\n", b" ")
+
+class PdfWriter:
+    # Objek 1 = catalog, 2 = pohon halaman, 3/4 = font, 5 = info; ketiganya ditulis terakhir (butuh daftar halaman)
+    def __init__(self, f, title="Online Gamestore"):
+        self.f = f
+        self.title = title
+        self.offsets = array("q", [0] * 6)
+        self.page_ids = array("l")
+        self.ops = []
+        self.y = 0
+        self.page_no = 0
+        self.on_page = None            # fungsi(writer) untuk kepala halaman
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    def _new_id(self):
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def _object(self, num, body, stream=None):
+        self.offsets[num] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num)
+        self.f.write(body)
+        if stream is not None:
+            self.f.write(b"\nstream\n")
+            self.f.write(stream)
+            self.f.write(b"\nendstream")
+        self.f.write(b"\nendobj\n")
+
+    # Halaman
+    def _start_page(self):
+        self.page_no += 1
+        self.ops = []
+        self.y = PAGE_HEIGHT - MARGIN
+        if self.on_page is not None:
+            self.on_page(self)
+
+    def _flush_page(self):
+        if self.page_no == 0 or not self.ops:
+            return
+        data = zlib.compress(b"\n".join(self.ops), 6)
+        content = self._new_id()
+        self._object(content, b"<< /Length %d /Filter /FlateDecode >>" % len(data), data)
+        page = self._new_id()
+        self._object(page, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                           b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                           % (PAGE_WIDTH, PAGE_HEIGHT, content))
+        self.page_ids.append(page)
+        self.ops = []
+
+    def ensure(self, lines=1):
+        # Pindah ke halaman baru kalau sisa ruang kurang dari `lines` baris
+        if self.page_no == 0 or self.y - lines * LINE_HEIGHT < MARGIN:
+            self._flush_page()
+            self._start_page()
+
+    def text(self, x, text, bold=False, size=10):
+        # Menulis di baris sekarang; baris maju lewat newline()
+        self.ops.append(b"BT /%s %d Tf %d %d Td (%s) Tj ET" % (b"F2" if bold else b"F1", size, x, self.y, _pdf_text(text)))
+
+    def newline(self, n=1):
+        self.y -= int(LINE_HEIGHT * n)
+
+    def close(self):
+        self._flush_page()
+        if not self.page_ids:
+            self._start_page()
+            self._flush_page()
+        kids = b" ".join(b"%d 0 R" % p for p in self.page_ids)
+        self._object(2, b"<< /Type /Pages /Count %d /Kids [%s] >>" % (len(self.page_ids), kids))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._object(5, b"<< /Title (%s) /Producer (Online Gamestore) /CreationDate (D:%s) >>"
+                        % (_pdf_text(self.title), time.strftime("%Y%m%d%H%M%S").encode()))
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.offsets))
+        for offset in self.offsets[1:]:
+            self.f.write(b"%010d 00000 n \n" % offset)
+        self.f.write(b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.offsets), xref))
+
+class PdfOrderWriter:
+    # Tata letak struk: kepala order (tebal), baris judul / jumlah / subtotal, lalu total dibayar
+    COL_TITLE, COL_QTY, COL_SUBTOTAL = MARGIN + 12, 390, 450
+
+    def __init__(self, f, title="Riwayat Pesanan"):
+        self.pdf = PdfWriter(f, title)
+        self.pdf.on_page = self._page_header
+        self.title = title
+        self.orders = 0
+        self.grand_total = 0
+
+    def _page_header(self, pdf):
+        pdf.text(MARGIN, f"Online Gamestore — {self.title}", bold=True, size=14)
+        pdf.text(PAGE_WIDTH - MARGIN - 60, f"Halaman {pdf.page_no}", size=9)
+        pdf.newline(2)
+
+    def write_order(self, order):
+        order_id, created_at, total, recipient, lines = order
+        pdf = self.pdf
+        pdf.ensure(3)
+        pdf.text(MARGIN, f"Order #{order_id}   {_when(created_at)}   Penerima: {_clip(recipient, 40)}", bold=True)
+        pdf.newline()
+        for title, qty, subtotal, _cover in lines:
+            pdf.ensure()
+            pdf.text(self.COL_TITLE, _clip(title, 58))
+            pdf.text(self.COL_QTY, f"Jumlah: {qty}")
+            pdf.text(self.COL_SUBTOTAL, format_rupiah(subtotal))
+            pdf.newline()
+        pdf.ensure()
+        pdf.text(self.COL_QTY - 30, "Total Dibayar:", bold=True)
+        pdf.text(self.COL_SUBTOTAL, format_rupiah(total), bold=True)
+        pdf.newline(1.5)
+        self.orders += 1
+        self.grand_total += total
+
+    def close(self):
+        pdf = self.pdf
+        pdf.ensure(2)
+        pdf.newline()
+        pdf.text(MARGIN, f"Jumlah order: {self.orders:,}".replace(",", " "), bold=True)
+        pdf.text(self.COL_QTY - 60, f"Total keseluruhan: {format_rupiah(self.grand_total)}", bold=True)
+        pdf.close()
+
+WRITERS = {"csv": CsvOrderWriter, "pdf": PdfOrderWriter}
+
+def export_orders(orders, path, fmt=None, title="Riwayat Pesanan", progress=None, cancel=None):
+    # Ditulis ke path.tmp lalu os.replace, jadi file lama tidak pernah tertimpa setengah jadi.
+    # cancel: threading.Event opsional; progress(jumlah_order) dipanggil dari thread pemanggil.
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"format ekspor tidak dikenal: {fmt!r} (pilih {', '.join(EXPORT_FORMATS)})")
+    tmp = path + ".tmp"
+    count = 0
+    try:
+        if fmt == "csv":
+            f = open(tmp, "w", encoding="utf-8", newline="")
+        else:
+            f = open(tmp, "wb")
+        with f:
+            writer = WRITERS[fmt](f, title)
+            for order in orders:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled(f"ekspor dibatalkan setelah {count} order")
+                writer.write_order(order)
+                count += 1
+                if progress is not None and count % PROGRESS_EVERY == 0:
+                    progress(count)
+            writer.close()
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if progress is not None:
+        progress(count)
+    return count
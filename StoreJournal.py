@@ -0,0 +1,176 @@
+# =========================================
+# Online Gamestore — Journal transaksi
+# =========================================
+# Setiap mutasi saldo, keranjang dan harga ditulis append-only ke journal.jsonl (satu entri JSON per baris).
+# Group commit: entri dikumpulkan di buffer lalu ditulis dengan satu write() per grup.
+# fsync: "always" = tiap commit, "batch" = tiap fsync_every commit, "never" = diserahkan ke OS.
+# Snapshot berkala (snapshot.json) memuat seluruh state; journal dipotong setelahnya sehingga replay terbatas.
+
+import os, json, threading
+
+FSYNC_POLICIES = ("always", "batch", "never")
+REPLAY_CHUNK = 4096   # baris journal yang di-decode sekaligus saat recovery
+
+# Encoder dibuat sekali; json.dumps dengan argumen non-default membuat encoder baru di tiap panggilan
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+class JournalCorruptError(ValueError):
+    def __init__(self, path, line, msg):
+        super().__init__(f"{path}:{line}: {msg}")
+        self.path = path
+        self.line = line
+
+class Journal:
+    def __init__(self, folder, group_size=256, fsync="batch", fsync_every=8, snapshot_every=100_000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync harus salah satu dari {FSYNC_POLICIES}, bukan {fsync!r}")
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.log_path = os.path.join(folder, "journal.jsonl")
+        self.snapshot_path = os.path.join(folder, "snapshot.json")
+        self.group_size = group_size
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self.snapshot_every = snapshot_every
+        self.snapshot_source = None   # fungsi → dict state; dipasang StoreEngine.attach_journal
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._file = None
+        self._unsynced = 0
+        # Statistik
+        self.appended = 0
+        self.writes = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+
+    # Recovery
+    def recover(self, restore, apply):
+        # restore(state) dipanggil kalau ada snapshot, lalu apply(entri) untuk tiap entri sesudahnya, streaming.
+        # Entri selalu diakhiri newline, jadi byte setelah newline terakhir = write yang terpotong crash
+        # dan dibuang dari file; baris rusak di tengah journal adalah error.
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snap = json.load(f)
+            self.snapshot_seq = self.seq = snap["seq"]
+            restore(snap["state"])
+
+        replayed = 0
+        if os.path.exists(self.log_path):
+            good_end = 0
+            lineno = 0
+            chunk = []
+            with open(self.log_path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    good_end += len(raw)
+                    chunk.append(raw)
+                    if len(chunk) >= REPLAY_CHUNK:
+                        replayed += self._replay_chunk(chunk, lineno, apply)
+                        lineno += len(chunk)
+                        chunk = []
+            replayed += self._replay_chunk(chunk, lineno, apply)
+            if good_end < os.path.getsize(self.log_path):
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(good_end)
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        return replayed
+
+    def _replay_chunk(self, chunk, lineno, apply):
+        # Satu json.loads untuk seluruh chunk (dibungkus jadi array) jauh lebih cepat daripada per baris;
+        # kalau gagal, baris di-decode satu per satu untuk menemukan nomor baris yang rusak
+        if not chunk:
+            return 0
+        try:
+            entries = json.loads(b"[" + b",".join(chunk) + b"]")
+        except ValueError:
+            for i, raw in enumerate(chunk, lineno + 1):
+                try:
+                    json.loads(raw)
+                except ValueError:
+                    raise JournalCorruptError(self.log_path, i, "entri journal rusak") from None
+            raise JournalCorruptError(self.log_path, lineno + 1, "entri journal rusak") from None
+        replayed = 0
+        for entry in entries:
+            if entry["seq"] > self.seq:
+                apply(entry)
+                self.seq = entry["seq"]
+                replayed += 1
+        return replayed
+
+    # Tulis
+    def append(self, op, **fields):
+        with self._lock:
+            self.seq += 1
+            fields["seq"] = self.seq
+            fields["op"] = op
+            self._buffer.append(_encode(fields))
+            self.appended += 1
+            if len(self._buffer) >= self.group_size:
+                self._commit_locked()
+            if self.snapshot_source is not None and self.seq - self.snapshot_seq >= self.snapshot_every:
+                self.snapshot(self.snapshot_source())
+            return self.seq
+
+    def commit(self):
+        # Titik durabilitas (mis. setelah checkout): buffer ditulis, fsync sesuai kebijakan
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+            self._file.flush()
+            self.writes += 1
+            self._unsynced += 1
+        if self._unsynced and (self.fsync == "always" or (self.fsync == "batch" and self._unsynced >= self.fsync_every)):
+            self._fsync_locked()
+
+    def _fsync_locked(self):
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self._unsynced = 0
+
+    def sync(self):
+        # Paksa semua entri sampai ke disk, apa pun kebijakannya
+        with self._lock:
+            self._commit_locked()
+            if self._unsynced:
+                self._fsync_locked()
+
+    # Snapshot
+    def snapshot(self, state):
+        # Ditulis ke file sementara lalu os.replace (atomik); journal baru dipotong setelah snapshot aman.
+        # Crash di antara keduanya tidak masalah: replay melewati entri dengan seq <= seq snapshot.
+        with self._lock:
+            self._commit_locked()
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"seq": self.seq, "state": state}, f, separators=(",", ":"), ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            self._file.close()
+            self._file = open(self.log_path, "w", encoding="utf-8")
+            self.snapshot_seq = self.seq
+            self._unsynced = 0
+            self.snapshots += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self.sync()
+                self._file.close()
+                self._file = None
+
+    def stats(self):
+        return {
+            "seq": self.seq,
+            "appended": self.appended,
+            "writes": self.writes,
+            "fsyncs": self.fsyncs,
+            "snapshots": self.snapshots,
+        }
@@ -0,0 +1,329 @@
+# =========================================
+# Online Gamestore — Load generator multi-proses (logika toko, tanpa HTTP)
+# =========================================
+# Tiap proses worker menjalankan banyak shopper simulasi bergiliran (round-robin), masing-masing satu
+# StoreEngine di atas katalog dan Ledger bersama milik proses itu. Shopper melihat katalog (engine.games),
+# menambah/menghapus item (Cart.add / Cart.remove lewat engine), memakai daily deal dan voucher spin, lalu checkout.
+# Setelah tiap aksi invarian dicek secara independen dari engine:
+#   saldo tidak pernah negatif, harga baris = harga efektif saat ditambahkan, subtotal berjalan Cart = jumlah baris,
+#   total checkout = aturan bundle (3+ judul → potong 20%), checkout ulang dengan key sama tidak mendebit dua kali,
+#   dan di akhir saldo tiap akun = saldo awal + kredit - debit.
+# Throughput, histogram latensi per aksi dan pelanggaran digabung dari semua proses.
+# Jalankan:  python StoreLoad.py --workers 4 --shoppers 64 --duration 10
+#            python StoreLoad.py --scaling          (1, 2, 4, ... worker sampai jumlah core)
+
+import os, sys, time, random, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from StoreEngine import (StoreEngine, Catalog, Ledger, CatalogFormatError, InsufficientBalanceError,
+                         default_games, load_catalog)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMG_DIR = os.path.join(BASE_DIR, "images")
+
+BUNDLE_MIN_TITLES = 3
+BUNDLE_FACTOR = 0.8
+BROWSE_PAGE = 12
+MAX_SAMPLES = 5               # contoh pelanggaran yang disimpan per jenis per worker
+START_BALANCE = 5_000_000
+TOP_UP = 2_000_000
+# Bobot aksi shopper; checkout hanya kalau keranjang berisi, spin hanya setelah checkout
+ACTIONS = (("browse", 30), ("add", 30), ("remove", 8), ("deal", 4), ("checkout", 10))
+
+# Histogram latensi (Modul 1, 3)
+# Bucket log2 dengan 4 sub-bucket per oktaf (galat relatif <= 19%); cukup list int sehingga mudah dikirim
+# antar proses dan digabung dengan menjumlah per bucket.
+SUB_BUCKETS = 4
+HIST_SIZE = 64 * SUB_BUCKETS
+
+def _bucket(ns):
+    if ns < SUB_BUCKETS:
+        return ns
+    exp = ns.bit_length() - 1
+    return exp * SUB_BUCKETS + ((ns >> (exp - 2)) & (SUB_BUCKETS - 1))
+
+def _bucket_upper(index):
+    # Batas atas (ns) bucket ke-index
+    if index < SUB_BUCKETS:
+        return index + 1
+    exp, sub = divmod(index, SUB_BUCKETS)
+    return (1 << exp) + ((sub + 1) << (exp - 2))
+
+class LatencyHistogram:
+    __slots__ = ("counts", "total", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * HIST_SIZE
+        self.total = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        self.counts[_bucket(ns)] += 1
+        self.total += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, pct):
+        if not self.total:
+            return 0
+        rank = self.total * pct / 100
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_upper(index), self.max_ns)
+        return self.max_ns
+
+# Shopper (Modul 5, 6)
+class Shopper:
+    def __init__(self, engine, rng, name, report):
+        self.engine = engine
+        self.rng = rng
+        self.name = name
+        self.report = report          # fungsi(jenis, pesan) untuk pelanggaran invarian
+        self.added = {}               # judul → harga efektif saat pertama ditambahkan
+        self.checkouts = 0
+
+    def _check_balance(self):
+        if self.engine.balance < 0:
+            self.report("saldo_negatif", f"{self.engine.account}: {self.engine.balance}")
+
+    def _check_cart(self):
+        cart = self.engine.cart
+        subtotal = sum(line.price * line.qty for line in cart.items.values())
+        count = sum(line.qty for line in cart.items.values())
+        if subtotal != cart.subtotal() or count != cart.total_count():
+            self.report("keranjang", f"{self.name}: subtotal {cart.subtotal()} vs baris {subtotal}, "
+                                     f"copy {cart.total_count()} vs {count}")
+        return subtotal
+
+    def browse(self):
+        games = self.engine.games
+        start = self.rng.randrange(max(1, len(games) - BROWSE_PAGE + 1))
+        for game_id in range(start, min(len(games), start + BROWSE_PAGE)):
+            self.engine.effective_price(games[game_id].title)
+        if self.rng.random() < 0.2:
+            lo = self.rng.randrange(0, 600_000, 50_000)
+            self.engine.search("", lo, lo + 300_000)
+        return "browse"
+
+    def add(self):
+        game = self.engine.games[self.rng.randrange(len(self.engine.games))]
+        engine = self.engine
+        pct = engine.next_discount_percent
+        active = engine.active_price[game.title]
+        expected = max(0, int(active * (1 - pct / 100)) if pct > 0 else active)
+        line = engine.cart.items.get(game.title)
+        price = engine.add_to_cart(game.title)
+        # Baris lama tetap memakai harga saat pertama ditambahkan (sama dengan tombol "+")
+        recorded = engine.cart.items[game.title].price
+        if price != expected or (line is None and recorded != expected):
+            self.report("harga", f"{game.title}: efektif {expected}, dicatat {price}/{recorded}")
+        self._check_cart()
+        return "add"
+
+    def remove(self):
+        items = self.engine.cart.items
+        if not items:
+            return self.browse()
+        title = self.rng.choice(list(items))
+        self.engine.remove_from_cart(title)
+        self._check_cart()
+        return "remove"
+
+    def deal(self):
+        rekom, _, _, harga_baru, _ = self.engine.roll_daily_deal(self.rng)
+        self.engine.apply_daily_deal(rekom.title, harga_baru)
+        if self.engine.active_price[rekom.title] != harga_baru:
+            self.report("harga", f"daily deal {rekom.title}: {self.engine.active_price[rekom.title]} != {harga_baru}")
+        return "deal"
+
+    def checkout(self, ledger_book):
+        engine = self.engine
+        if not engine.cart.items:
+            return self.add()
+        subtotal = self._check_cart()
+        expected = int(max(0, subtotal * BUNDLE_FACTOR)) if len(engine.cart.items) >= BUNDLE_MIN_TITLES else subtotal
+        total = engine.cart.total()
+        if total != expected:
+            self.report("bundle", f"{self.name}: {len(engine.cart.items)} judul, subtotal {subtotal}, "
+                                  f"total {total}, seharusnya {expected}")
+        key = f"{self.name}-{self.checkouts}"
+        before = engine.balance
+        try:
+            summary, spins = engine.checkout(self.name, idempotency_key=key)
+        except InsufficientBalanceError:
+            engine.ledger.credit(engine.account, TOP_UP)
+            ledger_book[engine.account] += TOP_UP
+            return "declined"
+        self.checkouts += 1
+        ledger_book[engine.account] -= engine.last_paid
+        if engine.last_paid != expected:
+            self.report("bundle", f"{self.name}: dibayar {engine.last_paid}, seharusnya {expected}")
+        if before - engine.balance != engine.last_paid:
+            self.report("debit", f"{self.name}: saldo turun {before - engine.balance}, dibayar {engine.last_paid}")
+        if self.rng.random() < 0.05:
+            # Retry dengan key yang sama (mis. klien timeout): hasil lama, tanpa debit kedua
+            after = engine.balance
+            engine.checkout(self.name, idempotency_key=key)
+            if engine.balance != after:
+                self.report("idempotensi", f"{self.name}: key {key} mendebit lagi ({after} → {engine.balance})")
+        self._check_balance()
+        self.spin(ledger_book)
+        return "checkout"
+
+    def spin(self, ledger_book):
+        engine = self.engine
+        for _ in range(engine.begin_spins()):
+            reward = engine.rewards.get(engine.roll_reward(self.rng))
+            if engine.apply_reward(reward.label) == "saldo":
+                ledger_book[engine.account] += reward.value
+
+    def step(self, ledger_book):
+        action = self.rng.choices(_ACTION_NAMES, cum_weights=_ACTION_CUM)[0]
+        if action == "checkout":
+            return self.checkout(ledger_book)
+        return getattr(self, action)()
+
+_ACTION_NAMES = [name for name, _ in ACTIONS]
+_ACTION_CUM = []
+for _, weight in ACTIONS:
+    _ACTION_CUM.append((_ACTION_CUM[-1] if _ACTION_CUM else 0) + weight)
+
+# Worker (satu proses)
+def _run_worker(job):
+    worker, catalog_path, shoppers, per_account, duration, seed = job
+    games = load_catalog(catalog_path, IMG_DIR) if catalog_path else default_games(IMG_DIR)
+    catalog = games if isinstance(games, Catalog) else Catalog.from_games(games)
+    ledger = Ledger()
+    violations = {}
+    samples = {}
+
+    def report(kind, message):
+        violations[kind] = violations.get(kind, 0) + 1
+        bucket = samples.setdefault(kind, [])
+        if len(bucket) < MAX_SAMPLES:
+            bucket.append(f"w{worker} {message}")
+
+    # Beberapa shopper berbagi satu akun (mis. satu keluarga) supaya Ledger dipakai lintas sesi
+    ledger_book = {}
+    crowd = []
+    for i in range(shoppers):
+        account = f"w{worker}-a{i // per_account}"
+        engine = StoreEngine(catalog, START_BALANCE, account=account, ledger=ledger)
+        ledger_book.setdefault(account, START_BALANCE)
+        crowd.append(Shopper(engine, random.Random(seed * 1_000_003 + worker * 10_007 + i), f"w{worker}-s{i}", report))
+
+    hists = {}
+    clock = time.perf_counter_ns
+    t0 = clock()
+    deadline = t0 + int(duration * 1e9)
+    ops = 0
+    while True:
+        for shopper in crowd:
+            start = clock()
+            action = shopper.step(ledger_book)
+            end = clock()
+            hist = hists.get(action)
+            if hist is None:
+                hist = hists[action] = LatencyHistogram()
+            hist.record(end - start)
+        ops += len(crowd)
+        if end >= deadline:
+            break
+    elapsed = (clock() - t0) / 1e9
+
+    for account, expected in ledger_book.items():
+        actual = ledger.balance(account)
+        if actual != expected:
+            report("saldo_akhir", f"{account}: ledger {actual}, seharusnya {expected}")
+        if actual < 0:
+            report("saldo_negatif", f"{account}: {actual}")
+    return {"worker": worker, "ops": ops, "elapsed": elapsed, "hists": hists,
+            "violations": violations, "samples": samples,
+            "checkouts": sum(s.checkouts for s in crowd), "accounts": len(ledger_book)}
+
+def run_load(workers=None, shoppers=64, per_account=4, duration=10.0, seed=0, catalog_path=None):
+    workers = workers or os.cpu_count() or 1
+    jobs = [(w, catalog_path, shoppers, per_account, duration, seed) for w in range(workers)]
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [_run_worker(jobs[0])]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_run_worker, jobs))
+    wall = time.perf_counter() - t0
+
+    total = {"workers": workers, "shoppers": shoppers * workers, "wall": wall, "ops": 0, "checkouts": 0,
+             "hists": {}, "violations": {}, "samples": {}, "per_worker": []}
+    for r in results:
+        total["ops"] += r["ops"]
+        total["checkouts"] += r["checkouts"]
+        total["per_worker"].append(r["ops"] / r["elapsed"])
+        for action, hist in r["hists"].items():
+            total["hists"].setdefault(action, LatencyHistogram()).merge(hist)
+        for kind, n in r["violations"].items():
+            total["violations"][kind] = total["violations"].get(kind, 0) + n
+            total["samples"].setdefault(kind, []).extend(r["samples"][kind])
+    # Throughput = jumlah throughput tiap worker (waktu startup proses tidak dihitung)
+    total["throughput"] = sum(total["per_worker"])
+    return total
+
+def report(result, out=sys.stdout):
+    everything = LatencyHistogram()
+    for hist in result["hists"].values():
+        everything.merge(hist)
+    lines = [
+        f"load: {result['workers']} worker, {result['shoppers']:,} shopper, {result['ops']:,} aksi, "
+        f"{result['checkouts']:,} checkout, {result['throughput']:,.0f} aksi/s ({result['wall']:.1f} s wall)",
+        f"  {'aksi':<12}{'jumlah':>12}{'p50 µs':>10}{'p90 µs':>10}{'p99 µs':>10}{'p99.9 µs':>10}{'maks µs':>10}",
+    ]
+    for name, hist in sorted(result["hists"].items()) + [("SEMUA", everything)]:
+        lines.append(f"  {name:<12}{hist.total:>12,}" + "".join(f"{hist.percentile(p) / 1000:>10.1f}" for p in (50, 90, 99, 99.9))
+                     + f"{hist.max_ns / 1000:>10.1f}")
+    if result["violations"]:
+        lines.append("  PELANGGARAN INVARIAN:")
+        for kind, n in sorted(result["violations"].items()):
+            lines.append(f"    {kind:<14}{n:>10,}")
+            lines.extend(f"      {sample}" for sample in result["samples"][kind])
+    else:
+        lines.append("  invarian: OK (saldo, harga, keranjang, bundle, idempotensi, saldo akhir)")
+    print("\n".join(lines), file=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator multi-proses untuk logika Online Gamestore")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="proses worker (default: jumlah core)")
+    parser.add_argument("--shoppers", type=int, default=64, help="shopper per worker")
+    parser.add_argument("--per-account", type=int, default=4, help="shopper yang berbagi satu akun")
+    parser.add_argument("--duration", type=float, default=10.0, help="detik per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--catalog", help="file katalog .jsonl/.csv (default: katalog bawaan)")
+    parser.add_argument("--scaling", action="store_true", help="ulangi dengan 1, 2, 4, ... worker sampai --workers")
+    args = parser.parse_args()
+    if args.workers < 1 or args.shoppers < 1 or args.per_account < 1:
+        parser.error("--workers, --shoppers dan --per-account minimal 1")
+    if args.catalog:
+        try:
+            load_catalog(args.catalog, IMG_DIR)   # validasi (dan snapshot) sebelum worker dijalankan
+        except (OSError, CatalogFormatError) as e:
+            parser.error(f"katalog tidak bisa dimuat: {e}")
+
+    counts = [args.workers]
+    if args.scaling:
+        counts = sorted({min(1 << i, args.workers) for i in range(args.workers.bit_length() + 1)})
+    base = None
+    violated = False
+    for n in counts:
+        result = run_load(n, args.shoppers, args.per_account, args.duration, args.seed, args.catalog)
+        report(result)
+        violated = violated or bool(result["violations"])
+        if args.scaling:
+            base = base or result["throughput"]
+            speedup = result["throughput"] / base
+            print(f"  skala: {speedup:.2f}x dari 1 worker, efisiensi {speedup / n:.0%}\n")
+    raise SystemExit(1 if violated else 0)
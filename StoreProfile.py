@@ -0,0 +1,217 @@
+# =========================================
+# Online Gamestore — Instrumentasi & profiling
+# =========================================
+# Span waktu di hot path (decode cover, kartu katalog, render keranjang/harga, frame spin), counter
+# (widget dibuat/dihancurkan, gambar di-decode) dan mode opsional cProfile / tracemalloc.
+# Aktifkan dengan env STORE_PROFILE atau flag --profile, mis. STORE_PROFILE=spans,trace,cprofile
+#   spans      : ringkasan waktu per span + counter
+#   trace      : tambahan file Chrome trace JSON (buka di chrome://tracing atau ui.perfetto.dev)
+#   cprofile   : cProfile seluruh proses, 30 fungsi teratas + file .prof
+#   tracemalloc: 20 lokasi alokasi terbesar saat keluar
+# Hasil ditulis saat proses keluar ke STORE_PROFILE_OUT (default: profile/ di folder kerja).
+# Saat nonaktif span() mengembalikan context manager kosong yang sama, jadi biayanya hanya satu cek.
+
+import os, sys, time, atexit, threading
+
+PROFILE_MODES = ("spans", "trace", "cprofile", "tracemalloc")
+TRACE_LIMIT = 200_000   # event Chrome trace maksimum yang disimpan
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._record(self.name, self.t0, time.perf_counter())
+        return False
+
+class Profiler:
+    def __init__(self):
+        self.modes = set()
+        self.enabled = False
+        self.out_dir = None
+        self.spans = {}     # nama → [jumlah, total detik, maks detik]
+        self.counters = {}
+        self.events = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._cprofile = None
+        self._atexit = False
+
+    def configure(self, modes, out_dir=None):
+        # modes: string "spans,trace" atau iterable; mode tak dikenal → ValueError
+        if isinstance(modes, str):
+            modes = [m.strip() for m in modes.split(",") if m.strip()]
+        modes = set(modes)
+        unknown = modes - set(PROFILE_MODES)
+        if unknown:
+            raise ValueError(f"mode profil tidak dikenal: {', '.join(sorted(unknown))} (pilihan: {', '.join(PROFILE_MODES)})")
+        if "trace" in modes:
+            modes.add("spans")
+        self.modes = modes
+        self.enabled = bool(modes & {"spans", "trace"})
+        self.out_dir = out_dir or os.environ.get("STORE_PROFILE_OUT") or os.path.join(os.getcwd(), "profile")
+        if "cprofile" in modes and self._cprofile is None:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        if "tracemalloc" in modes:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+        if modes and not self._atexit:
+            atexit.register(self.dump)
+            self._atexit = True
+        return self
+
+    # Span & counter
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def timed(self, name):
+        # Dekorator: seluruh pemanggilan fungsi jadi satu span
+        def wrap(fn):
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._record(name, t0, time.perf_counter())
+            inner.__name__ = fn.__name__
+            inner.__doc__ = fn.__doc__
+            return inner
+        return wrap
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def _record(self, name, t0, t1):
+        dt = t1 - t0
+        with self._lock:
+            stat = self.spans.get(name)
+            if stat is None:
+                self.spans[name] = [1, dt, dt]
+            else:
+                stat[0] += 1
+                stat[1] += dt
+                if dt > stat[2]:
+                    stat[2] = dt
+            if "trace" in self.modes and len(self.events) < TRACE_LIMIT:
+                self.events.append((name, t0, dt, threading.get_ident()))
+
+    # Widget Tk: dihitung dengan membungkus BaseWidget.__init__/destroy (hanya saat profil aktif)
+    def instrument_tk(self, tk):
+        if not self.enabled or getattr(tk.BaseWidget, "_store_profiled", False):
+            return
+        profiler = self
+        init, destroy = tk.BaseWidget.__init__, tk.BaseWidget.destroy
+
+        def counted_init(widget, *args, **kwargs):
+            init(widget, *args, **kwargs)
+            profiler.count("widget.created")
+            profiler.count(f"widget.created.{type(widget).__name__}")
+
+        def counted_destroy(widget):
+            profiler.count("widget.destroyed")
+            destroy(widget)
+
+        tk.BaseWidget.__init__ = counted_init
+        tk.BaseWidget.destroy = counted_destroy
+        tk.BaseWidget._store_profiled = True
+
+    # Laporan
+    def summary(self):
+        lines = [f"Profil Online Gamestore ({time.perf_counter() - self._t0:.1f} s berjalan)"]
+        if self.spans:
+            lines.append(f"  {'span':<28}{'jumlah':>10}{'total ms':>12}{'rata ms':>10}{'maks ms':>10}")
+            for name, (n, total, worst) in sorted(self.spans.items(), key=lambda kv: -kv[1][1]):
+                lines.append(f"  {name:<28}{n:>10,}{total * 1000:>12.1f}{total / n * 1000:>10.3f}{worst * 1000:>10.2f}")
+        if self.counters:
+            lines.append(f"  {'counter':<28}{'nilai':>10}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:<28}{value:>10,}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        # Format "Trace Event": event lengkap (ph "X"), waktu dalam mikrodetik sejak proses mulai
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        return {"traceEvents": [{"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                                 "ts": round((t0 - self._t0) * 1e6, 1), "dur": round(dt * 1e6, 1)}
+                                for name, t0, dt, tid in events],
+                "displayTimeUnit": "ms"}
+
+    def dump(self):
+        if not self.modes:
+            return []
+        import json
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        written = []
+        sections = [self.summary()] if self.enabled else []
+
+        if self._cprofile is not None:
+            import io, pstats
+            self._cprofile.disable()
+            prof_path = os.path.join(self.out_dir, f"store-{stamp}.prof")
+            self._cprofile.dump_stats(prof_path)
+            written.append(prof_path)
+            buf = io.StringIO()
+            pstats.Stats(self._cprofile, stream=buf).sort_stats("cumulative").print_stats(30)
+            sections.append(buf.getvalue())
+            self._cprofile = None
+
+        if "tracemalloc" in self.modes:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                top = snapshot.statistics("lineno")[:20]
+                sections.append(f"tracemalloc: sekarang {current / 1e6:.1f} MB, puncak {peak / 1e6:.1f} MB\n"
+                                + "\n".join(f"  {stat}" for stat in top))
+
+        if "trace" in self.modes:
+            trace_path = os.path.join(self.out_dir, f"store-{stamp}.trace.json")
+            with open(trace_path, "w", encoding="utf-8") as f:
+                json.dump(self.chrome_trace(), f)
+            written.append(trace_path)
+
+        report_path = os.path.join(self.out_dir, f"store-{stamp}.txt")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(sections) + "\n")
+        written.insert(0, report_path)
+        print(sections[0] if sections else "", file=sys.stderr)
+        print("profil ditulis ke: " + ", ".join(written), file=sys.stderr)
+        self.modes = set()
+        return written
+
+PROFILE = Profiler()
+if os.environ.get("STORE_PROFILE"):
+    try:
+        PROFILE.configure(os.environ["STORE_PROFILE"])
+    except ValueError as e:
+        print(f"STORE_PROFILE diabaikan: {e}", file=sys.stderr)
+
+span = PROFILE.span
+count = PROFILE.count
+timed = PROFILE.timed
@@ -0,0 +1,408 @@
+# =========================================
+# Online Gamestore — Server HTTP/JSON (asyncio)
+# =========================================
+# Toko tanpa display: katalog, keranjang, checkout dan spin lewat HTTP/JSON lokal.
+# Aturan harga sama persis dengan GUI karena semuanya lewat StoreEngine (effective_price, Cart.total).
+# Jalankan:  python StoreServer.py serve --port 8080
+#            python StoreServer.py load --clients 64 --duration 10   (server dijalankan otomatis)
+
+import os, sys, json, time, random, asyncio, argparse, itertools, subprocess
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from StoreEngine import (StoreEngine, Catalog, CatalogPricing, Ledger, CheckoutError, EmptyCartError, InsufficientBalanceError,
+                         CatalogFormatError, default_games, load_catalog)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMG_DIR = os.path.join(BASE_DIR, "images")
+
+MAX_BODY = 1 << 20
+CATALOG_PAGE = 50
+MAX_SESSIONS = 10_000
+SESSION_TTL = 30 * 60     # detik tanpa request sebelum sesi dibuang
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               402: "Payment Required", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# Sesi (Modul 5, 6)
+class SessionStore:
+    # Satu StoreEngine per sesi (keranjang, voucher, spin sendiri); katalog, harga (CatalogPricing) dan Ledger
+    # dipakai bersama, jadi membuat sesi tidak menyalin harga seluruh katalog.
+    # Sesi diurutkan dari yang paling lama tidak dipakai: yang menganggur lebih dari ttl detik dibuang,
+    # dan kalau masih ada max_sessions sesi aktif, sesi baru ditolak (503).
+    def __init__(self, catalog, default_balance=500000, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL, clock=time.monotonic):
+        self.catalog = catalog if isinstance(catalog, Catalog) else Catalog.from_games(catalog)
+        self.pricing = CatalogPricing(self.catalog)
+        self.default_balance = default_balance
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self.ledger = Ledger()
+        self.sessions = OrderedDict()   # id → (engine, waktu terakhir dipakai)
+        self.expired = 0
+        self._ids = itertools.count(1)
+
+    def expire(self):
+        deadline = self.clock() - self.ttl
+        while self.sessions:
+            sid, (_, last_used) = next(iter(self.sessions.items()))
+            if last_used > deadline:
+                break
+            self._drop(sid)
+            self.expired += 1
+
+    def create(self, balance=None):
+        self.expire()
+        if len(self.sessions) >= self.max_sessions:
+            raise HTTPError(503, f"terlalu banyak sesi aktif ({self.max_sessions}); tutup sesi lama atau coba lagi nanti")
+        sid = f"s{next(self._ids)}"
+        balance = self.default_balance if balance is None else balance
+        engine = StoreEngine(self.catalog, balance, account=sid, ledger=self.ledger, pricing=self.pricing)
+        self.sessions[sid] = (engine, self.clock())
+        return sid
+
+    def get(self, sid):
+        self.expire()
+        entry = self.sessions.get(sid)
+        if entry is None:
+            raise HTTPError(404, f"sesi tidak ditemukan: {sid}")
+        self.sessions[sid] = (entry[0], self.clock())
+        self.sessions.move_to_end(sid)
+        return entry[0]
+
+    def close(self, sid):
+        self.get(sid)
+        self._drop(sid)
+
+    def _drop(self, sid):
+        del self.sessions[sid]
+        self.ledger.drop(sid)
+
+# Handler endpoint (Modul 4)
+def _cart_view(engine):
+    cart = engine.cart
+    return {
+        "lines": [{"title": t, "qty": q, "subtotal": s} for t, q, s, _ in cart.summary_lines()],
+        "count": cart.total_count(),
+        "total": cart.total(),
+        "discount": cart.unique_count() >= 3,
+        "balance": engine.balance,
+    }
+
+def _text_field(body, name, default=None):
+    value = body.get(name, default)
+    if value is not None and not isinstance(value, str):
+        raise HTTPError(400, f"{name} harus berupa teks")
+    return value
+
+def _title(engine, body):
+    title = _text_field(body, "title")
+    if title not in engine.active_price:
+        raise HTTPError(404, f"judul tidak ada di katalog: {title!r}")
+    return title
+
+def _int_param(query, name, default=None):
+    value = query.get(name, [None])[0]
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"parameter {name} harus bilangan bulat") from None
+
+def handle_catalog(store, engine, query, body):
+    q = query.get("q", [""])[0]
+    ids = engine.search(q, _int_param(query, "min_price"), _int_param(query, "max_price"))
+    if ids is None:
+        ids = range(len(engine.catalog))
+    offset = max(0, _int_param(query, "offset", 0))
+    limit = min(500, max(0, _int_param(query, "limit", CATALOG_PAGE)))
+    titles = engine.catalog.titles
+    items = []
+    for game_id in ids[offset:offset + limit]:
+        title = titles[game_id]
+        items.append({"id": game_id, "title": title, "price": engine.base_price[title],
+                      "effective_price": engine.effective_price(title)})
+    return 200, {"total": len(ids), "offset": offset, "items": items,
+                 "voucher_percent": engine.next_discount_percent}
+
+def handle_cart(store, engine, query, body):
+    return 200, _cart_view(engine)
+
+def handle_cart_add(store, engine, query, body):
+    engine.add_to_cart(_title(engine, body))
+    return 200, _cart_view(engine)
+
+def handle_cart_remove(store, engine, query, body):
+    engine.remove_from_cart(_title(engine, body))
+    return 200, _cart_view(engine)
+
+def handle_checkout(store, engine, query, body):
+    recipient = _text_field(body, "recipient") or "Akun saya"
+    key = _text_field(body, "idempotency_key")
+    try:
+        summary, spin_count = engine.checkout(recipient, idempotency_key=key)
+    except EmptyCartError as e:
+        raise HTTPError(409, str(e)) from None
+    except InsufficientBalanceError as e:
+        raise HTTPError(402, str(e)) from None
+    except CheckoutError as e:
+        raise HTTPError(409, str(e)) from None
+    return 200, {"lines": [{"title": t, "qty": q, "subtotal": s} for t, q, s, _ in summary],
+                 "paid": engine.last_paid, "spins": spin_count, "balance": engine.balance}
+
+def handle_spin(store, engine, query, body):
+    # Semua spin dari checkout terakhir dijalankan sekaligus (GUI menjalankannya satu per satu dengan animasi)
+    if engine.spin_used:
+        raise HTTPError(409, "Spin sudah digunakan untuk transaksi ini.")
+    if engine.last_spin_count <= 0:
+        raise HTTPError(409, "Tidak ada spin yang tersedia untuk transaksi ini.")
+    count = engine.begin_spins()
+    results = []
+    for i in range(count):
+        reward = engine.roll_reward()
+        results.append({"reward": reward, "kind": engine.apply_reward(reward)})
+    return 200, {"results": results, "balance": engine.balance, "voucher_percent": engine.next_discount_percent}
+
+SESSION_ROUTES = {
+    ("GET", "catalog"): handle_catalog,
+    ("GET", "cart"): handle_cart,
+    ("POST", "cart/add"): handle_cart_add,
+    ("POST", "cart/remove"): handle_cart_remove,
+    ("POST", "checkout"): handle_checkout,
+    ("POST", "spin"): handle_spin,
+}
+
+def route(store, method, target, body):
+    # /sessions                      POST → sesi baru {"balance": n}
+    # /sessions/<id>                 GET (ringkasan) / DELETE
+    # /sessions/<id>/<aksi>          lihat SESSION_ROUTES
+    parts = urlsplit(target)
+    query = parse_qs(parts.query)
+    path = [unquote(p) for p in parts.path.strip("/").split("/") if p]
+    if path == ["health"] and method == "GET":
+        return 200, {"status": "ok", "sessions": len(store.sessions), "expired": store.expired}
+    if not path or path[0] != "sessions":
+        raise HTTPError(404, f"path tidak dikenal: {parts.path}")
+    if len(path) == 1:
+        if method != "POST":
+            raise HTTPError(405, "gunakan POST /sessions")
+        balance = body.get("balance")
+        if balance is not None and (not isinstance(balance, int) or isinstance(balance, bool) or balance < 0):
+            raise HTTPError(400, "balance harus bilangan bulat >= 0")
+        sid = store.create(balance)
+        return 201, {"session": sid, "balance": store.get(sid).balance}
+    engine = store.get(path[1])
+    if len(path) == 2:
+        if method == "DELETE":
+            store.close(path[1])
+            return 200, {"closed": path[1]}
+        if method == "GET":
+            return 200, _cart_view(engine)
+        raise HTTPError(405, "gunakan GET atau DELETE")
+    handler = SESSION_ROUTES.get((method, "/".join(path[2:])))
+    if handler is None:
+        raise HTTPError(404, f"aksi tidak dikenal: {method} {parts.path}")
+    return handler(store, engine, query, body)
+
+# Protokol HTTP/1.1 minimal: keep-alive, Content-Length, body JSON
+async def _handle_connection(store, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            try:
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    # Panjang body tidak diketahui → sisa stream tidak bisa dipercaya, koneksi ditutup
+                    keep_alive = False
+                    raise HTTPError(400, f"Content-Length tidak valid: {length!r}")
+                length = int(length)
+                if length > MAX_BODY:
+                    raise HTTPError(413, "body terlalu besar")
+                raw = await reader.readexactly(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    raise HTTPError(400, "body bukan JSON yang valid") from None
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "body JSON harus berupa object")
+                status, payload = route(store, method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": str(e)}
+            except asyncio.IncompleteReadError:
+                break
+            except Exception as e:  # bug di handler tidak boleh menjatuhkan server
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(data)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(store, host="127.0.0.1", port=8080, ready=None):
+    server = await asyncio.start_server(lambda r, w: _handle_connection(store, r, w), host, port)
+    addr = server.sockets[0].getsockname()
+    print(f"Online Gamestore API di http://{addr[0]}:{addr[1]}  ({len(store.catalog):,} judul)", flush=True)
+    if ready is not None:
+        ready.set_result(addr)
+    async with server:
+        await server.serve_forever()
+
+# Load generator (Modul 3, 4): banyak klien keep-alive, tiap klien mengulang skenario belanja
+class _Client:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        length = next(int(l.split(":", 1)[1]) for l in lines[1:] if l.lower().startswith("content-length:"))
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+async def _shopper(host, port, deadline, titles, latencies, errors, seed):
+    # Skenario: buka sesi → lihat katalog → tambah 1-4 game (kadang hapus satu) → checkout → spin
+    rng = random.Random(seed)
+    client = _Client(host, port)
+
+    async def call(name, method, path, body=None, ok=(200, 201)):
+        t0 = time.perf_counter()
+        status, payload = await client.request(method, path, body)
+        latencies.setdefault(name, []).append(time.perf_counter() - t0)
+        if status not in ok:
+            errors[name] = errors.get(name, 0) + 1
+        return status, payload
+
+    try:
+        while time.perf_counter() < deadline:
+            _, payload = await call("session", "POST", "/sessions", {"balance": 10 ** 9})
+            sid = payload["session"]
+            await call("catalog", "GET", f"/sessions/{sid}/catalog?limit=20")
+            picks = rng.sample(titles, rng.randint(1, min(4, len(titles))))
+            for title in picks:
+                await call("cart_add", "POST", f"/sessions/{sid}/cart/add", {"title": title})
+            if len(picks) > 1 and rng.random() < 0.3:
+                await call("cart_remove", "POST", f"/sessions/{sid}/cart/remove", {"title": picks[0]})
+            await call("checkout", "POST", f"/sessions/{sid}/checkout", {"idempotency_key": f"{seed}-{sid}"})
+            await call("spin", "POST", f"/sessions/{sid}/spin")
+            await call("close", "DELETE", f"/sessions/{sid}")
+    finally:
+        client.close()
+
+async def run_load(host, port, clients=32, duration=10.0):
+    probe = _Client(host, port)
+    _, payload = await probe.request("POST", "/sessions", {})
+    _, catalog = await probe.request("GET", f"/sessions/{payload['session']}/catalog?limit=500")
+    await probe.request("DELETE", f"/sessions/{payload['session']}")
+    probe.close()
+    titles = [item["title"] for item in catalog["items"]]
+
+    latencies, errors = {}, {}
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    await asyncio.gather(*(_shopper(host, port, deadline, titles, latencies, errors, seed) for seed in range(clients)))
+    elapsed = time.perf_counter() - t0
+
+    everything = sorted(v for values in latencies.values() for v in values)
+    print(f"load: {clients} klien, {elapsed:.1f} s, {len(everything):,} request, {len(everything) / elapsed:,.0f} req/s")
+    print(f"  {'endpoint':<14}{'jumlah':>10}{'p50 ms':>10}{'p99 ms':>10}{'error':>8}")
+    for name, values in sorted(latencies.items()) + [("SEMUA", everything)]:
+        values = sorted(values)
+        n_err = sum(errors.values()) if name == "SEMUA" else errors.get(name, 0)
+        print(f"  {name:<14}{len(values):>10,}{_percentile(values, 50) * 1000:>10.2f}{_percentile(values, 99) * 1000:>10.2f}{n_err:>8,}")
+    return latencies, errors
+
+def _spawn_server(args):
+    # Server di proses terpisah supaya load generator tidak berbagi event loop/GIL dengannya
+    cmd = [sys.executable, os.path.abspath(__file__), "serve", "--host", args.host, "--port", "0"]
+    if args.catalog:
+        cmd += ["--catalog", args.catalog]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("Online Gamestore API"):
+        proc.kill()
+        raise SystemExit("server gagal dijalankan")
+    url = next(token for token in line.split() if token.startswith("http://"))
+    port = int(url.rsplit(":", 1)[1])
+    return proc, port
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Online Gamestore HTTP/JSON API")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="jalankan server API")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8080)
+    p_serve.add_argument("--catalog", help="file katalog .jsonl/.csv (default: katalog bawaan)")
+    p_serve.add_argument("--balance", type=int, default=500000, help="saldo awal sesi baru")
+    p_serve.add_argument("--max-sessions", type=int, default=MAX_SESSIONS, help="sesi aktif maksimum (default: %(default)s)")
+    p_serve.add_argument("--session-ttl", type=float, default=SESSION_TTL,
+                         help="detik tanpa request sebelum sesi dibuang (default: %(default)s)")
+    p_load = sub.add_parser("load", help="load generator: req/s dan latensi p50/p99")
+    p_load.add_argument("--host", default="127.0.0.1")
+    p_load.add_argument("--port", type=int, help="port server yang sudah berjalan (tanpa ini server dijalankan otomatis)")
+    p_load.add_argument("--catalog", help="katalog untuk server yang dijalankan otomatis")
+    p_load.add_argument("--clients", type=int, default=32)
+    p_load.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            catalog = load_catalog(args.catalog, IMG_DIR) if args.catalog else default_games(IMG_DIR)
+        except (OSError, CatalogFormatError) as e:
+            parser.error(f"katalog tidak bisa dimuat: {e}")
+        try:
+            store = SessionStore(catalog, args.balance, max_sessions=args.max_sessions, ttl=args.session_ttl)
+            asyncio.run(serve(store, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        proc = None
+        port = args.port
+        if port is None:
+            proc, port = _spawn_server(args)
+        try:
+            asyncio.run(run_load(args.host, port, args.clients, args.duration))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
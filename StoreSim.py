@@ -0,0 +1,281 @@
+# =========================================
+# Online Gamestore — Simulasi ekonomi Lucky Spin
+# =========================================
+# Monte Carlo headless: tabel hadiah (RewardTable) diputar terhadap aliran checkout sintetis dengan NumPy.
+# Tiap checkout membeli k copy (k dari distribusi keranjang) dan mendapat k spin, sama seperti StoreEngine.
+# Yang dihitung per checkout:
+#   saldo  : jumlah hadiah "saldo" × nilainya, langsung jadi biaya
+#   voucher: kalau ada voucher di spin checkout ini, checkout berikutnya dibayar dengan diskon voucher
+#            (voucher terakhir yang keluar yang berlaku, sama dengan set_discount_percent berurutan);
+#            StoreEngine.checkout mengosongkan voucher, jadi satu voucher hanya dipakai satu checkout
+# Jalankan:  python StoreSim.py --spins 100000000 --cart geometric:3 --seed 7
+#            python StoreSim.py --rewards hadiah.json --cart poisson:2 --workers 4
+#
+# Penyederhanaan model (dicetak juga di laporan):
+# - judul tiap copy diambil acak seragam dari katalog; copy judul yang sama menambah qty, dan diskon bundle
+#   dipakai kalau ada 3+ judul berbeda (sama dengan Cart.total)
+# - semua spin dimainkan, dan voucher sudah aktif sebelum keranjang checkout berikutnya diisi
+#   (di engine harga voucher dicatat saat add_to_cart)
+# - diskon voucher dihitung dari total keranjang, pembulatan per item di effective_price (< Rp 1 per copy) diabaikan
+# - simulasi dibagi per chunk; voucher dari checkout terakhir sebuah chunk dianggap tidak terpakai
+# - biaya per checkout dihistogramkan dengan resolusi HIST_STEP untuk persentil
+
+import os, sys, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from StoreEngine import (CatalogFormatError, RewardTableError, DEFAULT_REWARDS, _numpy, format_rupiah,
+                         default_games, load_catalog, load_reward_table)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMG_DIR = os.path.join(BASE_DIR, "images")
+
+CHUNK_CHECKOUTS = 1_000_000   # checkout per chunk (tiap chunk punya generator turunan sendiri)
+HIST_STEP = 1000              # resolusi histogram biaya per checkout (rupiah)
+CART_KINDS = ("geometric", "poisson", "fixed")
+PERCENTILES = (50, 90, 99, 99.9)
+BULK_DISCOUNT_FACTOR = 0.8    # Cart.total(): 3 judul berbeda atau lebih → potongan 20%
+BUNDLE_MIN_TITLES = 3
+
+class CartModel:
+    # Distribusi jumlah copy per checkout (selalu >= 1):
+    #   geometric:m → geometrik dengan rata-rata m, poisson:m → 1 + Poisson(m - 1), fixed:m → selalu m
+    def __init__(self, kind="geometric", mean=3.0):
+        if kind not in CART_KINDS:
+            raise ValueError(f"distribusi keranjang tidak dikenal: {kind!r} (pilih {', '.join(CART_KINDS)})")
+        if mean < 1 or (kind == "fixed" and mean != int(mean)):
+            raise ValueError(f"rata-rata copy per checkout tidak valid untuk {kind}: {mean}")
+        self.kind = kind
+        self.mean = float(mean)
+
+    @classmethod
+    def parse(cls, text):
+        kind, _, mean = text.partition(":")
+        try:
+            return cls(kind, float(mean) if mean else 3.0)
+        except ValueError as e:
+            raise ValueError(f"--cart {text!r}: {e}") from None
+
+    def sample(self, rng, n):
+        np = _numpy()
+        if self.kind == "geometric":
+            return rng.geometric(1 / self.mean, n)
+        if self.kind == "poisson":
+            return 1 + rng.poisson(self.mean - 1, n)
+        return np.full(n, int(self.mean), dtype=np.int64)
+
+    def __str__(self):
+        return f"{self.kind}:{self.mean:g}"
+
+def _plan(table):
+    # Tabel hadiah → array yang dipakai tiap chunk (dihitung sekali)
+    np = _numpy()
+    probs = np.array(table.probabilities())
+    kinds = [r.kind for r in table]
+    saldo = [i for i, k in enumerate(kinds) if k == "saldo"]
+    voucher = [i for i, k in enumerate(kinds) if k == "voucher"]
+    values = np.array([r.value for r in table], dtype=np.int64)
+    p_voucher = probs[voucher].sum()
+    return {
+        "probs": probs,
+        "saldo": saldo,
+        "voucher": voucher,
+        "values": values,
+        "p_voucher": p_voucher,
+        # voucher yang berlaku = voucher terakhir; karena spin i.i.d. peluangnya sebanding bobot voucher
+        "voucher_cum": np.cumsum(probs[voucher]) / p_voucher if voucher else None,
+    }
+
+def _bundle_checkouts(picks, k, starts, n_titles):
+    # True untuk checkout dengan 3+ judul berbeda (Cart.total), bukan 3+ copy.
+    # Katalog kecil: bitmask judul per checkout di-OR, lalu cek >= 3 bit (dua kali buang bit terendah).
+    # Katalog besar: key (checkout, judul) diurutkan, yang unik dihitung per checkout.
+    np = _numpy()
+    if n_titles < 63:
+        mask = np.bitwise_or.reduceat(np.left_shift(np.int64(1), picks), starts)
+        for _ in range(BUNDLE_MIN_TITLES - 1):
+            mask &= mask - 1
+        return mask != 0
+    keys = np.repeat(np.arange(len(k), dtype=np.int64), k) * n_titles + picks
+    keys.sort()
+    first = np.empty(len(keys), dtype=bool)
+    first[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    return np.bincount(keys[first] // n_titles, minlength=len(k)) >= BUNDLE_MIN_TITLES
+
+def _simulate_chunk(job):
+    # Satu chunk checkout; dijalankan di proses worker atau langsung. Mengembalikan agregat yang bisa dijumlah.
+    table, cart, prices, n, seed, redeem = job
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    plan = _plan(table)
+    probs, values = plan["probs"], plan["values"]
+
+    k = cart.sample(rng, n).astype(np.int64)
+
+    # Hadiah saldo per checkout: rantai binomial (multinomial marginal) hanya untuk kolom yang butuh nilai per baris
+    remaining = k.copy()
+    left = 1.0
+    saldo_paid = np.zeros(n, dtype=np.int64)
+    counts = np.zeros(len(probs), dtype=np.int64)
+    for i in plan["saldo"]:
+        hits = rng.binomial(remaining, min(1.0, probs[i] / left)) if left > 0 else np.zeros(n, dtype=np.int64)
+        saldo_paid += hits * values[i]
+        counts[i] = hits.sum()
+        remaining -= hits
+        left -= probs[i]
+
+    # Voucher: per checkout cukup "ada voucher atau tidak" → P = 1 - (1 - q)^sisa, satu uniform per baris.
+    # Voucher yang berlaku = voucher terakhir yang keluar; karena spin i.i.d. jenisnya sebanding bobot voucher.
+    # Jumlah voucher & sisa hadiah dihitung agregat: jumlah binomial/multinomial i.i.d. = binomial/multinomial totalnya.
+    voucher_pct = np.zeros(n, dtype=np.int64)
+    rest_spins = int(remaining.sum())
+    if plan["voucher"] and left > 0:
+        p = plan["p_voucher"]
+        q = min(1.0, p / left)
+        if q >= 1.0:
+            got = remaining > 0
+        else:
+            got = rng.random(n) < -np.expm1(remaining * np.log1p(-q))
+        pick = np.searchsorted(plan["voucher_cum"], rng.random(int(got.sum())), side="right")
+        pick = np.minimum(pick, len(plan["voucher"]) - 1)
+        voucher_pct[got] = values[plan["voucher"]][pick]
+        won = rng.binomial(rest_spins, q)
+        counts[plan["voucher"]] = rng.multinomial(won, probs[plan["voucher"]] / p)
+        rest_spins -= won
+        left -= p
+
+    rest = [i for i in range(len(probs)) if i not in plan["saldo"] and i not in plan["voucher"]]
+    if rest and left > 0:
+        p_rest = probs[rest]
+        counts[rest] = rng.multinomial(rest_spins, p_rest / p_rest.sum())
+
+    # Nilai keranjang: judul tiap copy acak seragam dari katalog, harga dijumlah per checkout.
+    # Diskon bundle hanya untuk checkout dengan 3+ judul berbeda (bukan 3+ copy)
+    picks = rng.integers(0, len(prices), int(k.sum()))
+    item_prices = prices[picks]
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(k[:-1], out=starts[1:])
+    subtotal = np.add.reduceat(item_prices, starts)
+    factor = np.where(_bundle_checkouts(picks, k, starts, len(prices)), BULK_DISCOUNT_FACTOR, 1.0)
+    full_pay = (subtotal * factor).astype(np.int64)
+
+    # Voucher dari checkout i dipakai di checkout i + 1 (dengan peluang redeem)
+    applied = np.zeros(n, dtype=np.int64)
+    applied[1:] = voucher_pct[:-1]
+    if redeem < 1.0:
+        applied[rng.random(n) >= redeem] = 0
+    voucher_pay = (((subtotal * (1 - applied / 100)).astype(np.int64)) * factor).astype(np.int64)
+    voucher_cost = np.where(applied > 0, full_pay - voucher_pay, 0)
+
+    cost = saldo_paid + voucher_cost
+    return {
+        "checkouts": n,
+        "spins": int(k.sum()),
+        "counts": counts,
+        "saldo_paid": int(saldo_paid.sum()),
+        "vouchers_won": int((voucher_pct > 0).sum()),
+        "vouchers_redeemed": int((applied > 0).sum()),
+        "voucher_cost": int(voucher_cost.sum()),
+        "revenue": int((full_pay - voucher_cost).sum()),
+        "max_cost": int(cost.max()),
+        "hist": np.bincount(cost // HIST_STEP),
+    }
+
+def _merge(results):
+    total = None
+    for r in results:
+        if total is None:
+            total = dict(r)
+            continue
+        for key in ("checkouts", "spins", "saldo_paid", "vouchers_won", "vouchers_redeemed", "voucher_cost", "revenue"):
+            total[key] += r[key]
+        total["counts"] = total["counts"] + r["counts"]
+        total["max_cost"] = max(total["max_cost"], r["max_cost"])
+        a, b = total["hist"], r["hist"]
+        if len(a) < len(b):
+            a, b = b, a
+        a = a.copy()
+        a[:len(b)] += b
+        total["hist"] = a
+    return total
+
+def _hist_percentile(hist, pct):
+    # Batas bawah bin histogram tempat persentil jatuh
+    np = _numpy()
+    cum = np.cumsum(hist)
+    idx = int(np.searchsorted(cum, cum[-1] * pct / 100, side="left"))
+    return idx * HIST_STEP
+
+def simulate(table=DEFAULT_REWARDS, cart=None, prices=None, spins=10_000_000, seed=0, redeem=1.0,
+             workers=1, chunk=CHUNK_CHECKOUTS):
+    # Jumlah checkout diperkirakan dari target spin dan rata-rata copy per checkout; hasil deterministik
+    # untuk seed + chunk yang sama, berapa pun jumlah worker (tiap chunk memakai SeedSequence turunan).
+    np = _numpy()
+    cart = cart if cart is not None else CartModel()
+    if prices is None:
+        prices = [g.price for g in default_games(IMG_DIR)]
+    prices = np.asarray(prices, dtype=np.int64)
+    if not len(prices):
+        raise ValueError("katalog kosong")
+    if not 0.0 <= redeem <= 1.0:
+        raise ValueError(f"peluang redeem voucher harus 0..1, bukan {redeem}")
+    checkouts = max(1, int(round(spins / cart.mean)))
+    sizes = [chunk] * (checkouts // chunk) + ([checkouts % chunk] if checkouts % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(table, cart, prices, size, s, redeem) for size, s in zip(sizes, seeds)]
+
+    t0 = time.perf_counter()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_simulate_chunk, jobs))
+    else:
+        results = [_simulate_chunk(job) for job in jobs]
+    total = _merge(results)
+    total["seconds"] = time.perf_counter() - t0
+    total["percentiles"] = {p: _hist_percentile(total["hist"], p) for p in PERCENTILES}
+    return total
+
+def report(result, table, cart, redeem=1.0, out=sys.stdout):
+    n, spins = result["checkouts"], result["spins"]
+    cost = result["saldo_paid"] + result["voucher_cost"]
+    gross = result["revenue"] + result["voucher_cost"]
+    lines = [
+        f"Simulasi Lucky Spin: {n:,} checkout, {spins:,} spin, keranjang {cart}, redeem voucher {redeem:.0%}",
+        f"  waktu {result['seconds']:.2f} s ({spins / max(result['seconds'], 1e-9):,.0f} spin/s)",
+        f"  {'hadiah':<24}{'jenis':>9}{'bobot':>8}{'peluang':>10}{'hasil sim':>11}{'jumlah':>16}",
+    ]
+    for r, p, c in zip(table, table.probabilities(), result["counts"]):
+        lines.append(f"  {r.label:<24}{r.kind:>9}{r.weight:>8g}{p:>10.4f}{c / max(spins, 1):>11.4f}{int(c):>16,}")
+    lines += [
+        f"  saldo dibayar           {format_rupiah(result['saldo_paid']):>22}  "
+        f"{result['saldo_paid'] / max(spins, 1):>10,.0f}/spin  {result['saldo_paid'] / n:>10,.0f}/checkout",
+        f"  voucher                 menang {result['vouchers_won'] / n:.2%} checkout, terpakai {result['vouchers_redeemed']:,}"
+        f" → diskon {format_rupiah(result['voucher_cost'])}"
+        f" ({result['voucher_cost'] / max(result['vouchers_redeemed'], 1):,.0f}/voucher)",
+        f"  pendapatan              {format_rupiah(result['revenue']):>22}  biaya hadiah {cost / max(gross, 1):.2%} dari harga jual",
+        f"  biaya per checkout      rata-rata {cost / n:,.0f}  "
+        + "  ".join(f"p{p:g} {v:,}" for p, v in result["percentiles"].items())
+        + f"  maks {result['max_cost']:,}",
+        f"  (persentil dibulatkan ke bawah per Rp {HIST_STEP:,}; judul acak seragam, bundle = 3+ judul berbeda)",
+    ]
+    print("\n".join(lines), file=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulasi Monte Carlo ekonomi Lucky Spin")
+    parser.add_argument("--spins", type=float, default=1e7, help="target jumlah spin (default 1e7)")
+    parser.add_argument("--cart", default="geometric:3", help="distribusi copy per checkout: geometric:m, poisson:m, fixed:m")
+    parser.add_argument("--rewards", help="file JSON tabel hadiah (default: tabel bawaan)")
+    parser.add_argument("--catalog", help="file katalog .jsonl/.csv untuk harga (default: katalog bawaan)")
+    parser.add_argument("--redeem", type=float, default=1.0, help="peluang voucher dipakai di checkout berikutnya")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="proses paralel (hasil sama untuk seed yang sama)")
+    args = parser.parse_args()
+
+    try:
+        table = load_reward_table(args.rewards) if args.rewards else DEFAULT_REWARDS
+        cart = CartModel.parse(args.cart)
+        games = load_catalog(args.catalog, IMG_DIR) if args.catalog else default_games(IMG_DIR)
+        result = simulate(table, cart, [g.price for g in games], int(args.spins), args.seed, args.redeem, args.workers)
+    except (OSError, CatalogFormatError, RewardTableError, ValueError) as e:
+        parser.error(str(e))
+    report(result, table, cart, args.redeem)
@@ -0,0 +1,574 @@
+# =========================================
+# Online Gamestore — Benchmark
+# =========================================
+# Jalankan: python benchmark.py <nama>   (tanpa argumen = semua benchmark)
+
+import os, sys, csv, json, time, random, shutil, tempfile, argparse, tracemalloc
+import tkinter as tk
+from PIL import Image
+
+from StoreApp import COVER_SIZES, STYLES, ThumbnailStore, StoreApp
+from StoreEngine import (StoreEngine, Cart, Catalog, Game, PriceRule, TitleIndex, REWARDS, default_games,
+                         load_catalog)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMG_DIR = os.path.join(BASE_DIR, "images")
+
+def _covers():
+    return sorted(os.path.join(IMG_DIR, f) for f in os.listdir(IMG_DIR) if f.lower().endswith(".png"))
+
+def _timeit(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def _report(name, seconds, extra=""):
+    print(f"  {name:<44} {seconds * 1000:10.2f} ms  {extra}")
+
+def _bench_ops(name, fn, ops, rounds=3):
+    # Gaya pytest-benchmark: min/mean per round + throughput operasi per detik
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    best, mean = min(times), sum(times) / len(times)
+    print(f"  {name:<44} min {best * 1000:9.1f} ms  mean {mean * 1000:9.1f} ms  {ops / best:12,.0f} ops/s")
+
+# Startup katalog: decode PNG penuh vs thumbnail store
+def bench_thumbnails():
+    covers = _covers()
+    size = COVER_SIZES["card"]
+    print(f"thumbnails: {len(covers)} cover, ukuran kartu {size[0]}x{size[1]}")
+
+    def raw():
+        for p in covers:
+            with Image.open(p) as img:
+                img.resize(size).load()
+
+    cache_dir = tempfile.mkdtemp(prefix="thumbs-")
+    try:
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            ThumbnailStore(cache_dir).build(covers)
+
+        def warm():
+            store = ThumbnailStore(cache_dir)
+            for p in covers:
+                with Image.open(store.lookup(p, size)) as img:
+                    img.load()
+
+        _report("decode sumber + resize (tanpa cache)", _timeit(raw))
+        _report("build thumbnail store (cold, sekali)", _timeit(cold, repeat=1))
+        _report("startup dari thumbnail store (warm)", _timeit(warm))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+def _tk_root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  dilewati: Tk tidak tersedia ({e})")
+        return None
+    root.withdraw()
+    return root
+
+# Refresh keranjang: biaya satu klik "+" tidak boleh bergantung pada jumlah baris yang tidak berubah
+def bench_cart_refresh():
+    print("cart_refresh: klik '+' pada satu baris, keranjang N baris")
+    covers = _covers()
+    for n in (10, 50, 200):
+        root = _tk_root()
+        if root is None:
+            return
+        app = StoreApp(root)
+        for i in range(n):
+            app.engine.cart.add(f"Game {i}", 100000 + i, covers[i % len(covers)])
+        app.show_cart()
+        root.update()
+        target = f"Game {n // 2}"
+
+        def inc():
+            app._inc(target)
+            app.redraw.flush()
+
+        def full():
+            app.refresh_cart()
+            app.redraw.flush()
+
+        t_inc = _timeit(inc, repeat=50)
+        t_full = _timeit(full, repeat=5)
+        _report(f"_inc, {n} baris", t_inc)
+        _report(f"refresh_cart penuh (diff), {n} baris", t_full)
+        root.destroy()
+
+# Penjadwal redraw: klik beruntun dalam satu frame digabung jadi satu redraw per region
+def bench_redraw(clicks=20, frames=50):
+    print(f"redraw: {clicks} klik per frame, {frames} frame")
+    root = _tk_root()
+    if root is None:
+        return
+    app = StoreApp(root, initial_balance=10 ** 12)
+    app.show_cart()
+    titles = [g.title for g in app.engine.games]
+    root.update()
+
+    def frame():
+        for i in range(clicks):
+            t = titles[i % len(titles)]
+            app.engine.add_to_cart(t)
+            app.refresh_cart([t])        # seperti _popup_add
+        app.update_total()               # seperti hadiah spin saldo
+        app.update_catalog_prices()      # seperti hadiah spin voucher
+        root.update()                    # after_idle → satu flush
+
+    t = _timeit(frame, repeat=frames)
+    _report(f"frame, {clicks} klik + spin", t)
+    stats = app.redraw.stats()
+    print(f"  marks {stats['marks']:,}  digabung {stats['coalesced']:,}  flush {stats['flushes']:,}")
+    print("  redraw per region: " + ", ".join(f"{k} {v:,}" for k, v in stats["redraws"].items()))
+    root.destroy()
+
+# Jam spin: satu timer untuk seluruh antrean; loop yang diperlambat melewati frame, bukan menumpuk after
+def bench_spin_clock(spins=50, frame_ms=5, pause_ms=10, lag_ms=20):
+    print(f"spin_clock: {spins} spin, frame {frame_ms} ms, tiap tick diperlambat {lag_ms} ms")
+    root = _tk_root()
+    if root is None:
+        return
+    from StoreApp import SpinClock
+    reel = tk.Label(root)
+    results = []
+    clock = SpinClock(root, REWARDS, lambda text: reel.config(text=text), results.extend, root.quit,
+                      frame_ms=frame_ms, pause_ms=pause_ms)
+
+    def slow():
+        time.sleep(lag_ms / 1000)
+        if clock.running:
+            root.after(1, slow)
+
+    rng = random.Random(5)
+    t0 = time.perf_counter()
+    clock.start([(rng.choice(REWARDS), rng.randint(22, 28)) for _ in range(spins)])
+    root.after(1, slow)
+    root.mainloop()
+    elapsed = time.perf_counter() - t0
+    stats = clock.stats()
+    planned = sum(frames for _, frames in clock.spins) * frame_ms / 1000 + spins * pause_ms / 1000
+    _report("seluruh antrean", elapsed, f"jadwal {planned * 1000:.0f} ms, {len(results)} hasil")
+    print(f"  tick {stats['ticks']:,}  frame digambar {stats['frames_drawn']:,}  dilewati {stats['frames_skipped']:,}")
+    t0 = time.perf_counter()
+    clock.start([(rng.choice(REWARDS), 25) for _ in range(spins)])
+    clock.fast_forward()
+    _report("fast-forward (batch)", time.perf_counter() - t0)
+    root.destroy()
+
+# Startup: proses baru per run; import modul (tanpa Tk) lalu laporan --startup-timing (run terakhir) dengan/tanpa prebuild
+def bench_startup(runs=3, menu_wait=500):
+    import subprocess
+    print(f"startup: {runs} run per mode, pengguna {menu_wait} ms di BalanceMenu")
+    app = os.path.join(BASE_DIR, "StoreApp.py")
+    t = _timeit(lambda: subprocess.run([sys.executable, "-c", "import StoreApp"], cwd=BASE_DIR, check=True), repeat=runs)
+    _report("python -c 'import StoreApp' (proses penuh)", t)
+    for flags in ([], ["--no-prebuild"]):
+        for _ in range(runs):
+            proc = subprocess.run([sys.executable, app, "--startup-timing", "--menu-wait", str(menu_wait)] + flags,
+                                  cwd=BASE_DIR, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"  dilewati: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+                return
+        print("\n".join("  " + line for line in proc.stdout.strip().splitlines()))
+
+# Pool dialog: popup pertama membangun Toplevel, popup berikutnya hanya konfigurasi ulang
+def bench_dialogs(adds=10):
+    print(f"dialogs: {adds} kali tambah ke keranjang berturut-turut")
+    root = _tk_root()
+    if root is None:
+        return
+    app = StoreApp(root, initial_balance=10 ** 12)
+    games = app.engine.games
+    for i in range(adds):
+        g = games[i % len(games)]
+        t0 = time.perf_counter()
+        app.add_to_cart(g.title, g.cover)
+        root.update_idletasks()
+        _report(f"show_added_popup #{i + 1}", time.perf_counter() - t0)
+    print(f"  pool: {app.dialogs.stats()}")
+    root.destroy()
+
+# Gaya: membuat 1.000 kartu katalog dengan tuple font (lama) vs Font bernama dari StyleRegistry
+def bench_styles(n=1000):
+    print(f"styles: membuat {n:,} kartu katalog")
+    root = _tk_root()
+    if root is None:
+        return
+    app = StoreApp(root, virtual_catalog=True, engine=StoreEngine(_synthetic_games(n)))
+    games = app.engine.games
+
+    def build():
+        frame = tk.Frame(root)
+        for i, g in enumerate(games):
+            app.create_game_card(frame, g, i)
+        root.update_idletasks()
+        app.price_area.clear()
+        frame.destroy()
+
+    for label, enabled in (("tuple font (sebelum)", False), ("StyleRegistry (sesudah)", True)):
+        STYLES.enabled = enabled
+        _report(label, _timeit(build, repeat=3))
+    STYLES.enabled = True
+    print(f"  font registry: {STYLES.stats()}")
+    root.destroy()
+
+# Engine headless (keranjang, harga, pencarian, checkout): lihat tests/test_benchmarks.py (pytest-benchmark)
+
+# Keranjang besar: total/counter O(1) vs hitung ulang dari nol (cek properti: tests/test_cart.py)
+def _recompute(cart):
+    subtotal = sum(v.price * v.qty for v in cart.items.values())
+    count = sum(v.qty for v in cart.items.values())
+    total = int(max(0, subtotal * 0.8 if len(cart.items) >= 3 else subtotal))
+    return subtotal, count, total
+
+def bench_cart(lines=10_000, calls=100_000):
+    print(f"cart: keranjang {lines:,} baris, {calls:,} panggilan")
+    cart = Cart()
+    for i in range(lines):
+        cart.add(f"Game {i}", 100000 + i, "cover.png")
+
+    def totals():
+        for _ in range(calls):
+            cart.total(); cart.total_count()
+
+    def rescans():
+        for _ in range(calls // 100):
+            _recompute(cart)
+
+    _bench_ops("total() + total_count() (counter)", totals, calls)
+    _bench_ops("hitung ulang dari nol (pembanding)", rescans, calls // 100)
+
+# Memori katalog & keranjang: objek dengan __dict__ vs __slots__ vs katalog kolumnar
+class _DictGame:
+    def __init__(self, title, price, cover):
+        self.title = title
+        self.price = price
+        self.cover = cover
+
+def _measure_alloc(build):
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+def bench_memory(n=100_000, lines=1_000):
+    print(f"memory: {n:,} game, keranjang {lines:,} baris")
+    covers = _covers()
+    rows = [(f"Game Title Number {i}", 100000 + i, covers[i % len(covers)]) for i in range(n)]
+
+    dict_games = _measure_alloc(lambda: [_DictGame(*r) for r in rows])
+    slot_games = _measure_alloc(lambda: [Game(*r) for r in rows])
+    columnar = _measure_alloc(lambda: Catalog.from_games(_DictGame(*r) for r in rows))
+    print(f"  {'Game dengan __dict__':<44} {dict_games / 2**20:8.2f} MiB")
+    print(f"  {'Game dengan __slots__':<44} {slot_games / 2**20:8.2f} MiB  hemat {(dict_games - slot_games) / 2**20:.2f} MiB")
+    print(f"  {'Catalog kolumnar (termasuk index judul)':<44} {columnar / 2**20:8.2f} MiB  hemat {(dict_games - columnar) / 2**20:.2f} MiB")
+
+    def dict_cart():
+        items = {}
+        for t, p, c in rows[:lines]:
+            items[t] = {"qty": 1, "price": p, "cover": c}
+        return items
+
+    def slot_cart():
+        cart = Cart()
+        for i, (t, p, c) in enumerate(rows[:lines]):
+            cart.add(t, p, c, i)
+        return cart
+
+    per_dict = _measure_alloc(dict_cart) / lines
+    per_slot = _measure_alloc(slot_cart) / lines
+    print(f"  {'baris keranjang dict vs CartLine':<44} {per_dict:8.0f} B  vs {per_slot:.0f} B per baris")
+
+# Tabel harga: refresh tanpa perubahan vs setelah daily deal vs setelah voucher
+def _synthetic_games(n):
+    covers = _covers()
+    return [Game(f"Game Title Number {i}", 100000 + (i * 7919) % 900000, covers[i % len(covers)]) for i in range(n)]
+
+def bench_prices(n=100_000):
+    print(f"prices: PriceTable, {n:,} judul")
+    engine = StoreEngine(_synthetic_games(n))
+    engine.prices.refresh()
+    titles = engine.catalog.titles
+
+    def deal():
+        engine.apply_daily_deal(titles[n // 2], engine.active_price[titles[n // 2]] - 1)
+        engine.prices.refresh()
+
+    def voucher():
+        engine.set_discount_percent(0 if engine.next_discount_percent else 10)
+        engine.prices.refresh()
+
+    _bench_ops("refresh tanpa perubahan (kembali ke toko)", engine.prices.refresh, 1, rounds=20)
+    _bench_ops("refresh setelah 1 daily deal", deal, 1, rounds=20)
+    _bench_ops("refresh setelah voucher berubah (semua)", voucher, n)
+
+# Repricing massal: satu pass NumPy vs loop per judul lewat set_active_price
+def bench_batch_pricing(n=300_000):
+    print(f"batch_pricing: {n:,} judul, 15% off di bawah Rp 500 000 + markdown publisher + floor")
+    covers = _covers()
+    games = [Game(f"Game {i}", 50000 + (i * 7919) % 950000, covers[i % len(covers)], publisher=f"Publisher {i % 40}") for i in range(n)]
+    rules = [
+        PriceRule("percent", 15, max_price=500000),
+        PriceRule("fixed", 25000, publisher="Publisher 7"),
+        PriceRule("floor", 49000),
+    ]
+
+    def loop(engine):
+        for g in engine.games:
+            price = g.price
+            if price < 500000:
+                price = int(price * (1 - 15 / 100))
+            if g.publisher == "Publisher 7":
+                price = max(0, price - 25000)
+            engine.set_active_price(g.title, max(price, 49000))
+
+    loop_engine, batch_engine = StoreEngine(games), StoreEngine(games)
+    _bench_ops("loop per judul (Python)", lambda: loop(loop_engine), n, rounds=1)
+    _bench_ops("apply_price_rules (NumPy)", lambda: batch_engine.apply_price_rules(rules), n, rounds=1)
+    if loop_engine.active_price != batch_engine.active_price:
+        raise AssertionError("hasil batch berbeda dari loop per judul")
+    print("  hasil batch identik dengan loop per judul")
+
+# Loader katalog: throughput parsing streaming + memori puncak, dan snapshot biner
+def _write_catalog_files(folder, n):
+    names = [os.path.basename(p) for p in _covers()]
+    jsonl = os.path.join(folder, "catalog.jsonl")
+    csv_path = os.path.join(folder, "catalog.csv")
+    with open(jsonl, "w", encoding="utf-8") as fj, open(csv_path, "w", encoding="utf-8", newline="") as fc:
+        writer = csv.writer(fc)
+        writer.writerow(["title", "price", "cover", "publisher"])
+        for i in range(n):
+            row = {"title": f"Game Title Number {i} ™", "price": 50000 + (i * 7919) % 950000,
+                   "cover": names[i % len(names)], "publisher": f"Publisher {i % 40}"}
+            fj.write(json.dumps(row, ensure_ascii=False) + "\n")
+            writer.writerow(row.values())
+    return jsonl, csv_path
+
+def _timed_peak(fn):
+    # Waktu diukur tanpa tracemalloc (overhead-nya besar), memori puncak di run terpisah
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def bench_catalog_load(n=100_000):
+    print(f"catalog_load: {n:,} baris")
+    folder = tempfile.mkdtemp(prefix="catalog-")
+    try:
+        for path in _write_catalog_files(folder, n):
+            kind = os.path.splitext(path)[1]
+            size_mb = os.path.getsize(path) / 2**20
+            catalog, t_parse, peak = _timed_peak(lambda: load_catalog(path, IMG_DIR, snapshot=False))
+            load_catalog(path, IMG_DIR, snapshot=True)
+            _, t_snap, peak_snap = _timed_peak(lambda: load_catalog(path, IMG_DIR, snapshot=True))
+            print(f"  {'parse streaming ' + kind + f' ({size_mb:.1f} MiB)':<44} {t_parse * 1000:10.1f} ms  "
+                  f"{len(catalog) / t_parse:10,.0f} baris/s  puncak {peak / 2**20:.1f} MiB")
+            print(f"  {'muat snapshot ' + kind + '.snap':<44} {t_snap * 1000:10.1f} ms  "
+                  f"{len(catalog) / t_snap:10,.0f} baris/s  puncak {peak_snap / 2**20:.1f} MiB")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+# SQLite: import katalog batch, query harga via index, checkout transaksional
+def bench_db(n=100_000, checkouts=5_000):
+    from StoreDB import StoreDB
+    print(f"db: StoreDB (WAL), {n:,} judul, {checkouts:,} checkout")
+    folder = tempfile.mkdtemp(prefix="storedb-")
+    try:
+        db = StoreDB(os.path.join(folder, "store.db"))
+        games = _synthetic_games(n)
+        _bench_ops("import_catalog (executemany per batch)", lambda: db.import_catalog(games), n, rounds=1)
+        engine = StoreEngine(games, initial_balance=10 ** 15, db=db)
+        _bench_ops("SQL: harga 200k-300k, urut harga", lambda: engine.games_in_price_range(200000, 300000), 1, rounds=5)
+        engine.db = None
+        _bench_ops("Python: harga 200k-300k, urut harga", lambda: engine.games_in_price_range(200000, 300000), 1, rounds=5)
+        engine.db = db
+        titles = engine.catalog.titles
+
+        def run_checkouts():
+            for i in range(checkouts):
+                for t in titles[i % 1000:i % 1000 + 3]:
+                    engine.add_to_cart(t)
+                engine.checkout()
+
+        _bench_ops("checkout (debit+order+baris, 1 transaksi)", run_checkouts, checkouts, rounds=1)
+        db.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+# Ekspor riwayat: streaming dari cursor StoreDB ke CSV/PDF; memori puncak tidak boleh tumbuh dengan jumlah order
+def bench_export(orders=50_000):
+    from StoreDB import StoreDB
+    from StoreExport import export_orders
+    print(f"export: {orders:,} order dari StoreDB ke CSV dan PDF")
+    folder = tempfile.mkdtemp(prefix="storeexport-")
+    try:
+        db = StoreDB(os.path.join(folder, "store.db"))
+        engine = StoreEngine(default_games(IMG_DIR), initial_balance=10 ** 15, db=db)
+        rng = random.Random(11)
+        games = list(engine.games)
+        with db._transaction():
+            for i in range(orders):
+                lines = [(g.title, rng.randint(1, 3), g.price, g.cover) for g in rng.sample(games, rng.randint(1, 4))]
+                db.record_checkout(engine.account_id, sum(qty * price for _, qty, price, _ in lines), lines,
+                                   created_at=1.7e9 + i)
+        for fmt in ("csv", "pdf"):
+            path = os.path.join(folder, f"riwayat.{fmt}")
+            _bench_ops(f"{fmt}: export_orders", lambda: export_orders(engine.iter_order_history(), path), orders, rounds=1)
+            tracemalloc.start()
+            export_orders(engine.iter_order_history(), path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {fmt}: {os.path.getsize(path) / 1e6:.1f} MB file, memori puncak {peak / 1e6:.2f} MB")
+        db.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+# Journal: throughput tulis 1 juta entri per kebijakan fsync, lalu waktu recovery dengan/tanpa snapshot
+def bench_journal(n=1_000_000, checkout_every=50):
+    from StoreJournal import Journal
+    print(f"journal: {n:,} entri (tambah ke keranjang, checkout tiap {checkout_every} entri)")
+    games = default_games(IMG_DIR)
+    titles = [g.title for g in games]
+    folder = tempfile.mkdtemp(prefix="journal-")
+
+    def fill(journal):
+        engine = StoreEngine(games, initial_balance=10 ** 15, journal=journal)
+        i = 0
+        while journal.seq < n:
+            t = titles[i % len(titles)]
+            engine.add_to_cart(t)
+            if i % checkout_every == checkout_every - 1:
+                engine.checkout()
+            i += 1
+        journal.close()
+        return engine
+
+    try:
+        configs = (("fsync never", "never", 10 ** 9), ("fsync batch (tiap 8 grup)", "batch", 10 ** 9),
+                   ("fsync always (tiap grup)", "always", 10 ** 9), ("batch + snapshot tiap 100k", "batch", 100_000))
+        for label, policy, snapshot_every in configs:
+            path = os.path.join(folder, policy + str(snapshot_every))
+            journal = Journal(path, fsync=policy, snapshot_every=snapshot_every)
+            t0 = time.perf_counter()
+            engine = fill(journal)
+            elapsed = time.perf_counter() - t0
+            st = journal.stats()
+            _report(f"tulis: {label}", elapsed,
+                    f"{n / elapsed:,.0f} entri/s  write {st['writes']:,}  fsync {st['fsyncs']:,}  snapshot {st['snapshots']}")
+            expected = (engine.balance, engine.cart.total_count())
+
+            t0 = time.perf_counter()
+            recovered = StoreEngine(games, initial_balance=0, journal=Journal(path, snapshot_every=snapshot_every))
+            elapsed = time.perf_counter() - t0
+            ok = (recovered.balance, recovered.cart.total_count()) == expected
+            size = os.path.getsize(os.path.join(path, "journal.jsonl")) / 1e6
+            _report(f"recovery: {label}", elapsed, f"journal {size:.1f} MB  state {'cocok' if ok else 'BEDA'}")
+            recovered.journal.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+# Pencarian judul: waktu per ketikan pada katalog besar dengan judul bervariasi
+SEARCH_WORDS = ("shadow", "legend", "knight", "dragon", "souls", "ring", "wild", "hunt", "dead", "redemption",
+                "persona", "royal", "god", "war", "craft", "edition", "expedition", "hollow", "silk", "song",
+                "sekiro", "elden", "witcher", "minecraft", "java", "bedrock", "clair", "obscur", "star", "galaxy",
+                "pokémon", "café", "über", "night", "city", "racer", "tactics", "chronicles", "odyssey", "origins")
+
+def bench_search(n=100_000, queries=("sekiro shadows", "wild hunt", "pokemon cafe", "xyz", "galaxy racer 9")):
+    print(f"search: TitleIndex + filter harga, {n:,} judul (per ketikan)")
+    rng = random.Random(3)
+    catalog = Catalog()
+    for i in range(n):
+        catalog.add(" ".join(rng.choice(SEARCH_WORDS).capitalize() for _ in range(rng.randint(2, 5))) + f"™ {i}",
+                    rng.randrange(20_000, 1_000_000), "")
+    engine = StoreEngine(catalog)
+    t0 = time.perf_counter()
+    engine.pricing.title_index()
+    _report("bangun index", time.perf_counter() - t0)
+
+    def typing(label, steps):
+        # steps: (query, min_price, max_price) per ketikan; cache hasil judul dikosongkan dulu
+        engine.pricing.title_index()._results.clear()
+        per_key = []
+        for query, lo, hi in steps:
+            t0 = time.perf_counter()
+            result = engine.search(query, lo, hi)
+            per_key.append(time.perf_counter() - t0)
+        per_key.sort()
+        print(f"  {label:<34} median {per_key[len(per_key) // 2] * 1000:6.3f} ms  maks {per_key[-1] * 1000:6.3f} ms  "
+              f"{len(result) if result is not None else n:,} hasil")
+
+    for query in queries:
+        typing(f"ketik {query!r}", [(query[:k], None, None) for k in range(1, len(query) + 1)])
+    max_text = "450000"
+    typing("harga maks '450000' (tanpa judul)", [("", None, int(max_text[:k])) for k in range(1, len(max_text) + 1)])
+    typing("harga maks + judul 's'", [("s", None, int(max_text[:k])) for k in range(1, len(max_text) + 1)])
+    engine.set_discount_percent(10)
+    typing("harga min '150000' + voucher 10%", [("", int("150000"[:k]), None) for k in range(1, 7)])
+
+# Simulasi Lucky Spin: throughput Monte Carlo NumPy (target 10^8 spin dalam hitungan detik)
+def bench_spin_sim(spins=100_000_000):
+    from StoreSim import CartModel, simulate
+    print(f"spin_sim: {spins:,} spin, keranjang geometric:3")
+    t0 = time.perf_counter()
+    result = simulate(cart=CartModel("geometric", 3), spins=spins, seed=1)
+    elapsed = time.perf_counter() - t0
+    _report("simulate", elapsed, f"{result['spins'] / elapsed:,.0f} spin/s, "
+            f"saldo {result['saldo_paid'] / result['spins']:,.0f}/spin")
+
+def bench_shoppers(shoppers=64, duration=5.0):
+    from StoreLoad import run_load
+    workers = os.cpu_count() or 1
+    base = None
+    for n in sorted({1, workers}):
+        result = run_load(n, shoppers, duration=duration, seed=1)
+        base = base or result["throughput"]
+        bad = sum(result["violations"].values())
+        _report(f"shoppers x{n}", result["wall"], f"{result['throughput']:,.0f} aksi/s ({result['throughput'] / base:.2f}x), "
+                f"{result['checkouts']:,} checkout, {bad} pelanggaran")
+
+BENCHES = {
+    "shoppers": bench_shoppers,
+    "spin_sim": bench_spin_sim,
+    "journal": bench_journal,
+    "dialogs": bench_dialogs,
+    "styles": bench_styles,
+    "redraw": bench_redraw,
+    "spin_clock": bench_spin_clock,
+    "startup": bench_startup,
+    "search": bench_search,
+    "db": bench_db,
+    "export": bench_export,
+    "catalog_load": bench_catalog_load,
+    "batch_pricing": bench_batch_pricing,
+    "prices": bench_prices,
+    "memory": bench_memory,
+    "cart": bench_cart,
+    "thumbnails": bench_thumbnails,
+    "cart_refresh": bench_cart_refresh,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Online Gamestore")
+    parser.add_argument("names", nargs="*", help="benchmark yang dijalankan: " + ", ".join(BENCHES))
+    args = parser.parse_args()
+    unknown = [n for n in args.names if n not in BENCHES]
+    if unknown:
+        parser.error(f"benchmark tidak dikenal: {', '.join(unknown)}")
+    for name in args.names or BENCHES:
+        BENCHES[name]()
@@ -0,0 +1,19 @@
+# Modul toko ada di root repo (bukan paket), jadi root ditambahkan ke sys.path untuk semua test
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+# Benchmark (fixture `benchmark` dari pytest-benchmark) butuh waktu lama, jadi tidak ikut `pytest` biasa.
+# Jalankan dengan --run-bench atau --benchmark-only.
+def pytest_addoption(parser):
+    parser.addoption("--run-bench", action="store_true", help="ikutkan benchmark pytest-benchmark (tests/test_benchmarks.py)")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-bench") or config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="benchmark; jalankan dengan --run-bench atau --benchmark-only")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
@@ -0,0 +1,130 @@
+# Suite pytest-benchmark untuk StoreEngine headless (keranjang, harga, pencarian, checkout, spin).
+# Tidak ikut `pytest` biasa (lihat conftest.py).
+# Jalankan:  python -m pytest tests/test_benchmarks.py --benchmark-only
+# Regresi:   ... --benchmark-autosave   lalu   ... --benchmark-compare --benchmark-compare-fail=mean:20%
+# Tanpa plugin pytest-benchmark file ini dilewati; dengan --run-bench --benchmark-disable tiap benchmark jalan sekali sebagai test.
+import os, random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from StoreEngine import Cart, Catalog, StoreEngine, PriceRule, default_games
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+SESSION_OPS = 1_000_000   # operasi per round pada benchmark sesi belanja
+LARGE_CATALOG = 100_000
+WORDS = "sekiro shadows die twice wild hunt witcher pokemon cafe galaxy racer elden ring dark souls".split()
+
+@pytest.fixture(scope="module")
+def games():
+    return default_games(IMG_DIR)
+
+@pytest.fixture(scope="module")
+def large_catalog():
+    rng = random.Random(3)
+    catalog = Catalog()
+    for i in range(LARGE_CATALOG):
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 5))) + f"™ {i}"
+        catalog.add(title, rng.randrange(20_000, 1_000_000), "", f"Publisher {i % 40}")
+    return catalog
+
+# Keranjang
+def test_cart_add_remove(benchmark, games):
+    engine = StoreEngine(games)
+    title = games[0].title
+
+    def add_remove():
+        engine.add_to_cart(title)
+        engine.remove_from_cart(title)
+
+    benchmark(add_remove)
+    assert not engine.cart.items
+
+def test_cart_total_large(benchmark):
+    cart = Cart()
+    for i in range(10_000):
+        cart.add(f"Game {i}", 100_000 + i, "cover.png")
+    assert benchmark(cart.total) == int(cart.subtotal() * 0.8)
+
+def test_checkout_three_titles(benchmark, games):
+    engine = StoreEngine(games, initial_balance=10 ** 15)
+    titles = [g.title for g in games[:3]]
+
+    def checkout():
+        for title in titles:
+            engine.add_to_cart(title)
+        return engine.checkout()
+
+    _, spins = benchmark(checkout)
+    assert spins == 3
+
+def test_spin_roll_and_apply(benchmark, games):
+    engine = StoreEngine(games)
+    rng = random.Random(2)
+    benchmark(lambda: engine.apply_reward(engine.roll_reward(rng)))
+
+# Sesi belanja: jutaan operasi add/remove/checkout per round
+def test_shopping_session_million_ops(benchmark, games):
+    titles = [g.title for g in games]
+
+    def session():
+        engine = StoreEngine(games, initial_balance=10 ** 15)
+        add, remove, checkout = engine.add_to_cart, engine.remove_from_cart, engine.checkout
+        ops = 0
+        i = 0
+        while ops < SESSION_OPS:
+            for t in (titles[i % 9], titles[(i + 3) % 9], titles[(i + 5) % 9]):
+                add(t)
+            remove(titles[i % 9])
+            add(titles[i % 9])
+            checkout()
+            ops += 6
+            i += 1
+        return engine
+
+    engine = benchmark.pedantic(session, rounds=3, iterations=1)
+    assert engine.balance < 10 ** 15 and not engine.cart.items
+
+# Harga
+def test_effective_price(benchmark, games):
+    engine = StoreEngine(games)
+    engine.set_discount_percent(10)
+    title = games[4].title
+    assert benchmark(engine.effective_price, title) == int(engine.active_price[title] * 0.9)
+
+def test_price_table_refresh_after_voucher(benchmark, large_catalog):
+    engine = StoreEngine(large_catalog)
+
+    def toggle_voucher():
+        engine.set_discount_percent(0 if engine.next_discount_percent else 10)
+        return engine.prices.refresh()
+
+    benchmark.pedantic(toggle_voucher, rounds=10, iterations=1)
+
+def test_apply_price_rules(benchmark, large_catalog):
+    pytest.importorskip("numpy")
+    engine = StoreEngine(large_catalog)
+    rules = [PriceRule("percent", 15, max_price=500_000), PriceRule("fixed", 25_000, publisher="Publisher 7"),
+             PriceRule("floor", 49_000)]
+    benchmark.pedantic(engine.apply_price_rules, args=(rules,), rounds=5, iterations=1)
+    assert min(engine.active_array) >= 49_000
+
+# Pencarian
+@pytest.mark.parametrize("query", ["s", "sekiro shadows", "galaxy racer 9"])
+def test_title_search_keystroke(benchmark, large_catalog, query):
+    engine = StoreEngine(large_catalog)
+    index = engine.pricing.title_index()
+
+    def keystroke():
+        index._results.clear()   # ukur pencarian, bukan cache hasil
+        return engine.search(query)
+
+    benchmark(keystroke)
+
+@pytest.mark.parametrize("query", ["", "s"])
+def test_price_filter_keystroke(benchmark, large_catalog, query):
+    engine = StoreEngine(large_catalog)
+    engine.set_discount_percent(10)
+    result = benchmark(engine.search, query, None, 450_000)
+    assert all(engine.effective_price(large_catalog.titles[i]) <= 450_000 for i in result[:100])
@@ -0,0 +1,58 @@
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import settings, strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, invariant, rule
+
+from StoreEngine import Cart
+
+TITLES = st.sampled_from([f"Game {i}" for i in range(6)])
+PRICES = st.one_of(st.sampled_from([0, 1, 165999, 599000, 891000]), st.integers(min_value=0, max_value=10 ** 9))
+
+def _recompute(cart):
+    # Hitung ulang dari nol, terpisah dari counter berjalan Cart
+    subtotal = sum(line.price * line.qty for line in cart.items.values())
+    count = sum(line.qty for line in cart.items.values())
+    total = int(max(0, subtotal * 0.8 if len(cart.items) >= 3 else subtotal))
+    return subtotal, count, len(cart.items), total
+
+class CartCounters(RuleBasedStateMachine):
+    # Urutan add/remove/clear acak; setelah setiap langkah counter dibandingkan dengan hitung ulang.
+    # Kalau gagal, Hypothesis menyusutkan urutannya ke contoh terpendek.
+    def __init__(self):
+        super().__init__()
+        self.cart = Cart()
+        self.model = {}   # judul → [harga, qty] (harga baris = harga saat pertama ditambahkan)
+
+    @rule(title=TITLES, price=PRICES)
+    def add(self, title, price):
+        self.cart.add(title, price, "cover.png")
+        line = self.model.setdefault(title, [price, 0])
+        line[1] += 1
+
+    @rule(title=TITLES)
+    def remove(self, title):
+        self.cart.remove(title)
+        line = self.model.get(title)
+        if line is not None:
+            line[1] -= 1
+            if line[1] == 0:
+                del self.model[title]
+
+    @rule()
+    def clear(self):
+        self.cart.clear()
+        self.model.clear()
+
+    @invariant()
+    def counters_match_recompute(self):
+        cart = self.cart
+        assert (cart.subtotal(), cart.total_count(), cart.unique_count(), cart.total()) == _recompute(cart)
+
+    @invariant()
+    def lines_match_model(self):
+        assert {t: [line.price, line.qty] for t, line in self.cart.items.items()} == self.model
+        assert self.cart.summary_lines() == [(t, q, p * q, "cover.png") for t, (p, q) in self.model.items()]
+
+TestCartCounters = CartCounters.TestCase
+TestCartCounters.settings = settings(max_examples=300, stateful_step_count=60, deadline=None)
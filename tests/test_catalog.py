@@ -0,0 +1,37 @@
+import pytest
+
+from StoreEngine import CatalogFormatError, iter_catalog_rows, parse_price_text
+
+def _write_csv(tmp_path, prices):
+    path = tmp_path / "catalog.csv"
+    lines = ["title,price,cover,publisher"] + [f'Game {i},"{p}",,' for i, p in enumerate(prices)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("text, expected", [
+    ("599000", 599000),
+    ("599.000", 599000),
+    ("1.234.567", 1234567),
+    ("1,250,000", 1250000),
+    ("1 250 000", 1250000),
+    (" 42 ", 42),
+])
+def test_price_text_with_thousands_separators(tmp_path, text, expected):
+    [(_, price, _, _)] = iter_catalog_rows(_write_csv(tmp_path, [text]))
+    assert price == expected
+
+@pytest.mark.parametrize("text", ["-5", "+5", "12.50", "1e6", "", "1.23,456", "1,2345", "Rp 5000", "5k"])
+def test_invalid_price_text_is_rejected(tmp_path, text):
+    with pytest.raises(CatalogFormatError) as e:
+        list(iter_catalog_rows(_write_csv(tmp_path, [text])))
+    assert e.value.line == 2
+
+def test_skip_invalid_keeps_valid_rows(tmp_path):
+    rows = list(iter_catalog_rows(_write_csv(tmp_path, ["100", "-5", "12.50", "200.000"]), skip_invalid=True))
+    assert [price for _, price, _, _ in rows] == [100, 200000]
+
+@pytest.mark.parametrize("text, expected", [("150.000", 150000), (" 75000 ", 75000), ("-5", None), ("1.5e6", None),
+                                            ("", None), ("abc", None)])
+def test_parse_price_text_for_filters(text, expected):
+    # Kolom filter harga di UI memakai parser yang sama; None = tanpa batas
+    assert parse_price_text(text) == expected
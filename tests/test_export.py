@@ -0,0 +1,79 @@
+import os, csv
+
+from StoreEngine import StoreEngine, default_games
+from StoreExport import export_orders
+from StoreJournal import Journal
+from StoreDB import StoreDB
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+def _checkout(engine, titles, recipient):
+    for title in titles:
+        engine.add_to_cart(title)
+    engine.checkout(recipient)
+    return engine.last_order_id
+
+def _exported(engine, path):
+    count = export_orders(engine.iter_order_history(), path)
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    return count, rows
+
+def test_order_history_survives_restart_without_db(tmp_path):
+    games = default_games(IMG_DIR)
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 10_000_000, journal=Journal(folder))
+    first = _checkout(engine, [games[0].title, games[1].title], "Budi")
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    second = _checkout(restarted, [games[2].title], "Sari")
+    assert (first, second) == (1, 2)
+    count, rows = _exported(restarted, str(tmp_path / "riwayat.csv"))
+    assert count == 2
+    assert [(r["order_id"], r["penerima"], r["judul"]) for r in rows] == [
+        ("1", "Budi", games[0].title), ("1", "Budi", games[1].title), ("2", "Sari", games[2].title)]
+    restarted.journal.close()
+
+def test_order_history_survives_snapshot_without_db(tmp_path):
+    games = default_games(IMG_DIR)
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 10_000_000, journal=Journal(folder))
+    _checkout(engine, [games[0].title], "Budi")
+    engine.journal.snapshot(engine.snapshot_state())
+    _checkout(engine, [games[1].title], "Sari")
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    assert [order[:2] for order in restarted.order_history] == [order[:2] for order in engine.order_history]
+    assert _checkout(restarted, [games[2].title], "Ani") == 3
+    count, _ = _exported(restarted, str(tmp_path / "riwayat.csv"))
+    assert count == 3
+    restarted.journal.close()
+
+def test_export_sees_only_orders_present_when_it_started(tmp_path):
+    games = default_games(IMG_DIR)
+    engine = StoreEngine(games, 10_000_000)
+    _checkout(engine, [games[0].title], "Budi")
+    orders = engine.iter_order_history()
+    first = next(orders)
+    _checkout(engine, [games[1].title], "Sari")
+    assert first[0] == 1 and list(orders) == []
+
+def test_last_order_matches_history_and_db(tmp_path):
+    # Struk diekspor dari engine.last_order: waktu order harus sama dengan riwayat / created_at di DB
+    games = default_games(IMG_DIR)
+    engine = StoreEngine(games, 10_000_000)
+    _checkout(engine, [games[0].title], "Budi")
+    assert engine.last_order == engine.order_history[-1]
+
+    db = StoreDB(str(tmp_path / "store.db"))
+    try:
+        engine = StoreEngine(games, 10_000_000, db=db)
+        order_id = _checkout(engine, [games[0].title, games[1].title], "Sari")
+        [stored] = engine.iter_order_history()
+        assert engine.last_order[0] == order_id
+        assert engine.last_order[:4] == stored[:4]
+        assert [line[:3] for line in engine.last_order[4]] == [tuple(line[:3]) for line in stored[4]]
+    finally:
+        db.close()
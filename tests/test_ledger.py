@@ -0,0 +1,201 @@
+import os, sys, random, threading
+
+import pytest
+
+from StoreEngine import StoreEngine, Ledger, InsufficientBalanceError, REWARDS, SPIN_BALANCE_REWARD, default_games
+from StoreJournal import Journal
+from StoreDB import StoreDB
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+SALDO_REWARD = next(r for r in REWARDS if r.startswith("Saldo"))
+
+@pytest.fixture(scope="module")
+def games():
+    return default_games(IMG_DIR)
+
+@pytest.fixture
+def fast_switching():
+    # Pergantian thread sesering mungkin supaya balapan benar-benar muncul
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(old)
+
+def _run_threads(n, target):
+    barrier = threading.Barrier(n)
+    errors = []
+
+    def run(w):
+        try:
+            barrier.wait()
+            target(w)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(w,)) for w in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+@pytest.mark.parametrize("with_db", [False, True], ids=["ledger", "ledger+db"])
+def test_concurrent_checkouts_and_credits_keep_balances(tmp_path, games, fast_switching, with_db,
+                                                        threads=8, ops=400, accounts=4, start_balance=2_000_000_000):
+    titles = [g.title for g in games]
+    names = [f"akun-{i}" for i in range(accounts)]
+    db = StoreDB(str(tmp_path / "store.db")) if with_db else None
+    ledger = Ledger()
+    sessions = [{a: StoreEngine(games, start_balance, db=db, account=a, ledger=ledger) for a in names} for _ in range(threads)]
+    applied = [[] for _ in range(threads)]     # (akun, delta) operasi yang benar-benar diterapkan
+    checkouts = [0] * threads
+    negative = []
+    shared = {}                                # key kredit bersama → akun (diperebutkan semua thread)
+    shared_lock = threading.Lock()
+
+    def worker(w):
+        rng = random.Random(w)
+        for i in range(ops):
+            account = names[rng.randrange(accounts)]
+            engine = sessions[w][account]
+            roll = rng.random()
+            if roll < 0.5:
+                for t in rng.sample(titles, rng.randint(1, 3)):
+                    engine.add_to_cart(t)
+                total = engine.cart.total()
+                key = f"co-{w}-{i}"
+                try:
+                    summary = engine.checkout(idempotency_key=key)
+                except InsufficientBalanceError:
+                    engine.cart.clear()
+                    continue
+                applied[w].append((account, -total))
+                checkouts[w] += 1
+                if rng.random() < 0.2:   # klik ganda: key sama tidak boleh mendebit lagi
+                    assert engine.checkout(idempotency_key=key) == summary
+            elif roll < 0.9:
+                key = f"spin-{w}-{i}"
+                engine.apply_reward(SALDO_REWARD, key)
+                applied[w].append((account, SPIN_BALANCE_REWARD))
+                if rng.random() < 0.2:
+                    engine.apply_reward(SALDO_REWARD, key)
+            else:
+                # Key yang sama dipakai banyak thread sekaligus: kredit hanya boleh masuk sekali
+                key = f"shared-{i % 50}"
+                account = names[(i % 50) % accounts]
+                sessions[w][account].apply_reward(SALDO_REWARD, key)
+                with shared_lock:
+                    shared[key] = account
+            if engine.balance < 0:
+                negative.append((account, engine.balance))
+
+    try:
+        _run_threads(threads, worker)
+        expected = {a: start_balance for a in names}
+        for mine in applied:
+            for account, delta in mine:
+                expected[account] += delta
+        for account in shared.values():
+            expected[account] += SPIN_BALANCE_REWARD
+
+        assert not negative
+        assert {a: ledger.balance(a) for a in names} == expected
+        if db is not None:
+            assert {a: db.balance(sessions[0][a].account_id) for a in names} == expected
+            assert db.conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == sum(checkouts)
+    finally:
+        if db is not None:
+            db.close()
+
+class _RacingLedger(Ledger):
+    # Cek cepat ledger.result() di checkout terjadi di luar lock akun; barrier memaksa kedua thread
+    # lolos cek itu sebelum salah satunya sempat mendebit
+    def __init__(self):
+        super().__init__()
+        self.gate = None
+
+    def result(self, account, key):
+        outcome = super().result(account, key)
+        if self.gate is not None:
+            self.gate.wait()
+        return outcome
+
+def test_same_key_checkout_race_applies_once(tmp_path, games, rounds=20):
+    # Dua sesi satu akun checkout dengan key yang sama bersamaan: satu debit, satu order, satu entri journal
+    journal = Journal(str(tmp_path / "journal"), fsync="never")
+    ledger = _RacingLedger()
+    a = StoreEngine(games, 10 ** 12, ledger=ledger, journal=journal)
+    b = StoreEngine(games, 10 ** 12, ledger=ledger)
+    b.journal = journal
+    sessions = (a, b)
+    titles = [g.title for g in games]
+    for i in range(rounds):
+        for engine in sessions:
+            engine.add_to_cart(titles[i % len(titles)])
+        before = ledger.balance(a.account)
+        ledger.gate = threading.Barrier(2)
+        _run_threads(2, lambda w: sessions[w].checkout(idempotency_key=f"race-{i}"))
+        ledger.gate = None
+        assert before - ledger.balance(a.account) == a.last_paid == b.last_paid
+        # Sesi yang kalah tidak menjalankan efek samping checkout: keranjangnya tetap utuh
+        assert sorted(bool(e.cart.items) for e in sessions) == [False, True]
+        for engine in sessions:
+            engine.cart.clear()
+    journal.sync()
+    entries = [line for line in open(journal.log_path, encoding="utf-8") if '"op":"checkout"' in line]
+    assert len(entries) == rounds
+    assert len(a.order_history) + len(b.order_history) == rounds
+    journal.close()
+
+def test_idempotency_keys_survive_restart(tmp_path, games):
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 5_000_000, journal=Journal(folder))
+    engine.add_to_cart(games[0].title)
+    summary = engine.checkout(idempotency_key="order-1")
+    engine.apply_reward(SALDO_REWARD, "spin-1")
+    balance = engine.balance
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    assert restarted.balance == balance
+    assert restarted.checkout(idempotency_key="order-1") == summary
+    restarted.apply_reward(SALDO_REWARD, "spin-1")
+    assert restarted.balance == balance
+    restarted.journal.close()
+
+def test_idempotency_keys_survive_snapshot(tmp_path, games):
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 5_000_000, journal=Journal(folder))
+    engine.add_to_cart(games[0].title)
+    summary = engine.checkout(idempotency_key="order-1")
+    engine.journal.snapshot(engine.snapshot_state())
+    balance = engine.balance
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    assert restarted.checkout(idempotency_key="order-1") == summary
+    assert restarted.balance == balance
+    restarted.journal.close()
+
+def test_same_key_for_credit_and_checkout_are_separate_operations(tmp_path, games):
+    # Key yang sudah dipakai kredit spin bukan hasil checkout (dan sebaliknya): keduanya tetap dijalankan sekali
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 5_000_000, journal=Journal(folder))
+    engine.apply_reward(SALDO_REWARD, "k")
+    engine.add_to_cart(games[0].title)
+    before = engine.balance
+    summary = engine.checkout(idempotency_key="k")
+    assert before - engine.balance == engine.last_paid > 0
+    engine.apply_reward(SALDO_REWARD, "k")
+    assert engine.checkout(idempotency_key="k") == summary
+    balance = engine.balance
+    assert balance == 5_000_000 + SPIN_BALANCE_REWARD - engine.last_paid
+    engine.journal.snapshot(engine.snapshot_state())
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    restarted.apply_reward(SALDO_REWARD, "k")
+    assert restarted.checkout(idempotency_key="k") == summary
+    assert restarted.balance == balance
+    restarted.journal.close()
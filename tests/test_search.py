@@ -0,0 +1,69 @@
+import random, threading
+
+import pytest
+
+from StoreEngine import Catalog, StoreEngine, TitleIndex
+
+WORDS = "sekiro shadows die twice wild hunt witcher pokemon cafe galaxy racer elden ring dark souls".split()
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = random.Random(3)
+    catalog = Catalog()
+    for i in range(5_000):
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 5))) + f"™ {i}"
+        catalog.add(title, rng.randrange(0, 1_000_000), "")
+    return catalog
+
+def _python_index(titles):
+    index = TitleIndex(titles)
+    index._np = None   # jalur tanpa NumPy
+    return index
+
+def _reference(engine, index, query, lo, hi):
+    # Filter per judul seperti sebelum ada mask NumPy
+    ids = index.search(query)
+    pct = engine.next_discount_percent
+    candidates = range(len(engine.catalog)) if ids is None else ids
+    lo = 0 if lo is None else lo
+    hi = float("inf") if hi is None else hi
+    return [i for i in candidates if lo <= engine.effective_price(engine.catalog.titles[i]) <= hi]
+
+@pytest.mark.parametrize("query", ["s", "se", "sekiro sha", "galaxy racer 9", "9", "xyz", "wild", "1 2", "™"])
+def test_numpy_and_python_title_search_agree(catalog, query):
+    result = TitleIndex(catalog.titles).search(query)
+    expected = _python_index(catalog.titles).search(query)
+    assert (None if result is None else list(result)) == (None if expected is None else list(expected))
+
+@pytest.mark.parametrize("pct", [0, 10, 33])
+@pytest.mark.parametrize("query", ["", "s", "sekiro", "galaxy racer 9", "zzz"])
+@pytest.mark.parametrize("lo, hi", [(None, 300_000), (100_000, None), (250_000, 260_000), (0, 0)])
+def test_price_filter_matches_effective_price(catalog, pct, query, lo, hi):
+    engine = StoreEngine(catalog)
+    engine.set_discount_percent(pct)
+    assert list(engine.search(query, lo, hi)) == _reference(engine, _python_index(catalog.titles), query, lo, hi)
+
+def test_price_filter_sees_active_price_changes(catalog):
+    engine = StoreEngine(catalog)
+    engine.set_discount_percent(10)
+    engine.search("", 0, 100)               # harga efektif ber-voucher di-cache
+    engine.set_active_price(catalog.titles[7], 100)
+    assert 7 in engine.search("", 0, 100)
+
+def test_title_index_built_once_across_threads(catalog):
+    # StartupPipeline membangun indeks di background sementara thread UI mungkin sudah mencari
+    engine = StoreEngine(catalog)
+    barrier = threading.Barrier(4)
+    seen = []
+
+    def build():
+        barrier.wait()
+        seen.append(engine.pricing.title_index())
+
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(seen) == 4 and all(index is seen[0] for index in seen)
+    assert engine.search("sekiro") is not None
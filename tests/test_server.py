@@ -0,0 +1,108 @@
+import os, json, asyncio
+
+import pytest
+
+from StoreEngine import default_games
+from StoreServer import SessionStore, HTTPError, route, _handle_connection
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def store():
+    return SessionStore(default_games(IMG_DIR), 1_000_000)
+
+def _session(store):
+    return route(store, "POST", "/sessions", {})[1]["session"]
+
+def test_sessions_share_catalog_prices(store):
+    a, b = store.get(_session(store)), store.get(_session(store))
+    assert a.active_price is b.active_price and a.active_array is b.active_array
+    title = a.catalog.titles[0]
+    a.add_to_cart(title)
+    assert not b.cart.items
+    # Voucher tetap per sesi
+    a.set_discount_percent(10)
+    assert b.effective_price(title) == b.base_price[title]
+    assert a.effective_price(title) < b.effective_price(title)
+
+def test_price_change_from_other_session_refreshes_price_table(store):
+    a, b = store.get(_session(store)), store.get(_session(store))
+    title = a.catalog.titles[0]
+    b.prices.entry(title)
+    a.set_active_price(title, 1000)
+    assert b.prices.entry(title)[0] == 1000
+    assert a.prices.entry(title)[0] == 1000
+
+def test_idle_sessions_expire():
+    clock = FakeClock()
+    store = SessionStore(default_games(IMG_DIR), ttl=60, clock=clock)
+    old, busy = _session(store), _session(store)
+    clock.now = 50
+    store.get(busy)
+    clock.now = 100
+    with pytest.raises(HTTPError) as e:
+        store.get(old)
+    assert e.value.status == 404
+    assert store.get(busy) is not None
+    assert store.expired == 1
+    assert old not in store.ledger.accounts()
+
+def test_session_cap():
+    store = SessionStore(default_games(IMG_DIR), max_sessions=2)
+    first = _session(store)
+    _session(store)
+    with pytest.raises(HTTPError) as e:
+        _session(store)
+    assert e.value.status == 503
+    route(store, "DELETE", f"/sessions/{first}", {})
+    _session(store)
+
+@pytest.mark.parametrize("title", [["x"], {"a": 1}, 5, None])
+def test_non_text_title_is_bad_request(store, title):
+    sid = _session(store)
+    for action in ("cart/add", "cart/remove"):
+        with pytest.raises(HTTPError) as e:
+            route(store, "POST", f"/sessions/{sid}/{action}", {"title": title})
+        assert e.value.status == (404 if title is None else 400)
+
+@pytest.mark.parametrize("field", ["idempotency_key", "recipient"])
+def test_non_text_checkout_fields_are_bad_request(store, field):
+    sid = _session(store)
+    engine = store.get(sid)
+    engine.add_to_cart(engine.catalog.titles[0])
+    with pytest.raises(HTTPError) as e:
+        route(store, "POST", f"/sessions/{sid}/checkout", {field: ["x"]})
+    assert e.value.status == 400
+    assert engine.cart.items
+
+def _raw_request(store, data):
+    async def run():
+        server = await asyncio.start_server(lambda r, w: _handle_connection(store, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(data)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body), head
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1e3", "½", "", " "])
+def test_invalid_content_length_is_bad_request(store, length):
+    status, payload, head = _raw_request(store, f"POST /sessions HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode("latin-1"))
+    assert status == 400, payload
+    assert b"Connection: close" in head
+
+def test_valid_request_over_socket(store):
+    body = json.dumps({"balance": 5}).encode()
+    status, payload, _ = _raw_request(store, b"POST /sessions HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert status == 201 and payload["balance"] == 5
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from StoreEngine import StoreEngine, DEFAULT_REWARDS, default_games
+from StoreJournal import Journal
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+VOUCHER = next(r.label for r in DEFAULT_REWARDS if r.kind == "voucher")
+
+# Aturan engine yang dimodelkan StoreSim
+def test_voucher_applies_to_next_checkout_only(tmp_path):
+    games = default_games(IMG_DIR)
+    folder = str(tmp_path / "journal")
+    engine = StoreEngine(games, 10_000_000, journal=Journal(folder))
+    engine.apply_reward(VOUCHER)
+    title = games[0].title
+    full = engine.active_price[title]
+    assert engine.add_to_cart(title) < full
+    engine.checkout()
+    assert engine.next_discount_percent == 0
+    assert engine.add_to_cart(title) == full
+    engine.journal.close()
+
+    restarted = StoreEngine(games, 0, journal=Journal(folder))
+    assert restarted.next_discount_percent == 0
+    assert restarted.cart.items[title].price == full
+    restarted.journal.close()
+
+def test_bundle_needs_three_distinct_titles():
+    games = default_games(IMG_DIR)
+    engine = StoreEngine(games, 10_000_000)
+    for _ in range(3):
+        engine.add_to_cart(games[0].title)
+    assert engine.cart.total() == engine.cart.subtotal()
+
+def test_simulator_bundle_counts_distinct_titles():
+    pytest.importorskip("numpy")
+    from StoreSim import CartModel, simulate
+    # Satu judul di katalog: 3 copy tidak pernah dapat diskon bundle
+    result = simulate(cart=CartModel("fixed", 3), prices=[100_000], spins=30_000, seed=1)
+    assert result["revenue"] + result["voucher_cost"] == 300_000 * result["checkouts"]
+    # Banyak judul berharga sama: diskon hanya kalau ketiga copy judulnya berbeda (peluang 49·48/50² untuk 50 judul)
+    result = simulate(cart=CartModel("fixed", 3), prices=[100_000] * 50, spins=300_000, seed=1)
+    n = result["checkouts"]
+    discounted = (300_000 * n - (result["revenue"] + result["voucher_cost"])) / 60_000
+    assert abs(discounted / n - 49 * 48 / 50 ** 2) < 0.01
@@ -0,0 +1,33 @@
+import os, glob
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("PIL")
+
+from StoreApp import ThumbnailStore, COVER_SIZES
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+class _CountingStore(ThumbnailStore):
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self.saves = 0
+
+    def _save_manifest(self):
+        self.saves += 1
+        super()._save_manifest()
+
+def test_build_writes_manifest_once(tmp_path):
+    covers = sorted(glob.glob(os.path.join(IMG_DIR, "*.png")))
+    store = _CountingStore(str(tmp_path))
+    assert store.build(covers) == len(covers)
+    assert store.saves == 1
+
+    # Build ulang dengan cache hangat: tidak ada cover yang dibuat lagi, manifest tetap ditulis sekali
+    warm = _CountingStore(str(tmp_path))
+    assert warm.build(covers) == 0
+    assert warm.saves == 1
+    size = next(iter(COVER_SIZES.values()))
+    assert all(os.path.exists(warm.lookup(p, size)) for p in covers)
+    assert warm.saves == 1